@@ -57,6 +57,7 @@ DOCUMENTATION = '''
               - Available filters are listed here U(http://docs.aws.amazon.com/cli/latest/reference/ec2/describe-instances.html#options).
               - Every entry in this list triggers a search query. As such, from a performance point of view, it's better to
                 keep the list as short as possible.
+              - Entries using the same filter names and differing in the values of a single filter are merged into one query.
           type: list
           default: []
         exclude_filters:
@@ -66,14 +67,26 @@ DOCUMENTATION = '''
               - Available filters are listed here U(http://docs.aws.amazon.com/cli/latest/reference/ec2/describe-instances.html#options).
               - Every entry in this list triggers a search query. As such, from a performance point of view, it's better to
                 keep the list as short as possible.
+              - Entries using the same filter names and differing in the values of a single filter are merged into one query.
           type: list
           default: []
         include_extra_api_calls:
           description:
-              - Add two additional API calls for every instance to include 'persistent' and 'events' host variables.
+              - Add additional API calls to include 'persistent' and 'events' host variables.
+              - The instance statuses and spot instance requests are described in batches of up to 100 IDs per region,
+                not once per instance.
               - Spot instances may be persistent and instances may have associated events.
           type: bool
           default: False
+        fetch_workers:
+          description:
+              - The maximum number of regions to describe concurrently.
+              - The default of C(1) queries the regions one after the other. Higher values use a bounded
+                pool of threads; the instances are still returned in the same order as the regions.
+              - The time spent on each region is reported with C(-vvv).
+          type: int
+          default: 1
+          version_added: 3.1.0
         strict_permissions:
           description:
               - By default if a 403 (Forbidden) error code is encountered this plugin will fail.
@@ -99,6 +112,48 @@ DOCUMENTATION = '''
             - The use of this feature is discouraged and we advise to migrate to the new ``tags`` structure.
           type: bool
           default: False
+        hostvars_allowlist:
+          description:
+            - A list of the host variables to set, such as C(instance_id) or C(tags). All of them are set if empty.
+            - The variables used by I(compose), I(groups) and I(keyed_groups) must be part of the list.
+            - C(placement.region) is only set when C(placement) is part of the list.
+          type: list
+          elements: str
+          default: []
+          version_added: 3.1.0
+        delta_cache:
+          description:
+            - Cache the instances of each region and filter as a separate entry instead of caching the whole inventory,
+              so that only the expired entries are queried again.
+            - Only used when I(cache) is enabled.
+          type: bool
+          default: False
+          version_added: 3.1.0
+        delta_cache_timeout:
+          description:
+            - The age in seconds after which an entry of the I(delta_cache) is queried again.
+            - Defaults to I(cache_timeout). Use a lower value with I(delta_cache_stale_while_revalidate),
+              the expired entries can only be used while the cache plugin still holds them.
+          type: int
+          version_added: 3.1.0
+        delta_cache_stale_while_revalidate:
+          description:
+            - Use the expired entries of the I(delta_cache) as they are and query them again in the background,
+              so that parsing the inventory does not wait on AWS.
+            - The refreshed entries are used on the next run. The ones done by the time the inventory is populated are
+              saved with the cache, the later ones are written through the cache plugin once done.
+          type: bool
+          default: False
+          version_added: 3.1.0
+        delta_cache_revalidate_timeout:
+          description:
+            - The number of seconds to wait for the entries queried again in the background by
+              I(delta_cache_stale_while_revalidate) once the inventory is populated.
+            - By default parsing the inventory does not wait. A query taking longer keeps running and writes its
+              entry through the cache plugin once done.
+          type: int
+          default: 0
+          version_added: 3.1.0
 '''
 
 EXAMPLES = '''
@@ -189,6 +244,16 @@ exclude_filters:
 - tag:Name:
   - 'my_first_tag'
 
+# Example caching every region separately, expired regions are refreshed in the background
+plugin: aws_ec2
+cache: yes
+cache_plugin: jsonfile
+cache_connection: /tmp/aws_inventory
+cache_timeout: 86400
+delta_cache: yes
+delta_cache_timeout: 600
+delta_cache_stale_while_revalidate: yes
+
 # Example using groups to assign the running hosts to a group based on vpc_id
 plugin: aws_ec2
 boto_profile: aws_profile
@@ -208,6 +273,9 @@ groups:
 '''
 
 import re
+import time
+
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import boto3
@@ -225,8 +293,10 @@ from ansible.template import Templar
 
 from ansible_collections.amazon.aws.plugins.module_utils.ec2 import HAS_BOTO3
 from ansible_collections.amazon.aws.plugins.module_utils.ec2 import ansible_dict_to_boto3_filter_list
+from ansible_collections.amazon.aws.plugins.module_utils.ec2 import boto3_inventory_conn
 from ansible_collections.amazon.aws.plugins.module_utils.ec2 import boto3_tag_list_to_ansible_dict
 from ansible_collections.amazon.aws.plugins.module_utils.ec2 import camel_dict_to_snake_dict
+from ansible_collections.amazon.aws.plugins.module_utils.inventory_cache import DeltaCache
 
 
 # The mappings give an array of keys to get from the filter name to the value
@@ -321,6 +391,37 @@ instance_data_filter_to_boto_attr = {
     'vpc-id': ('VpcId',),
 }
 
+# describe_instance_status accepts at most 100 explicit InstanceIds per request,
+# the same batch size is used for SpotInstanceRequestIds.
+MAX_INSTANCE_IDS_PER_CALL = 100
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# The instances share the same few hundred keys, the camel to snake case
+# conversions done by camel_dict_to_snake_dict are memoized.
+_snake_keys = {}
+
+
+def _to_snake_key(key):
+    try:
+        return _snake_keys[key]
+    except KeyError:
+        snake_key = _snake_keys[key] = next(iter(camel_dict_to_snake_dict({key: None})))
+        return snake_key
+
+
+def _snake_value(value):
+    if isinstance(value, dict):
+        # Like ignore_list=['Tags'], the 'Tags' key is converted but nothing below it, tag keys are case sensitive
+        return dict((_to_snake_key(k), v if k == 'Tags' else _snake_value(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [_snake_value(v) for v in value]
+    return value
+
 
 class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
@@ -338,6 +439,9 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         self.aws_security_token = None
         self.iam_role_arn = None
 
+        # per region/filter cache, set up by parse() when delta_cache is enabled
+        self._delta_cache = None
+
     def _compile_values(self, obj, attr):
         '''
             :param obj: A list or dict of instance attributes
@@ -397,11 +501,11 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
     def _get_connection(self, credentials, region='us-east-1'):
         try:
-            connection = boto3.session.Session(profile_name=self.boto_profile).client('ec2', region, **credentials)
+            connection = boto3_inventory_conn(conn_type='client', resource='ec2', region=region, profile_name=self.boto_profile, **credentials)
         except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
             if self.boto_profile:
                 try:
-                    connection = boto3.session.Session(profile_name=self.boto_profile).client('ec2', region)
+                    connection = boto3_inventory_conn(conn_type='client', resource='ec2', region=region, profile_name=self.boto_profile)
                 except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
                     raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
             else:
@@ -418,7 +522,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         iam_role_arn = self.iam_role_arn
 
         try:
-            sts_connection = boto3.session.Session(profile_name=self.boto_profile).client('sts', region, **credentials)
+            sts_connection = boto3_inventory_conn(conn_type='client', resource='sts', region=region, profile_name=self.boto_profile, **credentials)
             sts_session = sts_connection.assume_role(RoleArn=iam_role_arn, RoleSessionName='ansible_aws_ec2_dynamic_inventory')
             return dict(
                 aws_access_key_id=sts_session['Credentials']['AccessKeyId'],
@@ -428,16 +532,12 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         except botocore.exceptions.ClientError as e:
             raise AnsibleError("Unable to assume IAM role: %s" % to_native(e))
 
-    def _boto3_conn(self, regions):
+    def _get_regions(self, credentials, regions):
         '''
-            :param regions: A list of regions to create a boto3 client
-
-            Generator that yields a boto3 client and the region
+            :param credentials: A dictionary of boto client credentials
+            :param regions: A list of regions, may be empty
+            :return The list of regions to query
         '''
-
-        credentials = self._get_credentials()
-        iam_role_arn = self.iam_role_arn
-
         if not regions:
             try:
                 # as per https://boto3.amazonaws.com/v1/documentation/api/latest/guide/ec2-example-regions-avail-zones.html
@@ -457,59 +557,121 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         if not regions:
             raise AnsibleError('Unable to get regions list from available methods, you must specify the "regions" option to continue.')
 
-        for region in regions:
-            connection = self._get_connection(credentials, region)
-            try:
-                if iam_role_arn is not None:
-                    assumed_credentials = self._boto3_assume_role(credentials, region)
-                else:
-                    assumed_credentials = credentials
-                connection = boto3.session.Session(profile_name=self.boto_profile).client('ec2', region, **assumed_credentials)
-            except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
-                if self.boto_profile:
-                    try:
-                        connection = boto3.session.Session(profile_name=self.boto_profile).client('ec2', region)
-                    except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
-                        raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
-                else:
+        return regions
+
+    def _get_region_connection(self, credentials, region):
+        '''
+            :param credentials: A dictionary of boto client credentials
+            :param region: The region to create a boto3 client for
+            :return A boto3 ec2 client, using the assumed role if iam_role_arn is set
+        '''
+        iam_role_arn = self.iam_role_arn
+
+        try:
+            if iam_role_arn is not None:
+                assumed_credentials = self._boto3_assume_role(credentials, region)
+            else:
+                assumed_credentials = credentials
+            connection = boto3_inventory_conn(conn_type='client', resource='ec2', region=region, profile_name=self.boto_profile, **assumed_credentials)
+        except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
+            if self.boto_profile:
+                try:
+                    connection = boto3_inventory_conn(conn_type='client', resource='ec2', region=region, profile_name=self.boto_profile)
+                except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
                     raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
-            yield connection, region
+            else:
+                raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
+        return connection
+
+    def _boto3_conn(self, regions):
+        '''
+            :param regions: A list of regions to create a boto3 client
 
-    def _get_instances_by_region(self, regions, filters, strict_permissions):
+            Generator that yields a boto3 client and the region
+        '''
+
+        credentials = self._get_credentials()
+
+        for region in self._get_regions(credentials, regions):
+            yield self._get_region_connection(credentials, region), region
+
+    def _get_instances_by_region(self, regions, filters, strict_permissions, extra_api_calls=True):
         '''
            :param regions: a list of regions in which to describe instances
            :param filters: a list of boto3 filter dictionaries
            :param strict_permissions: a boolean determining whether to fail or ignore 403 error codes
-           :return A list of instance dictionaries
+           :param extra_api_calls: a boolean, False skips the include_extra_api_calls lookups
+           :return A generator of instance dictionaries
         '''
-        all_instances = []
+        # By default find non-terminated/terminating instances
+        if not any(f['Name'] == 'instance-state-name' for f in filters):
+            filters.append({'Name': 'instance-state-name', 'Values': ['running', 'pending', 'stopping', 'stopped']})
+
+        fetch_workers = self.get_option('fetch_workers')
+        if fetch_workers <= 1 and self._delta_cache is None:
+            for connection, region in self._boto3_conn(regions):
+                for instance in self._describe_region_instances(connection, region, filters, strict_permissions, extra_api_calls):
+                    yield instance
+            return
 
-        for connection, region in self._boto3_conn(regions):
-            try:
-                # By default find non-terminated/terminating instances
-                if not any(f['Name'] == 'instance-state-name' for f in filters):
-                    filters.append({'Name': 'instance-state-name', 'Values': ['running', 'pending', 'stopping', 'stopped']})
-                paginator = connection.get_paginator('describe_instances')
-                reservations = paginator.paginate(Filters=filters).build_full_result().get('Reservations')
+        credentials = self._get_credentials()
+        regions = self._get_regions(credentials, regions)
+
+        def describe_region(region):
+            def fetch():
+                connection = self._get_region_connection(credentials, region)
+                return list(self._describe_region_instances(connection, region, filters, strict_permissions, extra_api_calls))
+            if self._delta_cache is None:
+                return fetch()
+            return self._delta_cache.get([region, filters, extra_api_calls], fetch)
+
+        if fetch_workers > 1:
+            # map() yields the results in the order of the regions, whichever finishes first
+            with ThreadPoolExecutor(max_workers=min(fetch_workers, len(regions))) as executor:
+                for instances in executor.map(describe_region, regions):
+                    for instance in instances:
+                        yield instance
+        else:
+            for region in regions:
+                for instance in describe_region(region):
+                    yield instance
+
+    def _describe_region_instances(self, connection, region, filters, strict_permissions, extra_api_calls=True):
+        '''
+           :param connection: a boto3 ec2 client for the region
+           :param region: the region in which to describe instances
+           :param filters: a list of boto3 filter dictionaries
+           :param strict_permissions: a boolean determining whether to fail or ignore 403 error codes
+           :param extra_api_calls: a boolean, False skips the include_extra_api_calls lookups
+           :return A generator of instance dictionaries, one describe_instances page at a time
+        '''
+        start = time.time()
+        count = 0
+        try:
+            paginator = connection.get_paginator('describe_instances')
+            for page in paginator.paginate(Filters=filters):
                 instances = []
-                for r in reservations:
+                for r in page.get('Reservations', []):
                     new_instances = r['Instances']
                     for instance in new_instances:
                         instance.update(self._get_reservation_details(r))
-                        if self.get_option('include_extra_api_calls'):
-                            instance.update(self._get_event_set_and_persistence(connection, instance['InstanceId'], instance.get('SpotInstanceRequestId')))
                     instances.extend(new_instances)
-            except botocore.exceptions.ClientError as e:
-                if e.response['ResponseMetadata']['HTTPStatusCode'] == 403 and not strict_permissions:
-                    instances = []
-                else:
-                    raise AnsibleError("Failed to describe instances: %s" % to_native(e))
-            except botocore.exceptions.BotoCoreError as e:
+                if extra_api_calls and self.get_option('include_extra_api_calls') and instances:
+                    extra_host_vars = self._get_event_set_and_persistence(connection, instances)
+                    for instance in instances:
+                        instance.update(extra_host_vars[instance['InstanceId']])
+                count += len(instances)
+                for instance in instances:
+                    yield instance
+        except botocore.exceptions.ClientError as e:
+            if e.response['ResponseMetadata']['HTTPStatusCode'] == 403 and not strict_permissions:
+                pass
+            else:
                 raise AnsibleError("Failed to describe instances: %s" % to_native(e))
+        except botocore.exceptions.BotoCoreError as e:
+            raise AnsibleError("Failed to describe instances: %s" % to_native(e))
 
-            all_instances.extend(instances)
-
-        return all_instances
+        self.display.vvv("aws_ec2: described %d instances in %s in %.2fs" % (count, region, time.time() - start))
 
     def _get_reservation_details(self, reservation):
         return {
@@ -518,22 +680,36 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             'ReservationId': reservation['ReservationId']
         }
 
-    def _get_event_set_and_persistence(self, connection, instance_id, spot_instance):
-        host_vars = {'Events': '', 'Persistent': False}
+    def _get_event_set_and_persistence(self, connection, instances):
+        '''
+            :param connection: a boto3 ec2 client
+            :param instances: a list of instance dictionaries from a single region
+            :return A dictionary of the 'Events' and 'Persistent' host variables keyed by instance ID
+        '''
+        host_vars = dict((i['InstanceId'], {'Events': '', 'Persistent': False}) for i in instances)
+        spot_requests = dict((i['SpotInstanceRequestId'], i['InstanceId']) for i in instances if i.get('SpotInstanceRequestId'))
+
         try:
-            kwargs = {'InstanceIds': [instance_id]}
-            host_vars['Events'] = connection.describe_instance_status(**kwargs)['InstanceStatuses'][0].get('Events', '')
+            paginator = connection.get_paginator('describe_instance_status')
+            for instance_ids in _chunks(sorted(host_vars), MAX_INSTANCE_IDS_PER_CALL):
+                statuses = paginator.paginate(InstanceIds=instance_ids).build_full_result().get('InstanceStatuses', [])
+                for status in statuses:
+                    if status['InstanceId'] in host_vars:
+                        host_vars[status['InstanceId']]['Events'] = status.get('Events', '')
         except (botocore.exceptions.ClientError, botocore.exceptions.BotoCoreError) as e:
             if not self.get_option('strict_permissions'):
                 pass
             else:
                 raise AnsibleError("Failed to describe instance status: %s" % to_native(e))
-        if spot_instance:
+        if spot_requests:
             try:
-                kwargs = {'SpotInstanceRequestIds': [spot_instance]}
-                host_vars['Persistent'] = bool(
-                    connection.describe_spot_instance_requests(**kwargs)['SpotInstanceRequests'][0].get('Type') == 'persistent'
-                )
+                paginator = connection.get_paginator('describe_spot_instance_requests')
+                for request_ids in _chunks(sorted(spot_requests), MAX_INSTANCE_IDS_PER_CALL):
+                    requests = paginator.paginate(SpotInstanceRequestIds=request_ids).build_full_result().get('SpotInstanceRequests', [])
+                    for request in requests:
+                        instance_id = spot_requests.get(request['SpotInstanceRequestId'])
+                        if instance_id in host_vars:
+                            host_vars[instance_id]['Persistent'] = bool(request.get('Type') == 'persistent')
             except (botocore.exceptions.ClientError, botocore.exceptions.BotoCoreError) as e:
                 if not self.get_option('strict_permissions'):
                     pass
@@ -590,6 +766,31 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             else:
                 return to_text(hostname)
 
+    def _merge_filters(self, filters):
+        '''
+            :param filters: a list of filter dictionaries, an instance matching any of them is selected
+            :return an equivalent, possibly shorter, list of boto3 filter lists
+
+            Each returned filter list is one describe_instances pass. Filters using the same names and
+            differing in the values of a single name are merged, as the values of a name are ORed by EC2.
+        '''
+        merged = []
+        for filter in filters:
+            candidate = dict((f['Name'], list(f['Values'])) for f in ansible_dict_to_boto3_filter_list(filter))
+            for planned in merged:
+                if set(planned) != set(candidate):
+                    continue
+                differing = [name for name in planned if planned[name] != candidate[name]]
+                if len(differing) > 1:
+                    continue
+                for name in differing:
+                    planned[name].extend(v for v in candidate[name] if v not in planned[name])
+                break
+            else:
+                merged.append(candidate)
+
+        return [[{'Name': name, 'Values': values} for name, values in planned.items()] for planned in merged]
+
     def _query(self, regions, include_filters, exclude_filters, strict_permissions):
         '''
             :param regions: a list of regions to query
@@ -598,26 +799,17 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             :param strict_permissions: a boolean determining whether to fail or ignore 403 error codes
 
         '''
-        instances = []
-        ids_to_ignore = []
-        for filter in exclude_filters:
-            for i in self._get_instances_by_region(
-                    regions,
-                    ansible_dict_to_boto3_filter_list(filter),
-                    strict_permissions):
-                ids_to_ignore.append(i['InstanceId'])
-        for filter in include_filters:
-            for i in self._get_instances_by_region(
-                    regions,
-                    ansible_dict_to_boto3_filter_list(filter),
-                    strict_permissions):
-                if i['InstanceId'] not in ids_to_ignore:
-                    instances.append(i)
-                    ids_to_ignore.append(i['InstanceId'])
-
-        instances = sorted(instances, key=lambda x: x['InstanceId'])
-
-        return {'aws_ec2': instances}
+        instances = {}
+        ids_to_ignore = set()
+        for filter in self._merge_filters(exclude_filters):
+            for i in self._get_instances_by_region(regions, filter, strict_permissions, extra_api_calls=False):
+                ids_to_ignore.add(i['InstanceId'])
+        for filter in self._merge_filters(include_filters):
+            for i in self._get_instances_by_region(regions, filter, strict_permissions):
+                if i['InstanceId'] not in ids_to_ignore and i['InstanceId'] not in instances:
+                    instances[i['InstanceId']] = i
+
+        return {'aws_ec2': [instances[instance_id] for instance_id in sorted(instances)]}
 
     def _populate(self, groups, hostnames):
         for group in groups:
@@ -625,43 +817,68 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             self._add_hosts(hosts=groups[group], group=group, hostnames=hostnames)
             self.inventory.add_child('all', group)
 
+    def _get_host_vars(self, instance, allowlist=None, contrib_tag_keys=False):
+        '''
+            :param instance: an instance dict returned by boto3 ec2 describe_instances()
+            :param allowlist: a set of the snake_case host variables to keep, all of them if empty
+            :param contrib_tag_keys: a boolean, adds the ec2_tag_TAGNAME keys of the old inventory script
+            :return the host variables of the instance
+        '''
+        host = {}
+        for key, value in instance.items():
+            snake_key = _to_snake_key(key)
+            if key == 'Tags' or (allowlist and snake_key not in allowlist):
+                continue
+            host[snake_key] = _snake_value(value)
+
+        if contrib_tag_keys or not allowlist or 'tags' in allowlist:
+            tags = boto3_tag_list_to_ansible_dict(instance.get('Tags', []))
+            if not allowlist or 'tags' in allowlist:
+                host['tags'] = tags
+            if contrib_tag_keys:
+                for k, v in tags.items():
+                    host["ec2_tag_%s" % k] = v
+
+        # Allow easier grouping by region
+        if 'placement' in host:
+            host['placement']['region'] = host['placement']['availability_zone'][:-1]
+
+        return host
+
     def _add_hosts(self, hosts, group, hostnames):
         '''
             :param hosts: a list of hosts to be added to a group
             :param group: the name of the group to which the hosts belong
             :param hostnames: a list of hostname destination variables in order of preference
         '''
+        allowlist = set(self.get_option('hostvars_allowlist'))
+        contrib_tag_keys = self.get_option('use_contrib_script_compatible_ec2_tag_keys')
+        strict = self.get_option('strict')
+        compose = self.get_option('compose')
+        groups = self.get_option('groups')
+        keyed_groups = self.get_option('keyed_groups')
+
         for host in hosts:
             hostname = self._get_hostname(host, hostnames)
-
-            host = camel_dict_to_snake_dict(host, ignore_list=['Tags'])
-            host['tags'] = boto3_tag_list_to_ansible_dict(host.get('tags', []))
-
-            if self.get_option('use_contrib_script_compatible_ec2_tag_keys'):
-                for k, v in host['tags'].items():
-                    host["ec2_tag_%s" % k] = v
-
-            # Allow easier grouping by region
-            host['placement']['region'] = host['placement']['availability_zone'][:-1]
-
             if not hostname:
                 continue
+
+            host = self._get_host_vars(host, allowlist, contrib_tag_keys)
+
             self.inventory.add_host(hostname, group=group)
             for hostvar, hostval in host.items():
                 self.inventory.set_variable(hostname, hostvar, hostval)
 
             # Use constructed if applicable
 
-            strict = self.get_option('strict')
-
             # Composed variables
-            self._set_composite_vars(self.get_option('compose'), host, hostname, strict=strict)
+            self._set_composite_vars(compose, host, hostname, strict=strict)
 
             # Complex groups based on jinja2 conditionals, hosts that meet the conditional are added to group
-            self._add_host_to_composed_groups(self.get_option('groups'), host, hostname, strict=strict)
+            self._add_host_to_composed_groups(groups, host, hostname, strict=strict)
 
             # Create groups based on variable values and add the corresponding hosts to it
-            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), host, hostname, strict=strict)
+            self._add_host_to_keyed_groups(keyed_groups, host, hostname, strict=strict)
 
     def _set_credentials(self, loader):
         '''
@@ -745,6 +962,21 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             # get the user-specified directive
             cache = self.get_option('cache')
 
+        # Cache every region and filter separately, only the expired entries are queried
+        if self.get_option('cache') and self.get_option('delta_cache'):
+            self._delta_cache = DeltaCache(
+                self._cache, cache_key,
+                timeout=self.get_option('delta_cache_timeout') or self.get_option('cache_timeout'),
+                refresh=not cache,
+                stale_while_revalidate=self.get_option('delta_cache_stale_while_revalidate'),
+                workers=self.get_option('fetch_workers'),
+                display=self.display)
+            results = self._query(regions, include_filters, exclude_filters, strict_permissions)
+            self._populate(results, hostnames)
+            # Store the entries already refreshed in the background before the inventory manager saves the cache
+            self._delta_cache.wait(self.get_option('delta_cache_revalidate_timeout'))
+            return
+
         # Generate inventory
         cache_needs_update = False
         if cache:
@@ -48,6 +48,16 @@ using the `aws_retry` argument. By default, no retries are used.
 
 The call will be retried the specified number of times, so the calling functions
 don't need to be wrapped in the backoff decorator.
+
+When many calls hit the same API, the retries can share a rate limiter and a
+retry budget per service and region, so that they slow down together instead
+of amplifying the throttling:
+
+    limiter = m.rate_limiter('ec2', max_rate=20)
+    ec2 = m.client('ec2', retry_decorator=AWSRetry.jittered_backoff(retries=10, rate_limiter=limiter))
+
+The counters of the limiters (calls, throttles, retries, sleep time) are
+returned in the module result as `retry_stats`.
 """
 
 from __future__ import (absolute_import, division, print_function)
@@ -71,6 +81,7 @@ from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
 from ansible.module_utils._text import to_native
 
+from .cloud import RateLimiter
 from .ec2 import HAS_BOTO3
 from .ec2 import boto3_conn
 from .ec2 import ec2_argument_spec
@@ -164,11 +175,17 @@ class AnsibleAWSModule(object):
     def exit_json(self, *args, **kwargs):
         if self.params.get('debug_botocore_endpoint_logs'):
             kwargs['resource_actions'] = self._get_resource_action_list()
+        retry_stats = RateLimiter.stats()
+        if retry_stats:
+            kwargs['retry_stats'] = retry_stats
         return self._module.exit_json(*args, **kwargs)
 
     def fail_json(self, *args, **kwargs):
         if self.params.get('debug_botocore_endpoint_logs'):
             kwargs['resource_actions'] = self._get_resource_action_list()
+        retry_stats = RateLimiter.stats()
+        if retry_stats:
+            kwargs['retry_stats'] = retry_stats
         return self._module.fail_json(*args, **kwargs)
 
     def debug(self, *args, **kwargs):
@@ -192,6 +209,13 @@ class AnsibleAWSModule(object):
                           region=region, endpoint=ec2_url, **aws_connect_kwargs)
         return conn if retry_decorator is None else _RetryingBotoClientWrapper(conn, retry_decorator)
 
+    def rate_limiter(self, service, **kwargs):
+        """Return the RateLimiter shared by the calls to service in the module's region.
+
+        The keyword arguments are passed to RateLimiter when it is first created.
+        """
+        return RateLimiter.get('{0}/{1}'.format(service, self.region), **kwargs)
+
     def resource(self, service):
         region, ec2_url, aws_connect_kwargs = get_aws_connection_info(self, boto3=True)
         return boto3_conn(self, conn_type='resource', resource=service,
@@ -29,11 +29,16 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import hashlib
 import os
 import re
 import sys
+import threading
 import traceback
 
+from collections import OrderedDict
+
+from ansible.module_utils._text import to_bytes
 from ansible.module_utils._text import to_native
 from ansible.module_utils.ansible_release import __version__
 from ansible.module_utils.basic import env_fallback
@@ -135,7 +140,35 @@ def boto3_conn(module, conn_type=None, resource=None, region=None, endpoint=None
                          "environment variables or module parameters" % module._name)
 
 
-def _boto3_conn(conn_type=None, resource=None, region=None, endpoint=None, **params):
+# boto3 sessions and clients are reused within a process: building a client resolves
+# the endpoint and loads the service model, which is a large part of the run time of
+# short modules. Clients are thread safe, sessions are not, so creation is locked.
+# The clients are keyed on their credentials, which may be temporary ones renewed
+# during a long running process, so only the most recently used ones are kept.
+_SESSION_CACHE = {}
+_CLIENT_CACHE = OrderedDict()
+_CLIENT_CACHE_SIZE = 64
+_CONN_CACHE_LOCK = threading.Lock()
+
+
+def _client_cache_key(resource, region, endpoint, profile, config, params):
+    """
+    The key of a cached client: the service, region, endpoint, profile, a hash of
+    the other parameters (credentials included) and of the client configuration.
+    """
+    digest = hashlib.sha256()
+    for item in sorted(params.items()) + sorted(vars(config).items()):
+        digest.update(to_bytes(repr(item), errors='surrogate_or_strict'))
+    return (resource, region, endpoint, profile, digest.hexdigest())
+
+
+def _get_boto3_session(profile=None):
+    if profile not in _SESSION_CACHE:
+        _SESSION_CACHE[profile] = boto3.session.Session(profile_name=profile)
+    return _SESSION_CACHE[profile]
+
+
+def _boto3_conn(conn_type=None, resource=None, region=None, endpoint=None, cache=True, **params):
     profile = params.pop('profile_name', None)
 
     if conn_type not in ['both', 'resource', 'client']:
@@ -153,18 +186,29 @@ def _boto3_conn(conn_type=None, resource=None, region=None, endpoint=None, **par
     if params.get('aws_config') is not None:
         config = config.merge(params.pop('aws_config'))
 
-    session = boto3.session.Session(
-        profile_name=profile,
-    )
-
-    if conn_type == 'resource':
-        return session.resource(resource, config=config, region_name=region, endpoint_url=endpoint, **params)
-    elif conn_type == 'client':
-        return session.client(resource, config=config, region_name=region, endpoint_url=endpoint, **params)
-    else:
-        client = session.client(resource, region_name=region, endpoint_url=endpoint, **params)
-        resource = session.resource(resource, region_name=region, endpoint_url=endpoint, **params)
-        return client, resource
+    with _CONN_CACHE_LOCK:
+        if not cache:
+            session = boto3.session.Session(profile_name=profile)
+        else:
+            session = _get_boto3_session(profile)
+
+        if conn_type == 'resource':
+            return session.resource(resource, config=config, region_name=region, endpoint_url=endpoint, **params)
+        elif conn_type == 'client':
+            if not cache:
+                return session.client(resource, config=config, region_name=region, endpoint_url=endpoint, **params)
+            key = _client_cache_key(resource, region, endpoint, profile, config, params)
+            client = _CLIENT_CACHE.pop(key, None)
+            if client is None:
+                client = session.client(resource, config=config, region_name=region, endpoint_url=endpoint, **params)
+            _CLIENT_CACHE[key] = client
+            while len(_CLIENT_CACHE) > _CLIENT_CACHE_SIZE:
+                _CLIENT_CACHE.popitem(last=False)
+            return client
+        else:
+            client = session.client(resource, region_name=region, endpoint_url=endpoint, **params)
+            resource = session.resource(resource, region_name=region, endpoint_url=endpoint, **params)
+            return client, resource
 
 
 boto3_inventory_conn = _boto3_conn
@@ -0,0 +1,128 @@
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import hashlib
+import json
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+from ansible.module_utils._text import to_bytes
+
+
+class DeltaCache(object):
+    """Per region/filter entries of an inventory plugin cache, each expiring on its own.
+
+    The entries are stored under keys derived from the plugin's cache key, together with the
+    time they were fetched, so an inventory refresh only queries the entries older than timeout.
+
+    Args:
+        cache: the inventory plugin's cache (``self._cache`` of a Cacheable plugin).
+        cache_key: the key of the inventory source, as returned by get_cache_key().
+        timeout (int): seconds after which an entry is fetched again.
+        refresh (bool): if set to true, every entry is fetched again (refresh_cache or --flush-cache).
+        stale_while_revalidate (bool): if set to true, an expired entry still held by the cache plugin
+            is returned as is and fetched again in a background thread.
+        workers (int): maximum number of background threads fetching expired entries.
+        display: a Display object used to report background failures.
+    """
+
+    def __init__(self, cache, cache_key, timeout, refresh=False, stale_while_revalidate=False, workers=1, display=None):
+        self.cache = cache
+        self.cache_key = cache_key
+        self.timeout = timeout
+        self.refresh = refresh
+        self.stale_while_revalidate = stale_while_revalidate
+        self.workers = max(1, workers)
+        self.display = display
+        self._executor = None
+        self._futures = []
+        self._refreshed = {}
+        self._lock = threading.Lock()
+
+    def entry_key(self, parts):
+        digest = hashlib.sha1(to_bytes(json.dumps(parts, sort_keys=True, default=str))).hexdigest()
+        return "{0}_{1}".format(self.cache_key, digest[:12])
+
+    def get(self, parts, fetch):
+        """Return the value cached for parts, calling fetch() when it is missing or expired.
+
+        Args:
+            parts: a JSON serialisable description of the entry, such as the region and the filters.
+            fetch: a callable without arguments returning the value of the entry.
+        """
+        key = self.entry_key(parts)
+        entry = None
+        if not self.refresh:
+            try:
+                entry = self.cache[key]
+            except KeyError:
+                pass
+
+        if entry and time.time() - entry['timestamp'] <= self.timeout:
+            return entry['value']
+
+        if entry and self.stale_while_revalidate:
+            self._forget(key)
+            self._revalidate(key, fetch)
+            return entry['value']
+
+        value = fetch()
+        with self._lock:
+            self.cache[key] = {'timestamp': time.time(), 'value': value}
+        return value
+
+    def _forget(self, key):
+        # A cache plugin adjudicator writes back every entry it loaded when the inventory cache is
+        # saved, which would replace the refreshed entry with the stale one.
+        with self._lock:
+            for entries in (getattr(self.cache, '_cache', None), getattr(self.cache, '_retrieved', None)):
+                if entries is not None:
+                    entries.pop(key, None)
+
+    def _revalidate(self, key, fetch):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            self._futures.append(self._executor.submit(self._fetch_in_background, key, fetch))
+
+    def _fetch_in_background(self, key, fetch):
+        try:
+            value = fetch()
+        except Exception as e:
+            # The stale entry was already served, the next run tries again
+            if self.display:
+                self.display.warning("Failed to refresh the inventory cache entry {0}: {1}".format(key, e))
+            return
+        entry = {'timestamp': time.time(), 'value': value}
+        with self._lock:
+            self._refreshed[key] = entry
+            # Also written through the cache plugin itself, so a refresh still running when wait()
+            # gives up is used by the next run as well.
+            plugin = getattr(self.cache, '_plugin', None)
+            if plugin is not None:
+                plugin.set(key, entry)
+
+    def wait(self, timeout=None):
+        """Wait for the background refreshes and store the refreshed entries in the cache.
+
+        Args:
+            timeout (int): maximum number of seconds to wait, 0 only stores the refreshes already
+                done. Refreshes still running afterwards are only written through the cache plugin
+                once done.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            futures, self._futures = self._futures, []
+        if executor is not None:
+            wait_futures(futures, timeout=timeout)
+            executor.shutdown(wait=False)
+        with self._lock:
+            refreshed, self._refreshed = self._refreshed, {}
+        for key, entry in refreshed.items():
+            self.cache[key] = entry
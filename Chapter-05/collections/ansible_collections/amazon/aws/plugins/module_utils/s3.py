@@ -19,17 +19,61 @@ except ImportError:
         HAS_MD5 = False
 
 
+import mmap
+import os
 import string
 
+from concurrent.futures import ThreadPoolExecutor
 
-def calculate_etag(module, filename, etag, s3, bucket, obj, version=None):
+
+def _part_sizes(module, s3, s3_kwargs, parts, max_workers=None):
+    """Return the size of each part of a multipart object.
+
+    The parts do not always have the same size, for example when they were copied with
+    UploadPartCopy, so each part is looked up, in parallel threads.
+    """
+    def head_part(part_num):
+        try:
+            head = s3.head_object(PartNumber=part_num, **s3_kwargs)
+        except (BotoCoreError, ClientError) as e:
+            module.fail_json_aws(e, msg="Failed to get head object")
+        return int(head['ContentLength'])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(head_part, range(1, parts + 1)))
+
+
+def _md5_parts(data, sizes, max_workers=None):
+    """Return the MD5 digests of the consecutive slices of data with the given sizes.
+
+    hashlib releases the GIL while hashing large buffers, so the parts are hashed in
+    parallel threads, from memoryview slices which do not copy the data.
+    """
+    offsets = []
+    offset = 0
+    for size in sizes:
+        offsets.append((offset, size))
+        offset += size
+
+    view = memoryview(data)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda part: md5(view[part[0]:part[0] + part[1]]).digest(), offsets))
+    finally:
+        view.release()
+
+
+def _multipart_etag(digests):
+    return '"{0}-{1}"'.format(md5(b''.join(digests)).hexdigest(), len(digests))
+
+
+def calculate_etag(module, filename, etag, s3, bucket, obj, version=None, max_workers=None):
     if not HAS_MD5:
         return None
 
     if '-' in etag:
         # Multi-part ETag; a hash of the hashes of each part.
         parts = int(etag[1:-1].split('-')[1])
-        digests = []
 
         s3_kwargs = dict(
             Bucket=bucket,
@@ -38,30 +82,28 @@ def calculate_etag(module, filename, etag, s3, bucket, obj, version=None):
         if version:
             s3_kwargs['VersionId'] = version
 
+        size = os.path.getsize(filename)
+        sizes = _part_sizes(module, s3, s3_kwargs, parts, max_workers)
+        if not size:
+            # mmap refuses empty files
+            return _multipart_etag(_md5_parts(b'', sizes, max_workers))
         with open(filename, 'rb') as f:
-            for part_num in range(1, parts + 1):
-                s3_kwargs['PartNumber'] = part_num
-                try:
-                    head = s3.head_object(**s3_kwargs)
-                except (BotoCoreError, ClientError) as e:
-                    module.fail_json_aws(e, msg="Failed to get head object")
-                digests.append(md5(f.read(int(head['ContentLength']))))
-
-        digest_squared = md5(b''.join(m.digest() for m in digests))
-        return '"{0}-{1}"'.format(digest_squared.hexdigest(), len(digests))
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return _multipart_etag(_md5_parts(data, sizes, max_workers))
+            finally:
+                data.close()
     else:  # Compute the MD5 sum normally
         return '"{0}"'.format(module.md5(filename))
 
 
-def calculate_etag_content(module, content, etag, s3, bucket, obj, version=None):
+def calculate_etag_content(module, content, etag, s3, bucket, obj, version=None, max_workers=None):
     if not HAS_MD5:
         return None
 
     if '-' in etag:
         # Multi-part ETag; a hash of the hashes of each part.
         parts = int(etag[1:-1].split('-')[1])
-        digests = []
-        offset = 0
 
         s3_kwargs = dict(
             Bucket=bucket,
@@ -70,18 +112,8 @@ def calculate_etag_content(module, content, etag, s3, bucket, obj, version=None)
         if version:
             s3_kwargs['VersionId'] = version
 
-        for part_num in range(1, parts + 1):
-            s3_kwargs['PartNumber'] = part_num
-            try:
-                head = s3.head_object(**s3_kwargs)
-            except (BotoCoreError, ClientError) as e:
-                module.fail_json_aws(e, msg="Failed to get head object")
-            length = int(head['ContentLength'])
-            digests.append(md5(content[offset:offset + length]))
-            offset += length
-
-        digest_squared = md5(b''.join(m.digest() for m in digests))
-        return '"{0}-{1}"'.format(digest_squared.hexdigest(), len(digests))
+        sizes = _part_sizes(module, s3, s3_kwargs, parts, max_workers)
+        return _multipart_etag(_md5_parts(content, sizes, max_workers))
     else:  # Compute the MD5 sum normally
         return '"{0}"'.format(md5(content).hexdigest())
 
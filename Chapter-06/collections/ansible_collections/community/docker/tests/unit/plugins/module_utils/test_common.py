@@ -0,0 +1,93 @@
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.community.docker.plugins.module_utils.common import (
+    AnsibleDockerClientBase,
+    APIError,
+    NotFound,
+)
+
+
+class FakeDockerClient(AnsibleDockerClientBase):
+    CONTAINERS = [
+        {'Id': 'abc123', 'Names': ['/web', '/proxy/web']},
+        {'Id': 'abc456', 'Names': ['/db']},
+    ]
+    NETWORKS = [
+        {'Id': 'fed123', 'Name': 'backend'},
+        {'Id': 'fed456', 'Name': 'backend'},
+    ]
+
+    def __init__(self):
+        self._lookup_index = None
+        self.calls = []
+
+    def fail(self, msg, **kwargs):
+        raise AssertionError(msg)
+
+    def _get_params(self):
+        return {}
+
+    def containers(self, all=False):
+        self.calls.append('containers')
+        return self.CONTAINERS
+
+    def networks(self):
+        self.calls.append('networks')
+        return self.NETWORKS
+
+    def _inspect(self, items, key, ref):
+        self.calls.append('inspect %s' % ref)
+        found = [item for item in items if item['Id'] == ref or ('/' + ref if key == 'Names' else ref) in item[key]]
+        if not found:
+            found = [item for item in items if item['Id'].startswith(ref)]
+        if len(found) > 1:
+            raise APIError('%s is ambiguous' % ref)
+        if not found:
+            raise NotFound('no such object: %s' % ref)
+        return dict(found[0], Inspected=True)
+
+    def inspect_container(self, container):
+        return self._inspect(self.CONTAINERS, 'Names', container)
+
+    def inspect_network(self, net_id):
+        return self._inspect(self.NETWORKS, 'Name', net_id)
+
+
+def test_get_container_inspects_directly():
+    client = FakeDockerClient()
+    assert client.get_container('web')['Id'] == 'abc123'
+    assert client.get_container('/db')['Id'] == 'abc456'
+    assert client.get_container('abc4')['Id'] == 'abc456'
+    assert client.get_container('missing') is None
+    assert client.calls == ['inspect web', 'inspect db', 'inspect abc4', 'inspect missing']
+
+
+def test_get_container_falls_back_to_list():
+    client = FakeDockerClient()
+    assert client.get_container('abc')['Id'] == 'abc123'
+    assert client.get_container('proxy/web')['Id'] == 'abc123'
+    assert client.calls == ['inspect abc', 'containers', 'inspect abc123', 'containers', 'inspect abc123']
+
+
+def test_lookup_index_shares_lists():
+    client = FakeDockerClient()
+    client.enable_lookup_index()
+    assert client.get_container('abc')['Id'] == 'abc123'
+    assert client.get_container('proxy/web')['Id'] == 'abc123'
+    assert client.get_network('backend')['Id'] == 'fed123'
+    assert client.get_network('fed')['Id'] == 'fed123'
+    assert client.calls.count('containers') == 1
+    assert client.calls.count('networks') == 1
+
+    client.clear_lookup_index()
+    client.get_container('abc')
+    assert client.calls.count('containers') == 2
+
+
+def test_get_network():
+    client = FakeDockerClient()
+    assert client.get_network('fed4')['Id'] == 'fed456'
+    assert client.get_network('missing') is None
+    assert client.get_network(network_id='fed123')['Id'] == 'fed123'
+    assert client.calls == ['inspect fed4', 'inspect missing', 'inspect fed123']
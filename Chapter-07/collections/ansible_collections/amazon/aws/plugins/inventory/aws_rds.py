@@ -39,6 +39,39 @@ DOCUMENTATION = '''
         iam_role_arn:
           description: The ARN of the IAM role to assume to perform the inventory lookup. You should still provide
               AWS credentials with enough privilege to perform the AssumeRole action.
+        delta_cache:
+          description:
+            - Cache the instances and clusters of each region as a separate entry instead of caching the whole inventory,
+              so that only the expired regions are queried again.
+            - Only used when I(cache) is enabled.
+          type: bool
+          default: False
+          version_added: 3.1.0
+        delta_cache_timeout:
+          description:
+            - The age in seconds after which a region of the I(delta_cache) is queried again.
+            - Defaults to I(cache_timeout). Use a lower value with I(delta_cache_stale_while_revalidate),
+              the expired entries can only be used while the cache plugin still holds them.
+          type: int
+          version_added: 3.1.0
+        delta_cache_stale_while_revalidate:
+          description:
+            - Use the expired regions of the I(delta_cache) as they are and query them again in the background,
+              so that parsing the inventory does not wait on AWS.
+            - The refreshed entries are used on the next run. The ones done by the time the inventory is populated are
+              saved with the cache, the later ones are written through the cache plugin once done.
+          type: bool
+          default: False
+          version_added: 3.1.0
+        delta_cache_revalidate_timeout:
+          description:
+            - The number of seconds to wait for the regions queried again in the background by
+              I(delta_cache_stale_while_revalidate) once the inventory is populated.
+            - By default parsing the inventory does not wait. A query taking longer keeps running and writes its
+              entry through the cache plugin once done.
+          type: int
+          default: 0
+          version_added: 3.1.0
     note:
         Ansible versions prior to 2.10 should use the fully qualified plugin name 'amazon.aws.aws_rds'.
     extends_documentation_fragment:
@@ -66,8 +99,9 @@ keyed_groups:
   - key: region
 '''
 
+from functools import partial
+
 try:
-    import boto3
     import botocore
 except ImportError:
     pass  # will be captured by imported HAS_BOTO3
@@ -81,8 +115,10 @@ from ansible.plugins.inventory import Constructable
 from ansible_collections.amazon.aws.plugins.module_utils.core import is_boto3_error_code
 from ansible_collections.amazon.aws.plugins.module_utils.ec2 import HAS_BOTO3
 from ansible_collections.amazon.aws.plugins.module_utils.ec2 import ansible_dict_to_boto3_filter_list
+from ansible_collections.amazon.aws.plugins.module_utils.ec2 import boto3_inventory_conn
 from ansible_collections.amazon.aws.plugins.module_utils.ec2 import boto3_tag_list_to_ansible_dict
 from ansible_collections.amazon.aws.plugins.module_utils.ec2 import camel_dict_to_snake_dict
+from ansible_collections.amazon.aws.plugins.module_utils.inventory_cache import DeltaCache
 
 
 class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
@@ -95,13 +131,16 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         self.boto_profile = None
         self.iam_role_arn = None
 
+        # per region cache, set up by parse() when delta_cache is enabled
+        self._delta_cache = None
+
     def _get_connection(self, credentials, region='us-east-1'):
         try:
-            connection = boto3.session.Session(profile_name=self.boto_profile).client('rds', region, **credentials)
+            connection = boto3_inventory_conn(conn_type='client', resource='rds', region=region, profile_name=self.boto_profile, **credentials)
         except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
             if self.boto_profile:
                 try:
-                    connection = boto3.session.Session(profile_name=self.boto_profile).client('rds', region)
+                    connection = boto3_inventory_conn(conn_type='client', resource='rds', region=region, profile_name=self.boto_profile)
                 except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
                     raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
             else:
@@ -117,7 +156,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         iam_role_arn = self.iam_role_arn
 
         try:
-            sts_connection = boto3.session.Session(profile_name=self.boto_profile).client('sts', region, **credentials)
+            sts_connection = boto3_inventory_conn(conn_type='client', resource='sts', region=region, profile_name=self.boto_profile, **credentials)
             sts_session = sts_connection.assume_role(RoleArn=iam_role_arn, RoleSessionName='ansible_aws_rds_dynamic_inventory')
             return dict(
                 aws_access_key_id=sts_session['Credentials']['AccessKeyId'],
@@ -127,30 +166,37 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         except botocore.exceptions.ClientError as e:
             raise AnsibleError("Unable to assume IAM role: %s" % to_native(e))
 
+    def _get_region_connection(self, region):
+        '''
+            :param region: The region to create a boto3 client for
+            :return A boto3 rds client, using the assumed role if iam_role_arn is set
+        '''
+        iam_role_arn = self.iam_role_arn
+        credentials = self.credentials
+        try:
+            if iam_role_arn is not None:
+                assumed_credentials = self._boto3_assume_role(credentials, region)
+            else:
+                assumed_credentials = credentials
+            connection = boto3_inventory_conn(conn_type='client', resource='rds', region=region, profile_name=self.boto_profile, **assumed_credentials)
+        except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
+            if self.boto_profile:
+                try:
+                    connection = boto3_inventory_conn(conn_type='client', resource='rds', region=region, profile_name=self.boto_profile)
+                except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
+                    raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
+            else:
+                raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
+        return connection
+
     def _boto3_conn(self, regions):
         '''
             :param regions: A list of regions to create a boto3 client
 
             Generator that yields a boto3 client and the region
         '''
-        iam_role_arn = self.iam_role_arn
-        credentials = self.credentials
         for region in regions:
-            try:
-                if iam_role_arn is not None:
-                    assumed_credentials = self._boto3_assume_role(credentials, region)
-                else:
-                    assumed_credentials = credentials
-                connection = boto3.session.Session(profile_name=self.boto_profile).client('rds', region, **assumed_credentials)
-            except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
-                if self.boto_profile:
-                    try:
-                        connection = boto3.session.Session(profile_name=self.boto_profile).client('rds', region)
-                    except (botocore.exceptions.ProfileNotFound, botocore.exceptions.PartialCredentialsError) as e:
-                        raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
-                else:
-                    raise AnsibleError("Insufficient credentials found: %s" % to_native(e))
-            yield connection, region
+            yield self._get_region_connection(region), region
 
     def _get_hosts_by_region(self, connection, filters, strict):
 
@@ -199,23 +245,41 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         '''
         all_instances = []
         all_clusters = []
-        for connection, region in self._boto3_conn(regions):
-            paginator = connection.get_paginator('describe_db_instances')
-            all_instances.extend(
-                self._get_hosts_by_region(connection, instance_filters, strict)
-                (paginator.paginate(Filters=instance_filters).build_full_result)
-            )
-            if gather_clusters:
-                all_clusters.extend(
-                    self._get_hosts_by_region(connection, cluster_filters, strict)
-                    (connection.describe_db_clusters, **{'Filters': cluster_filters})
-                )
+        for region in regions:
+            if self._delta_cache is None:
+                instances, clusters = self._get_region_hosts(region, instance_filters, cluster_filters, strict, gather_clusters)
+            else:
+                instances, clusters = self._delta_cache.get(
+                    [region, instance_filters, cluster_filters, gather_clusters],
+                    partial(self._get_region_hosts, region, instance_filters, cluster_filters, strict, gather_clusters))
+            all_instances.extend(instances)
+            all_clusters.extend(clusters)
         sorted_hosts = list(
             sorted(all_instances, key=lambda x: x['DBInstanceIdentifier']) +
             sorted(all_clusters, key=lambda x: x['DBClusterIdentifier'])
         )
         return self.find_hosts_with_valid_statuses(sorted_hosts, statuses)
 
+    def _get_region_hosts(self, region, instance_filters, cluster_filters, strict, gather_clusters=False):
+        '''
+           :param region: the region in which to describe hosts
+           :param instance_filters: a list of boto3 filter dictionaries
+           :param cluster_filters: a list of boto3 filter dictionaries
+           :param strict: a boolean determining whether to fail or ignore 403 error codes
+           :return A tuple of the lists of instance and cluster dictionaries
+        '''
+        connection = self._get_region_connection(region)
+        paginator = connection.get_paginator('describe_db_instances')
+        instances = self._get_hosts_by_region(connection, instance_filters, strict)(
+            paginator.paginate(Filters=instance_filters).build_full_result
+        )
+        clusters = []
+        if gather_clusters:
+            clusters = self._get_hosts_by_region(connection, cluster_filters, strict)(
+                connection.describe_db_clusters, **{'Filters': cluster_filters}
+            )
+        return instances, clusters
+
     def find_hosts_with_valid_statuses(self, hosts, statuses):
         if 'all' in statuses:
             return hosts
@@ -357,6 +421,20 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             # get the user-specified directive
             cache = self.get_option('cache')
 
+        # Cache every region separately, only the expired entries are queried
+        if self.get_option('cache') and self.get_option('delta_cache'):
+            self._delta_cache = DeltaCache(
+                self._cache, cache_key,
+                timeout=self.get_option('delta_cache_timeout') or self.get_option('cache_timeout'),
+                refresh=not cache,
+                stale_while_revalidate=self.get_option('delta_cache_stale_while_revalidate'),
+                display=self.display)
+            results = self._get_all_hosts(regions, instance_filters, cluster_filters, strict_permissions, statuses, include_clusters)
+            self._populate(results)
+            # Store the entries already refreshed in the background before the inventory manager saves the cache
+            self._delta_cache.wait(self.get_option('delta_cache_revalidate_timeout'))
+            return
+
         # Generate inventory
         formatted_inventory = {}
         cache_needs_update = False
@@ -31,7 +31,15 @@ __metaclass__ = type
 
 import time
 import functools
+import json
 import random
+import threading
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
 
 
 class BackoffIterator:
@@ -61,11 +69,149 @@ class BackoffIterator:
         return return_value
 
 
-def _retry_func(func, sleep_time_generator, retries, catch_extra_error_codes, found_f, status_code_from_except_f, base_class):
+class RateLimiter:
+    """Adaptive token bucket rate limiter and retry budget, shared by the calls made to the same service/region.
+
+    Every attempt waits for a token. A retryable error halves the rate (down to min_rate) and each success
+    raises it again by rate_increase, up to max_rate. Each retry also spends retry_cost from the retry budget
+    and each success gives 1 back; once the budget is spent the errors are raised instead of retried, so that
+    callers stop amplifying the throttling.
+
+    Use RateLimiter.get() to share a limiter within a process. With state_file the bucket and the budget are
+    kept in a locked file instead, and shared by every process using the same file, such as the forks of a
+    playbook run.
+
+    Args:
+        max_rate (int or float): maximum number of calls per second.
+        min_rate (int or float): the rate is never reduced below this value.
+        rate_increase (int or float): calls per second added to the rate after each successful call.
+        burst (int or None): number of calls that can be made at once, defaults to max_rate.
+        retry_budget (int): size of the retry budget.
+        retry_cost (int): amount of the budget spent by a retry.
+        state_file (str or None): path of the file holding the shared state.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, max_rate=10, min_rate=0.5, rate_increase=0.5, burst=None, retry_budget=500, retry_cost=5, state_file=None):
+        self.max_rate = float(max_rate)
+        self.min_rate = float(min_rate)
+        self.rate_increase = float(rate_increase)
+        self.burst = float(burst or max_rate)
+        self.retry_budget = retry_budget
+        self.retry_cost = retry_cost
+        self.state_file = state_file
+        if state_file and not HAS_FCNTL:
+            raise ValueError('A shared state_file requires fcntl')
+        self._lock = threading.Lock()
+        self._state = self._initial_state()
+        self.counters = dict(calls=0, throttles=0, retries=0, retries_denied=0, sleep_time=0.0)
+
+    @classmethod
+    def get(cls, name, **kwargs):
+        """Return the limiter registered as name in this process, creating it with kwargs if needed.
+        Args:
+            name (str): the key of the limiter, for instance "ec2/us-east-1".
+        """
+        with cls._instances_lock:
+            if name not in cls._instances:
+                cls._instances[name] = cls(**kwargs)
+            return cls._instances[name]
+
+    @classmethod
+    def stats(cls):
+        """Return the counters of the limiters registered in this process, keyed by name."""
+        with cls._instances_lock:
+            return dict((name, limiter._counters()) for name, limiter in cls._instances.items())
+
+    def _count(self, **increments):
+        # The limiters are shared by the threads of the process
+        with self._lock:
+            for counter, increment in increments.items():
+                self.counters[counter] += increment
+
+    def _counters(self):
+        with self._lock:
+            return dict(self.counters)
+
+    def _initial_state(self):
+        return dict(tokens=self.burst, timestamp=time.time(), rate=self.max_rate, budget=self.retry_budget)
+
+    def _update(self, update_f):
+        with self._lock:
+            if not self.state_file:
+                return update_f(self._state)
+            with open(self.state_file, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read())
+                    except ValueError:
+                        state = self._initial_state()
+                    result = update_f(state)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                return result
+
+    def acquire(self):
+        """Wait until a call can be made."""
+        def take_token(state):
+            now = time.time()
+            state['tokens'] = min(self.burst, state['tokens'] + (now - state['timestamp']) * state['rate'])
+            state['timestamp'] = now
+            # Tokens can go negative, the next callers then wait in turn
+            state['tokens'] -= 1
+            if state['tokens'] >= 0:
+                return 0
+            return -state['tokens'] / state['rate']
+
+        delay = self._update(take_token)
+        self._count(calls=1)
+        if delay:
+            self.sleep(delay)
+
+    def succeeded(self):
+        """Record a successful call."""
+        def increase(state):
+            state['rate'] = min(self.max_rate, state['rate'] + self.rate_increase)
+            state['budget'] = min(self.retry_budget, state['budget'] + 1)
+
+        self._update(increase)
+
+    def throttled(self):
+        """Record a retryable error, return True if the call may be retried."""
+        def decrease(state):
+            state['rate'] = max(self.min_rate, state['rate'] / 2)
+            if state['budget'] < self.retry_cost:
+                return False
+            state['budget'] -= self.retry_cost
+            return True
+
+        allowed = self._update(decrease)
+        if allowed:
+            self._count(throttles=1, retries=1)
+        else:
+            self._count(throttles=1, retries_denied=1)
+        return allowed
+
+    def sleep(self, delay):
+        self._count(sleep_time=delay)
+        time.sleep(delay)
+
+
+def _retry_func(func, sleep_time_generator, retries, catch_extra_error_codes, found_f, status_code_from_except_f, base_class, rate_limiter=None):
     counter = 0
     for sleep_time in sleep_time_generator:
+        if rate_limiter:
+            rate_limiter.acquire()
         try:
-            return func()
+            result = func()
         except Exception as exc:
             counter += 1
             if counter == retries:
@@ -74,9 +220,18 @@ def _retry_func(func, sleep_time_generator, retries, catch_extra_error_codes, fo
                 raise
             status_code = status_code_from_except_f(exc)
             if found_f(status_code, catch_extra_error_codes):
-                time.sleep(sleep_time)
+                if rate_limiter is None:
+                    time.sleep(sleep_time)
+                elif rate_limiter.throttled():
+                    rate_limiter.sleep(sleep_time)
+                else:
+                    raise
             else:
                 raise
+        else:
+            if rate_limiter:
+                rate_limiter.succeeded()
+            return result
 
 
 class CloudRetry:
@@ -110,7 +265,7 @@ class CloudRetry:
         return _is_iterable() and response_code in catch_extra_error_codes
 
     @classmethod
-    def base_decorator(cls, retries, found, status_code_from_exception, catch_extra_error_codes, sleep_time_generator):
+    def base_decorator(cls, retries, found, status_code_from_exception, catch_extra_error_codes, sleep_time_generator, rate_limiter=None):
         def retry_decorator(func):
             @functools.wraps(func)
             def _retry_wrapper(*args, **kwargs):
@@ -123,12 +278,13 @@ class CloudRetry:
                     found_f=found,
                     status_code_from_except_f=status_code_from_exception,
                     base_class=cls.base_class,
+                    rate_limiter=rate_limiter,
                 )
             return _retry_wrapper
         return retry_decorator
 
     @classmethod
-    def exponential_backoff(cls, retries=10, delay=3, backoff=2, max_delay=60, catch_extra_error_codes=None):
+    def exponential_backoff(cls, retries=10, delay=3, backoff=2, max_delay=60, catch_extra_error_codes=None, rate_limiter=None):
         """Wrap a callable with retry behavior.
         Args:
             retries (int): Number of times to retry a failed request before giving up
@@ -141,6 +297,8 @@ class CloudRetry:
                 default=60
             catch_extra_error_codes: Additional error messages to catch, in addition to those which may be defined by a subclass of CloudRetry
                 default=None
+            rate_limiter (RateLimiter or None): A rate limiter and retry budget shared with other callers
+                default=None
         Returns:
             Callable: A generator that calls the decorated function using an exponential backoff.
         """
@@ -151,10 +309,11 @@ class CloudRetry:
             status_code_from_exception=cls.status_code_from_exception,
             catch_extra_error_codes=catch_extra_error_codes,
             sleep_time_generator=sleep_time_generator,
+            rate_limiter=rate_limiter,
         )
 
     @classmethod
-    def jittered_backoff(cls, retries=10, delay=3, backoff=2.0, max_delay=60, catch_extra_error_codes=None):
+    def jittered_backoff(cls, retries=10, delay=3, backoff=2.0, max_delay=60, catch_extra_error_codes=None, rate_limiter=None):
         """Wrap a callable with retry behavior.
         Args:
             retries (int): Number of times to retry a failed request before giving up
@@ -167,6 +326,8 @@ class CloudRetry:
                 default=60
             catch_extra_error_codes: Additional error messages to catch, in addition to those which may be defined by a subclass of CloudRetry
                 default=None
+            rate_limiter (RateLimiter or None): A rate limiter and retry budget shared with other callers
+                default=None
         Returns:
             Callable: A generator that calls the decorated function using using a jittered backoff strategy.
         """
@@ -177,6 +338,7 @@ class CloudRetry:
             status_code_from_exception=cls.status_code_from_exception,
             catch_extra_error_codes=catch_extra_error_codes,
             sleep_time_generator=sleep_time_generator,
+            rate_limiter=rate_limiter,
         )
 
     @classmethod
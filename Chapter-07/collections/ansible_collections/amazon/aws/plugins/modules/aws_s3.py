@@ -196,6 +196,20 @@ options:
         type: str
         description:
         - version ID of the source object.
+  part_size:
+    description:
+      - Size in MiB of the parts of multipart uploads and ranged downloads.
+      - Objects larger than one part are transferred part by part, up to I(max_concurrency) parts at a time.
+      - S3 requires parts of at least 5 MiB. Defaults to the boto3 part size of 8 MiB.
+    type: int
+    version_added: 3.1.0
+  max_concurrency:
+    description:
+      - Maximum number of threads transferring the parts of an object with I(mode=put) or I(mode=get).
+      - Also used to hash the parts of a local file in parallel when I(overwrite=different).
+      - Defaults to the boto3 concurrency of 10 threads.
+    type: int
+    version_added: 3.1.0
 author:
     - "Lester Wade (@lwade)"
     - "Sloane Hertel (@s-hertel)"
@@ -237,6 +251,16 @@ EXAMPLES = '''
     dest: /usr/local/myfile.txt
     mode: get
 
+- name: PUT a large artifact in 64 MiB parts, 16 parts at a time
+  amazon.aws.aws_s3:
+    bucket: mybucket
+    object: /artifacts/image.qcow2
+    src: /srv/build/image.qcow2
+    mode: put
+    overwrite: different
+    part_size: 64
+    max_concurrency: 16
+
 - name: Get a specific version of an object.
   amazon.aws.aws_s3:
     bucket: mybucket
@@ -357,6 +381,7 @@ import time
 
 try:
     import botocore
+    from boto3.s3.transfer import TransferConfig
 except ImportError:
     pass  # Handled by AnsibleAWSModule
 
@@ -404,9 +429,11 @@ def key_check(module, s3, bucket, obj, version=None, validate=True):
 def etag_compare(module, s3, bucket, obj, version=None, local_file=None, content=None):
     s3_etag = get_etag(s3, bucket, obj, version=version)
     if local_file is not None:
-        local_etag = calculate_etag(module, local_file, s3_etag, s3, bucket, obj, version)
+        local_etag = calculate_etag(module, local_file, s3_etag, s3, bucket, obj, version,
+                                    max_workers=module.params.get('max_concurrency'))
     else:
-        local_etag = calculate_etag_content(module, content, s3_etag, s3, bucket, obj, version)
+        local_etag = calculate_etag_content(module, content, s3_etag, s3, bucket, obj, version,
+                                            max_workers=module.params.get('max_concurrency'))
 
     return s3_etag == local_etag
 
@@ -577,6 +604,18 @@ def option_in_extra_args(option):
         return allowed_extra_args[temp_option]
 
 
+def transfer_config(module):
+    """Return the keyword arguments setting the part size and concurrency of managed transfers."""
+    config = {}
+    if module.params.get('part_size'):
+        config['multipart_threshold'] = config['multipart_chunksize'] = module.params['part_size'] * 1024 * 1024
+    if module.params.get('max_concurrency'):
+        config['max_concurrency'] = module.params['max_concurrency']
+    if not config:
+        return {}
+    return {'Config': TransferConfig(**config)}
+
+
 def upload_s3file(module, s3, bucket, obj, expiry, metadata, encrypt, headers, src=None, content=None):
     if module.check_mode:
         module.exit_json(msg="PUT operation skipped - running in check mode", changed=True)
@@ -614,10 +653,10 @@ def upload_s3file(module, s3, bucket, obj, expiry, metadata, encrypt, headers, s
             extra['ContentType'] = content_type
 
         if src is not None:
-            s3.upload_file(Filename=src, Bucket=bucket, Key=obj, ExtraArgs=extra)
+            s3.upload_file(Filename=src, Bucket=bucket, Key=obj, ExtraArgs=extra, **transfer_config(module))
         else:
             f = io.BytesIO(content)
-            s3.upload_fileobj(Fileobj=f, Bucket=bucket, Key=obj, ExtraArgs=extra)
+            s3.upload_fileobj(Fileobj=f, Bucket=bucket, Key=obj, ExtraArgs=extra, **transfer_config(module))
     except (botocore.exceptions.ClientError, botocore.exceptions.BotoCoreError) as e:
         module.fail_json_aws(e, msg="Unable to complete PUT operation.")
     try:
@@ -658,6 +697,7 @@ def download_s3file(module, s3, bucket, obj, dest, retries, version=None):
         module.fail_json_aws(e, msg="Could not find the key %s." % obj)
 
     optional_kwargs = {'ExtraArgs': {'VersionId': version}} if version else {}
+    optional_kwargs.update(transfer_config(module))
     for x in range(0, retries + 1):
         try:
             s3.download_file(bucket, obj, dest, **optional_kwargs)
@@ -901,6 +941,8 @@ def main():
         tags=dict(type='dict'),
         purge_tags=dict(type='bool', default=True),
         copy_src=dict(type='dict', options=dict(bucket=dict(required=True), object=dict(required=True), version_id=dict())),
+        part_size=dict(type='int'),
+        max_concurrency=dict(type='int'),
     )
     module = AnsibleAWSModule(
         argument_spec=argument_spec,
@@ -946,6 +988,11 @@ def main():
         else:
             overwrite = 'never'
 
+    if module.params.get('part_size') is not None and module.params['part_size'] < 5:
+        module.fail_json(msg='part_size must be at least 5 MiB')
+    if module.params.get('max_concurrency') is not None and module.params['max_concurrency'] < 1:
+        module.fail_json(msg='max_concurrency must be at least 1')
+
     if overwrite == 'different' and not HAS_MD5:
         module.fail_json(msg='overwrite=different is unavailable: ETag calculation requires MD5 support')
 
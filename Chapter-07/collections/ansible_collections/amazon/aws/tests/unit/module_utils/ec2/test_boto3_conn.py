@@ -0,0 +1,78 @@
+# (c) 2022 Red Hat Inc.
+#
+# This file is part of Ansible
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.amazon.aws.tests.unit.compat.mock import MagicMock
+from ansible_collections.amazon.aws.tests.unit.compat.mock import patch
+from ansible_collections.amazon.aws.plugins.module_utils import ec2
+from ansible_collections.amazon.aws.plugins.module_utils.core import _RetryingBotoClientWrapper
+
+boto3 = pytest.importorskip('boto3')
+botocore = pytest.importorskip('botocore')
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.client.side_effect = lambda *args, **kwargs: MagicMock()
+    with patch.dict(ec2._SESSION_CACHE, clear=True), patch.dict(ec2._CLIENT_CACHE, clear=True), \
+            patch.object(ec2.boto3.session, 'Session', return_value=session) as session_class:
+        yield session_class
+
+
+def test_client_is_reused(session):
+    first = ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_access_key_id='a', aws_secret_access_key='b')
+    second = ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_access_key_id='a', aws_secret_access_key='b')
+    assert first is second
+    assert session.call_count == 1
+    assert session.return_value.client.call_count == 1
+
+
+def test_client_cache_key(session):
+    clients = [
+        ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_access_key_id='a', aws_secret_access_key='b'),
+        ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-2', aws_access_key_id='a', aws_secret_access_key='b'),
+        ec2._boto3_conn(conn_type='client', resource='s3', region='us-east-1', aws_access_key_id='a', aws_secret_access_key='b'),
+        ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_access_key_id='a', aws_secret_access_key='c'),
+        ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', endpoint='https://localhost',
+                        aws_access_key_id='a', aws_secret_access_key='b'),
+        ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_access_key_id='a', aws_secret_access_key='b',
+                        aws_config=botocore.config.Config(retries={'max_attempts': 10})),
+    ]
+    assert len(set(id(c) for c in clients)) == len(clients)
+    # one session per profile
+    assert session.call_count == 1
+
+
+def test_client_cache_keeps_recently_used_clients(session):
+    with patch.object(ec2, '_CLIENT_CACHE_SIZE', 2):
+        first = ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_session_token='token-1')
+        ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_session_token='token-2')
+        assert ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_session_token='token-1') is first
+        ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_session_token='token-3')
+
+    assert len(ec2._CLIENT_CACHE) == 2
+    # token-2 was the least recently used
+    ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', aws_session_token='token-2')
+    assert session.return_value.client.call_count == 4
+
+
+def test_client_cache_disabled(session):
+    first = ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', cache=False)
+    second = ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1', cache=False)
+    assert first is not second
+    assert session.call_count == 2
+
+
+def test_retrying_wrapper_uses_cached_client(session):
+    client = ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1')
+    first = _RetryingBotoClientWrapper(ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1'), ec2.AWSRetry.jittered_backoff())
+    second = _RetryingBotoClientWrapper(ec2._boto3_conn(conn_type='client', resource='ec2', region='us-east-1'), ec2.AWSRetry.jittered_backoff())
+    assert first.client is second.client is client
+    assert session.return_value.client.call_count == 1
@@ -6,9 +6,13 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-from ansible_collections.amazon.aws.plugins.module_utils.cloud import CloudRetry, BackoffIterator
+from ansible_collections.amazon.aws.plugins.module_utils.cloud import CloudRetry, BackoffIterator, RateLimiter
+from ansible_collections.amazon.aws.tests.unit.compat.mock import patch
+import os
 import unittest
 import random
+import tempfile
+import threading
 from datetime import datetime
 
 
@@ -261,3 +265,116 @@ class CloudRetryUtils(unittest.TestCase):
                 assert duration == _duration
             finally:
                 assert raised
+
+
+class ThrottledError(Exception):
+    status = 'Throttling'
+
+
+class ThrottleRetry(CloudRetry):
+    base_class = ThrottledError
+
+    @staticmethod
+    def status_code_from_exception(error):
+        return error.status
+
+    @staticmethod
+    def found(response_code, catch_extra_error_codes=None):
+        return response_code == 'Throttling'
+
+
+def test_rate_limiter_waits_for_tokens():
+    limiter = RateLimiter(max_rate=10, burst=2)
+    with patch('time.sleep') as sleep:
+        for dummy in range(4):
+            limiter.acquire()
+    delays = [c[0][0] for c in sleep.call_args_list]
+    assert len(delays) == 2
+    assert 0.05 < delays[0] <= 0.1
+    assert 0.15 < delays[1] <= 0.2
+    assert limiter.counters['calls'] == 4
+    assert limiter.counters['sleep_time'] == sum(delays)
+
+
+def test_rate_limiter_counts_calls_of_all_threads():
+    limiter = RateLimiter(max_rate=10, burst=10)
+
+    def call():
+        for dummy in range(1000):
+            limiter.acquire()
+            limiter.throttled()
+
+    with patch('time.sleep'):
+        threads = [threading.Thread(target=call) for dummy in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    stats = limiter._counters()
+    assert stats['calls'] == 8000
+    assert stats['throttles'] == 8000
+    assert stats['retries'] + stats['retries_denied'] == 8000
+
+
+def test_rate_limiter_adapts_rate():
+    limiter = RateLimiter(max_rate=8, min_rate=1, rate_increase=1)
+    for dummy in range(5):
+        limiter.throttled()
+    assert limiter._state['rate'] == 1
+    limiter.succeeded()
+    limiter.succeeded()
+    assert limiter._state['rate'] == 3
+
+
+def test_rate_limiter_retry_budget():
+    limiter = RateLimiter(max_rate=1000, retry_budget=10, retry_cost=5)
+
+    @ThrottleRetry.exponential_backoff(retries=10, delay=0, rate_limiter=limiter)
+    def always_throttled():
+        always_throttled.counter += 1
+        raise ThrottledError()
+
+    always_throttled.counter = 0
+    try:
+        always_throttled()
+    except ThrottledError:
+        pass
+    # two retries fit in the budget, the third error is raised
+    assert always_throttled.counter == 3
+    assert limiter.counters['throttles'] == 3
+    assert limiter.counters['retries'] == 2
+    assert limiter.counters['retries_denied'] == 1
+
+    @ThrottleRetry.exponential_backoff(retries=10, delay=0, rate_limiter=limiter)
+    def succeeds():
+        return True
+
+    for dummy in range(5):
+        assert succeeds()
+    assert limiter._state['budget'] == 5
+
+
+def test_rate_limiter_shared_through_file():
+    fd, state_file = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        first = RateLimiter(max_rate=1000, retry_budget=10, retry_cost=5, state_file=state_file)
+        second = RateLimiter(max_rate=1000, retry_budget=10, retry_cost=5, state_file=state_file)
+        assert first.throttled()
+        assert second.throttled()
+        assert not first.throttled()
+        assert first.counters['retries'] == 1
+        assert second.counters['retries'] == 1
+    finally:
+        os.remove(state_file)
+
+
+def test_rate_limiter_registry():
+    limiter = RateLimiter.get('unittest/us-east-1', max_rate=5)
+    try:
+        assert RateLimiter.get('unittest/us-east-1') is limiter
+        assert limiter.max_rate == 5
+        limiter.throttled()
+        assert RateLimiter.stats()['unittest/us-east-1']['throttles'] == 1
+    finally:
+        RateLimiter._instances.pop('unittest/us-east-1')
@@ -0,0 +1,122 @@
+#
+# (c) 2022 Red Hat Inc.
+#
+# This file is part of Ansible
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+
+from ansible.plugins.cache import CachePluginAdjudicator
+
+from ansible_collections.amazon.aws.tests.unit.compat.mock import MagicMock
+from ansible_collections.amazon.aws.plugins.module_utils.inventory_cache import DeltaCache
+
+
+def test_delta_cache_fetches_missing_entries():
+    cache = {}
+    fetch = MagicMock(return_value=['i-1'])
+    delta_cache = DeltaCache(cache, 'aws_ec2_key', timeout=60)
+
+    assert delta_cache.get(['us-east-1', []], fetch) == ['i-1']
+    assert delta_cache.get(['us-east-1', []], fetch) == ['i-1']
+    assert fetch.call_count == 1
+    assert list(cache) == [delta_cache.entry_key(['us-east-1', []])]
+    assert cache[delta_cache.entry_key(['us-east-1', []])]['value'] == ['i-1']
+
+
+def test_delta_cache_entries_expire_separately():
+    delta_cache = DeltaCache({}, 'aws_ec2_key', timeout=60)
+    east = delta_cache.entry_key(['us-east-1', []])
+    west = delta_cache.entry_key(['us-west-1', []])
+    delta_cache.cache[east] = {'timestamp': time.time() - 120, 'value': ['i-old']}
+    delta_cache.cache[west] = {'timestamp': time.time(), 'value': ['i-west']}
+
+    assert delta_cache.get(['us-east-1', []], lambda: ['i-new']) == ['i-new']
+    assert delta_cache.get(['us-west-1', []], lambda: ['i-unused']) == ['i-west']
+    assert delta_cache.cache[east]['value'] == ['i-new']
+
+
+def test_delta_cache_refresh():
+    delta_cache = DeltaCache({}, 'aws_ec2_key', timeout=60, refresh=True)
+    key = delta_cache.entry_key(['us-east-1', []])
+    delta_cache.cache[key] = {'timestamp': time.time(), 'value': ['i-cached']}
+
+    assert delta_cache.get(['us-east-1', []], lambda: ['i-new']) == ['i-new']
+    assert delta_cache.cache[key]['value'] == ['i-new']
+
+
+def test_delta_cache_stale_while_revalidate():
+    plugin = MagicMock()
+    cache = MagicMock()
+    cache._plugin = plugin
+    delta_cache = DeltaCache(cache, 'aws_ec2_key', timeout=60, stale_while_revalidate=True)
+    key = delta_cache.entry_key(['us-east-1', []])
+    cache.__getitem__.return_value = {'timestamp': time.time() - 120, 'value': ['i-stale']}
+
+    assert delta_cache.get(['us-east-1', []], lambda: ['i-new']) == ['i-stale']
+    delta_cache.wait()
+
+    assert plugin.set.call_count == 1
+    assert plugin.set.call_args[0][0] == key
+    assert plugin.set.call_args[0][1]['value'] == ['i-new']
+
+
+def test_delta_cache_background_failure_keeps_stale_entry():
+    display = MagicMock()
+    delta_cache = DeltaCache({}, 'aws_ec2_key', timeout=60, stale_while_revalidate=True, display=display)
+    key = delta_cache.entry_key(['us-east-1', []])
+    delta_cache.cache[key] = {'timestamp': time.time() - 120, 'value': ['i-stale']}
+
+    def fetch():
+        raise Exception('throttled')
+
+    assert delta_cache.get(['us-east-1', []], fetch) == ['i-stale']
+    delta_cache.wait()
+
+    assert delta_cache.cache[key]['value'] == ['i-stale']
+    assert display.warning.called
+
+
+def test_delta_cache_stale_while_revalidate_saved_with_inventory_cache(tmp_path):
+    cache = CachePluginAdjudicator(plugin_name='ansible.builtin.jsonfile', _uri=str(tmp_path), _timeout=3600)
+    delta_cache = DeltaCache(cache, 'aws_ec2_key', timeout=60, stale_while_revalidate=True)
+    east = delta_cache.entry_key(['us-east-1', []])
+    west = delta_cache.entry_key(['us-west-1', []])
+    cache._plugin.set(east, {'timestamp': time.time() - 120, 'value': ['i-stale']})
+
+    assert delta_cache.get(['us-east-1', []], lambda: ['i-new']) == ['i-stale']
+    assert delta_cache.get(['us-west-1', []], lambda: ['i-west']) == ['i-west']
+    delta_cache.wait()
+    # what the inventory manager does once the source is parsed
+    cache.update_cache_if_changed()
+
+    cache = CachePluginAdjudicator(plugin_name='ansible.builtin.jsonfile', _uri=str(tmp_path), _timeout=3600)
+    assert cache[east]['value'] == ['i-new']
+    assert cache[west]['value'] == ['i-west']
+
+
+def test_delta_cache_refresh_landing_after_inventory_cache_save(tmp_path):
+    cache = CachePluginAdjudicator(plugin_name='ansible.builtin.jsonfile', _uri=str(tmp_path), _timeout=3600)
+    delta_cache = DeltaCache(cache, 'aws_ec2_key', timeout=60, stale_while_revalidate=True)
+    east = delta_cache.entry_key(['us-east-1', []])
+    cache._plugin.set(east, {'timestamp': time.time() - 120, 'value': ['i-stale']})
+    release = threading.Event()
+
+    def fetch():
+        release.wait(10)
+        return ['i-new']
+
+    assert delta_cache.get(['us-east-1', []], fetch) == ['i-stale']
+    assert delta_cache.get(['us-west-1', []], lambda: ['i-west']) == ['i-west']
+    executor = delta_cache._executor
+    delta_cache.wait(timeout=0)
+    cache.update_cache_if_changed()
+    release.set()
+    executor.shutdown(wait=True)
+
+    cache = CachePluginAdjudicator(plugin_name='ansible.builtin.jsonfile', _uri=str(tmp_path), _timeout=3600)
+    assert cache[east]['value'] == ['i-new']
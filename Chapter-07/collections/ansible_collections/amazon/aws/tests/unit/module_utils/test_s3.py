@@ -7,10 +7,72 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from hashlib import md5
+import os
+import tempfile
+
 from ansible_collections.amazon.aws.tests.unit.compat.mock import MagicMock
 from ansible_collections.amazon.aws.plugins.module_utils import s3
 
 
+def multipart_etag(data, sizes):
+    digests = []
+    offset = 0
+    for size in sizes:
+        digests.append(md5(data[offset:offset + size]).digest())
+        offset += size
+    return '"{0}-{1}"'.format(md5(b''.join(digests)).hexdigest(), len(sizes))
+
+
+def s3_client(sizes):
+    client = MagicMock()
+    client.head_object.side_effect = lambda PartNumber, **kwargs: {'ContentLength': sizes[PartNumber - 1]}
+    return client
+
+
+def test_calculate_etag_content_uniform_parts():
+    content = os.urandom(2500)
+    etag = multipart_etag(content, [1000, 1000, 500])
+    client = s3_client([1000, 1000, 500])
+
+    assert s3.calculate_etag_content(MagicMock(), content, etag, client, 'bucket', 'key', max_workers=2) == etag
+    assert client.head_object.call_count == 3
+    client.head_object.assert_any_call(Bucket='bucket', Key='key', PartNumber=1)
+
+
+def test_calculate_etag_content_uneven_parts():
+    content = os.urandom(2500)
+    etag = multipart_etag(content, [1000, 500, 500, 500])
+    client = s3_client([1000, 500, 500, 500])
+    assert s3.calculate_etag_content(MagicMock(), content, etag, client, 'bucket', 'key', version='v1') == etag
+    assert client.head_object.call_count == 4
+    client.head_object.assert_any_call(Bucket='bucket', Key='key', VersionId='v1', PartNumber=4)
+
+
+def test_calculate_etag_content_copied_parts():
+    # 2500 bytes also fit in 3 parts of 1000 bytes, but the middle part is smaller
+    content = os.urandom(2500)
+    etag = multipart_etag(content, [1000, 500, 1000])
+    client = s3_client([1000, 500, 1000])
+    assert s3.calculate_etag_content(MagicMock(), content, etag, client, 'bucket', 'key') == etag
+
+
+def test_calculate_etag_file():
+    content = os.urandom(2500)
+    fd, filename = tempfile.mkstemp()
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    try:
+        etag = multipart_etag(content, [1000, 1000, 500])
+        client = s3_client([1000, 1000, 500])
+        assert s3.calculate_etag(MagicMock(), filename, etag, client, 'bucket', 'key', max_workers=3) == etag
+
+        changed = multipart_etag(content[:-1] + b'x', [1000, 1000, 500])
+        assert s3.calculate_etag(MagicMock(), filename, changed, client, 'bucket', 'key') != changed
+    finally:
+        os.remove(filename)
+
+
 def test_validate_bucket_name():
     module = MagicMock()
 
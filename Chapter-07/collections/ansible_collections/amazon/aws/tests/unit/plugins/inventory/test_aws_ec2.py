@@ -21,6 +21,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import copy
 import pytest
 import datetime
 
@@ -29,8 +30,12 @@ boto3 = pytest.importorskip('boto3')
 botocore = pytest.importorskip('botocore')
 
 from ansible.errors import AnsibleError
+from ansible.inventory.data import InventoryData
+from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
 from ansible.parsing.dataloader import DataLoader
+from ansible_collections.amazon.aws.tests.unit.compat.mock import MagicMock, patch
 from ansible_collections.amazon.aws.plugins.inventory.aws_ec2 import InventoryModule, instance_data_filter_to_boto_attr
+from ansible_collections.amazon.aws.plugins.module_utils.inventory_cache import DeltaCache
 
 
 instances = {
@@ -220,3 +225,222 @@ def test_include_filters_with_filter_and_include_filters(inventory):
     assert inventory.build_include_filters() == [
         {"from_filter": 1},
         {"from_include_filter": "bar"}]
+
+
+def _region_connection(region):
+    connection = MagicMock()
+    reservation = copy.deepcopy(instances)
+    reservation['Instances'][0]['InstanceId'] = 'i-%s' % region
+    connection.get_paginator.return_value.paginate.return_value = [{'Reservations': [reservation]}]
+    return connection
+
+
+@pytest.mark.parametrize("fetch_workers", [1, 4])
+def test_get_instances_by_region_keeps_region_order(inventory, fetch_workers):
+    inventory._options = {
+        'fetch_workers': fetch_workers,
+        'include_extra_api_calls': False,
+    }
+    regions = ['us-east-1', 'us-east-2', 'us-west-1', 'us-west-2', 'eu-west-1']
+    filters = []
+    with patch.object(inventory, '_get_credentials', return_value={}), \
+            patch.object(inventory, '_get_region_connection', side_effect=lambda credentials, region: _region_connection(region)):
+        result = list(inventory._get_instances_by_region(regions, filters, True))
+
+    assert [i['InstanceId'] for i in result] == ['i-%s' % region for region in regions]
+    assert all(i['OwnerId'] == '123456789000' for i in result)
+    assert filters == [{'Name': 'instance-state-name', 'Values': ['running', 'pending', 'stopping', 'stopped']}]
+
+
+def test_get_instances_by_region_parallel_error(inventory):
+    inventory._options = {
+        'fetch_workers': 4,
+        'include_extra_api_calls': False,
+    }
+    connection = MagicMock()
+    connection.get_paginator.return_value.paginate.side_effect = botocore.exceptions.ClientError(
+        {'Error': {'Code': 'UnauthorizedOperation'}, 'ResponseMetadata': {'HTTPStatusCode': 403}}, 'DescribeInstances')
+    with patch.object(inventory, '_get_credentials', return_value={}), \
+            patch.object(inventory, '_get_region_connection', return_value=connection):
+        assert list(inventory._get_instances_by_region(['us-east-1', 'us-east-2'], [], False)) == []
+        with pytest.raises(AnsibleError) as error_message:
+            list(inventory._get_instances_by_region(['us-east-1', 'us-east-2'], [], True))
+        assert "Failed to describe instances" in str(error_message.value)
+
+
+def test_get_event_set_and_persistence_batches_calls(inventory):
+    inventory._options = {'strict_permissions': True}
+    batch = [{'InstanceId': 'i-%05d' % i} for i in range(250)]
+    batch[0]['SpotInstanceRequestId'] = 'sir-persistent'
+    batch[1]['SpotInstanceRequestId'] = 'sir-one-time'
+
+    def describe_instance_status(InstanceIds):
+        return {'InstanceStatuses': [{'InstanceId': i, 'Events': [{'Code': 'system-reboot'}]} for i in InstanceIds if i != 'i-00002']}
+
+    def describe_spot_instance_requests(SpotInstanceRequestIds):
+        return {'SpotInstanceRequests': [{'SpotInstanceRequestId': 'sir-persistent', 'Type': 'persistent'},
+                                         {'SpotInstanceRequestId': 'sir-one-time', 'Type': 'one-time'}]}
+
+    paginators = {
+        'describe_instance_status': MagicMock(),
+        'describe_spot_instance_requests': MagicMock(),
+    }
+    paginators['describe_instance_status'].paginate.side_effect = lambda **kwargs: MagicMock(
+        build_full_result=MagicMock(return_value=describe_instance_status(**kwargs)))
+    paginators['describe_spot_instance_requests'].paginate.side_effect = lambda **kwargs: MagicMock(
+        build_full_result=MagicMock(return_value=describe_spot_instance_requests(**kwargs)))
+    connection = MagicMock()
+    connection.get_paginator.side_effect = lambda name: paginators[name]
+
+    host_vars = inventory._get_event_set_and_persistence(connection, batch)
+
+    assert paginators['describe_instance_status'].paginate.call_count == 3
+    assert paginators['describe_spot_instance_requests'].paginate.call_count == 1
+    assert len(host_vars) == 250
+    assert host_vars['i-00000'] == {'Events': [{'Code': 'system-reboot'}], 'Persistent': True}
+    assert host_vars['i-00001'] == {'Events': [{'Code': 'system-reboot'}], 'Persistent': False}
+    assert host_vars['i-00002'] == {'Events': '', 'Persistent': False}
+
+
+def test_get_event_set_and_persistence_ignores_errors(inventory):
+    inventory._options = {'strict_permissions': False}
+    connection = MagicMock()
+    connection.get_paginator.return_value.paginate.return_value.build_full_result.side_effect = botocore.exceptions.ClientError(
+        {'Error': {'Code': 'UnauthorizedOperation'}, 'ResponseMetadata': {'HTTPStatusCode': 403}}, 'DescribeInstanceStatus')
+    host_vars = inventory._get_event_set_and_persistence(connection, [{'InstanceId': 'i-1', 'SpotInstanceRequestId': 'sir-1'}])
+    assert host_vars == {'i-1': {'Events': '', 'Persistent': False}}
+
+    inventory._options = {'strict_permissions': True}
+    with pytest.raises(AnsibleError) as error_message:
+        inventory._get_event_set_and_persistence(connection, [{'InstanceId': 'i-1'}])
+    assert "Failed to describe instance status" in str(error_message.value)
+
+
+def test_merge_filters(inventory):
+    assert inventory._merge_filters([{}]) == [[]]
+    assert inventory._merge_filters([{}, {}]) == [[]]
+    assert inventory._merge_filters([
+        {'tag:Name': 'first', 'instance-state-name': 'running'},
+        {'tag:Name': ['second', 'first'], 'instance-state-name': 'running'},
+        {'tag:Name': 'third', 'instance-state-name': 'stopped'},
+        {'tag:Env': 'dev'},
+    ]) == [
+        [{'Name': 'tag:Name', 'Values': ['first', 'second']}, {'Name': 'instance-state-name', 'Values': ['running']}],
+        [{'Name': 'tag:Name', 'Values': ['third']}, {'Name': 'instance-state-name', 'Values': ['stopped']}],
+        [{'Name': 'tag:Env', 'Values': ['dev']}],
+    ]
+
+
+def test_query_merges_filters_and_excludes(inventory):
+    inventory._options = {'fetch_workers': 1}
+    included = [{'InstanceId': 'i-2'}, {'InstanceId': 'i-1'}, {'InstanceId': 'i-3'}]
+    calls = []
+
+    def get_instances_by_region(regions, filters, strict_permissions, extra_api_calls=True):
+        calls.append((filters, extra_api_calls))
+        if extra_api_calls:
+            return iter(included + included)
+        return iter([{'InstanceId': 'i-3'}])
+
+    with patch.object(inventory, '_get_instances_by_region', side_effect=get_instances_by_region):
+        result = inventory._query(['us-east-1'],
+                                  [{'tag:Name': 'a'}, {'tag:Name': 'b'}],
+                                  [{'tag:Name': 'c'}, {'tag:Name': 'd'}],
+                                  True)
+
+    assert [i['InstanceId'] for i in result['aws_ec2']] == ['i-1', 'i-2']
+    assert calls == [
+        ([{'Name': 'tag:Name', 'Values': ['c', 'd']}], False),
+        ([{'Name': 'tag:Name', 'Values': ['a', 'b']}], True),
+    ]
+
+
+def test_get_instances_by_region_delta_cache(inventory):
+    inventory._options = {
+        'fetch_workers': 1,
+        'include_extra_api_calls': False,
+    }
+    regions = ['us-east-1', 'us-west-1']
+    filters = [{'Name': 'instance-state-name', 'Values': ['running']}]
+    cache = {}
+    inventory._delta_cache = DeltaCache(cache, 'aws_ec2_key', timeout=60)
+    try:
+        with patch.object(inventory, '_get_credentials', return_value={}), \
+                patch.object(inventory, '_get_region_connection', side_effect=lambda credentials, region: _region_connection(region)) as connect:
+            first = [i['InstanceId'] for i in inventory._get_instances_by_region(regions, filters, True)]
+            cache[inventory._delta_cache.entry_key(['us-west-1', filters, True])]['timestamp'] -= 120
+            second = [i['InstanceId'] for i in inventory._get_instances_by_region(regions, filters, True)]
+    finally:
+        inventory._delta_cache = None
+
+    assert first == second == ['i-us-east-1', 'i-us-west-1']
+    assert [c[0][1] for c in connect.call_args_list] == ['us-east-1', 'us-west-1', 'us-west-1']
+
+
+def test_get_host_vars_matches_camel_dict_to_snake_dict(inventory):
+    instance = copy.deepcopy(instances['Instances'][0])
+    instance['Placement'] = {'AvailabilityZone': 'us-east-1a', 'Tenancy': 'default'}
+
+    expected = camel_dict_to_snake_dict(copy.deepcopy(instance), ignore_list=['Tags'])
+    expected['tags'] = {'ansible': 'test', 'Name': 'aws_ec2'}
+    expected['placement']['region'] = 'us-east-1'
+
+    assert inventory._get_host_vars(instance) == expected
+
+
+def test_get_host_vars_allowlist(inventory):
+    instance = copy.deepcopy(instances['Instances'][0])
+    instance['Placement'] = {'AvailabilityZone': 'us-east-1a', 'Tenancy': 'default'}
+
+    assert inventory._get_host_vars(instance, set(['instance_id', 'placement'])) == {
+        'instance_id': 'i-00000000000000000',
+        'placement': {'availability_zone': 'us-east-1a', 'tenancy': 'default', 'region': 'us-east-1'},
+    }
+    assert inventory._get_host_vars(instance, set(['tags']), contrib_tag_keys=True) == {
+        'tags': {'ansible': 'test', 'Name': 'aws_ec2'},
+        'ec2_tag_ansible': 'test',
+        'ec2_tag_Name': 'aws_ec2',
+    }
+
+
+def test_get_host_vars_keeps_tag_keys(inventory):
+    instance = copy.deepcopy(instances['Instances'][0])
+    instance['Placement'] = {'AvailabilityZone': 'us-east-1a', 'Tenancy': 'default'}
+    instance['NetworkInterfaces'] = [{'NetworkInterfaceId': 'eni-1', 'Tags': {'CostCenter': 'IT', 'Name': 'eth0'}}]
+
+    assert inventory._get_host_vars(instance)['network_interfaces'] == [
+        {'network_interface_id': 'eni-1', 'tags': {'CostCenter': 'IT', 'Name': 'eth0'}},
+    ]
+
+
+def test_add_hosts(inventory):
+    fleet = []
+    for i in range(100):
+        instance = copy.deepcopy(instances['Instances'][0])
+        instance['InstanceId'] = 'i-%017d' % i
+        instance['PrivateDnsName'] = 'ip-10-0-0-%d.ec2.internal' % i
+        instance['Placement'] = {'AvailabilityZone': 'us-east-1%s' % 'abc'[i % 3], 'Tenancy': 'default'}
+        instance['Tags'] = [{'Key': 'Name', 'Value': 'host%d' % i}, {'Key': 'Shard', 'Value': str(i % 16)}]
+        fleet.append(instance)
+
+    inventory.inventory = InventoryData()
+    inventory._options = {
+        'hostvars_allowlist': [],
+        'use_contrib_script_compatible_ec2_tag_keys': False,
+        'strict': False,
+        'compose': {},
+        'groups': {},
+        'keyed_groups': [],
+    }
+    inventory.inventory.add_group('aws_ec2')
+    inventory._add_hosts(fleet, 'aws_ec2', ['private-dns-name'])
+
+    assert len(inventory.inventory.hosts) == 100
+    # the host variables match the camel_dict_to_snake_dict conversion they used to be built with
+    for i, instance in enumerate(fleet):
+        expected = camel_dict_to_snake_dict(copy.deepcopy(instance), ignore_list=['Tags'])
+        expected['tags'] = {'Name': 'host%d' % i, 'Shard': str(i % 16)}
+        expected['placement']['region'] = 'us-east-1'
+        host = inventory.inventory.get_host('ip-10-0-0-%d.ec2.internal' % i)
+        for key, value in expected.items():
+            assert host.vars[key] == value
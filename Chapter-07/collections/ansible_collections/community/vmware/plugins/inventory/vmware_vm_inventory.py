@@ -340,6 +340,8 @@ EXAMPLES = r'''
       - 'guest.ipStack'
 '''
 
+from multiprocessing.pool import ThreadPool
+
 from ansible.errors import AnsibleError, AnsibleParserError
 from ansible.module_utils._text import to_text, to_native
 from ansible.module_utils.common.dict_transformations import camel_dict_to_snake_dict
@@ -367,7 +369,6 @@ except ImportError:
     HAS_PYVMOMI = False
 
 try:
-    from com.vmware.vapi.std_client import DynamicID
     from vmware.vapi.vsphere.client import create_vsphere_client
     HAS_VSPHERE = True
 except ImportError:
@@ -376,7 +377,12 @@ except ImportError:
 
 from ansible.plugins.inventory import BaseInventoryPlugin, Constructable, Cacheable
 from ansible.parsing.yaml.objects import AnsibleVaultEncryptedUnicode
-from ansible_collections.community.vmware.plugins.module_utils.vmware import connect_to_api
+from ansible_collections.community.vmware.plugins.module_utils.vmware import connect_to_api, retrieve_properties
+
+# Number of concurrent requests to the vSphere Automation API when reading tags
+TAG_WORKERS = 8
+# Number of tags per TagAssociation.list_attached_objects_on_tags request
+TAG_CHUNK_SIZE = 100
 
 
 class BaseVMwareInventory:
@@ -476,6 +482,47 @@ class BaseVMwareInventory:
             raise AnsibleError("Missing one of the following : hostname, username, password. Please read "
                                "the documentation for more information.")
 
+    def get_tags_by_object(self, object_type='VirtualMachine'):
+        """
+        Read the tags attached to all the objects of a type with a number of REST calls bounded by the number of tags
+        Args:
+            object_type: type of the tagged objects, e.g. VirtualMachine
+        Returns: dict of object MoID to list of (tag name, category name) tuples,
+                 or None if no tag is defined
+        """
+        tagging = self.rest_content.tagging
+        tag_ids = tagging.Tag.list()
+        if not tag_ids:
+            return None
+
+        pool = ThreadPool(TAG_WORKERS)
+        try:
+            attached = dict()
+            if hasattr(tagging.TagAssociation, 'list_attached_objects_on_tags'):
+                chunks = [tag_ids[i:i + TAG_CHUNK_SIZE] for i in range(0, len(tag_ids), TAG_CHUNK_SIZE)]
+                for tag_objects_list in pool.map(tagging.TagAssociation.list_attached_objects_on_tags, chunks):
+                    for tag_objects in tag_objects_list:
+                        attached[tag_objects.tag_id] = tag_objects.object_ids
+            else:
+                attached = dict(zip(tag_ids, pool.map(tagging.TagAssociation.list_attached_objects, tag_ids)))
+
+            for tag_id, object_ids in list(attached.items()):
+                attached[tag_id] = [obj.id for obj in object_ids if obj.type == object_type]
+
+            # Only the tags attached to such an object and their categories are read, each category once
+            tags = pool.map(tagging.Tag.get, [tag_id for tag_id in tag_ids if attached.get(tag_id)])
+            category_ids = list(set(tag.category_id for tag in tags))
+            categories = dict(zip(category_ids, [category.name for category in pool.map(tagging.Category.get, category_ids)]))
+        finally:
+            pool.close()
+            pool.join()
+
+        tags_by_object = dict()
+        for tag in tags:
+            for object_id in attached[tag.id]:
+                tags_by_object.setdefault(object_id, []).append((tag.name, categories[tag.category_id]))
+        return tags_by_object
+
     def get_managed_objects_properties(self, vim_type, properties=None, resources=None, strict=False):  # noqa  # pylint: disable=too-complex
         """
         Look up a Managed Object Reference in vCenter / ESXi Environment
@@ -683,13 +730,22 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         if len(vm_properties) == 0:
             vm_properties = ['name']
 
+        with_path = self.get_option('with_path')
+
+        # Properties only requested to build the host variables, not reported as such
+        internal_props = []
         if 'all' in vm_properties:
             query_props = None
             vm_properties.remove('all')
         else:
             if 'runtime.connectionState' not in vm_properties:
                 vm_properties.append('runtime.connectionState')
-            query_props = [x for x in vm_properties if x != "customValue"]
+            query_props = list(vm_properties)
+            if with_path and 'parent' not in query_props:
+                query_props.append('parent')
+                internal_props.append('parent')
+            if 'customValue' in query_props:
+                internal_props.append('customValue')
 
         objects = self.pyv.get_managed_objects_properties(
             vim_type=vim.VirtualMachine,
@@ -698,15 +754,18 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             strict=strict,
         )
 
-        tags_info = dict()
+        tags_by_vm = None
         if self.pyv.with_tags:
-            tag_svc = self.pyv.rest_content.tagging.Tag
-            cat_svc = self.pyv.rest_content.tagging.Category
+            tags_by_vm = self.pyv.get_tags_by_object('VirtualMachine')
 
-            tags = tag_svc.list()
-            for tag in tags:
-                tag_obj = tag_svc.get(tag)
-                tags_info[tag_obj.id] = (tag_obj.name, cat_svc.get(tag_obj.category_id).name)
+        custom_field_names = {}
+        if 'customValue' in vm_properties and self.pyv.content.customFieldsManager:  # not an ESXi
+            custom_field_names = dict((field.key, field.name) for field in self.pyv.content.customFieldsManager.field)
+
+        folders = {}
+        folder_paths = {}
+        if with_path:
+            folders = dict(retrieve_properties(self.pyv.content, [vim.Folder, vim.Datacenter], ['name', 'parent']))
 
         hostnames = self.get_option('hostnames')
 
@@ -720,44 +779,34 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
             # Custom values
             if 'customValue' in vm_properties:
-                field_mgr = []
-                if self.pyv.content.customFieldsManager:  # not an ESXi
-                    field_mgr = self.pyv.content.customFieldsManager.field
-                for cust_value in vm_obj.obj.customValue:
-                    properties[[y.name for y in field_mgr if y.key == cust_value.key][0]] = cust_value.value
+                for cust_value in properties.get('customValue', []):
+                    if cust_value.key in custom_field_names:
+                        properties[custom_field_names[cust_value.key]] = cust_value.value
 
             # Tags
-            if tags_info:
+            if tags_by_vm is not None:
                 # Add virtual machine to appropriate tag group
                 vm_mo_id = vm_obj.obj._GetMoId()  # pylint: disable=protected-access
-                vm_dynamic_id = DynamicID(type='VirtualMachine', id=vm_mo_id)
-                tag_association = self.pyv.rest_content.tagging.TagAssociation
                 properties['tags'] = []
                 properties['categories'] = []
                 properties['tag_category'] = {}
-                for tag_id in tag_association.list_attached_tags(vm_dynamic_id):
-                    if tag_id not in tags_info:
-                        # Ghost Tags - community.vmware#681
-                        continue
+                # Associations of deleted tags (Ghost Tags - community.vmware#681) are not listed
+                for tag_name, category_name in tags_by_vm.get(vm_mo_id, []):
                     # Add tags related to VM
-                    properties['tags'].append(tags_info[tag_id][0])
+                    properties['tags'].append(tag_name)
                     # Add categories related to VM
-                    properties['categories'].append(tags_info[tag_id][1])
+                    properties['categories'].append(category_name)
                     # Add tag and categories related to VM
-                    if tags_info[tag_id][1] not in properties['tag_category']:
-                        properties['tag_category'][tags_info[tag_id][1]] = []
-                    properties['tag_category'][tags_info[tag_id][1]].append(tags_info[tag_id][0])
+                    if category_name not in properties['tag_category']:
+                        properties['tag_category'][category_name] = []
+                    properties['tag_category'][category_name].append(tag_name)
 
             # Path
-            with_path = self.get_option('with_path')
             if with_path:
-                path = []
-                parent = vm_obj.obj.parent
-                while parent:
-                    path.append(parent.name)
-                    parent = parent.parent
-                path.reverse()
-                properties['path'] = "/".join(path)
+                properties['path'] = self._get_folder_path(properties.get('parent'), folders, folder_paths)
+
+            for internal_prop in internal_props:
+                properties.pop(internal_prop, None)
 
             host_properties = to_nested_dict(properties)
 
@@ -774,6 +823,26 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
         return hostvars
 
+    def _get_folder_path(self, folder, folders, folder_paths):
+        """
+        Get the path of a folder from the names and parents of the folders, every path is built once
+        Args:
+            folder: folder or datacenter, None for the parent of the root folder
+            folders: dict of folder to the dict of its name and parent
+            folder_paths: dict of the folder paths already built
+        Returns: path of the folder as the slash separated names from the root folder
+        """
+        if folder is None:
+            return ''
+        if folder not in folder_paths:
+            props = folders.get(folder)
+            if props is None:
+                # The root folder is not part of the container view
+                props = {'name': folder.name, 'parent': folder.parent}
+            parent_path = self._get_folder_path(props.get('parent'), folders, folder_paths)
+            folder_paths[folder] = '/'.join(path for path in (parent_path, props['name']) if path)
+        return folder_paths[folder]
+
     def _get_hostname(self, properties, hostnames, strict=False):
         hostname = None
         errors = []
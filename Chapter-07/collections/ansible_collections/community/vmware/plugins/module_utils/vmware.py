@@ -16,9 +16,9 @@ import ssl
 import time
 import traceback
 import datetime
+import weakref
 from collections import OrderedDict
 from distutils.version import StrictVersion
-from random import randint
 
 REQUESTS_IMP_ERR = None
 try:
@@ -116,45 +116,103 @@ def answer_question(vm, responses):
 
 
 def wait_for_task(task, max_backoff=64, timeout=3600, vm=None, answers=None):
-    """Wait for given task using exponential back-off algorithm.
+    """Wait for given task using PropertyCollector updates.
 
     Args:
         task: VMware task object
-        max_backoff: Maximum amount of sleep time in seconds
+        max_backoff: Maximum amount of time in seconds to block waiting for updates
         timeout: Timeout for the given task in seconds
 
     Returns: Tuple with True and result for successful task
     Raises: TaskError on failure
     """
-    failure_counter = 0
+    return True, wait_for_tasks([task], max_backoff=max_backoff, timeout=timeout, vm=vm, answers=answers)[0]
+
+
+def _raise_task_error(error):
+    error_msg = error
+    host_thumbprint = None
+    try:
+        error_msg = error_msg.msg
+        if hasattr(error, 'thumbprint'):
+            host_thumbprint = error.thumbprint
+    except AttributeError:
+        pass
+    finally:
+        raise_from(TaskError(error_msg, host_thumbprint), error)
+
+
+def wait_for_tasks(tasks, max_backoff=64, timeout=3600, vm=None, answers=None):
+    """Wait for all the given tasks concurrently using PropertyCollector updates.
+
+    The state of the tasks is watched through a dedicated PropertyCollector with WaitForUpdatesEx,
+    so the wait returns as soon as the last task finishes instead of polling every task.
+
+    Args:
+        tasks: list of VMware task objects of the same connection
+        max_backoff: Maximum amount of time in seconds to block waiting for updates
+        timeout: Timeout for all the given tasks in seconds
+        vm: Virtual machine management object whose questions are answered while waiting
+        answers: Answer contents to the questions of the virtual machine
+
+    Returns: List of the task results, in the order of the given tasks
+    Raises: TaskError on the first failure
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return []
     start_time = time.time()
 
-    while True:
-        if check_answer_question_status(vm):
-            if answers:
-                responses = make_answer_response(vm, answers)
-                answer_question(vm, responses)
-            else:
-                raise TaskError("%s" % to_text(vm.runtime.question.text))
-        if time.time() - start_time >= timeout:
-            raise TaskError("Timeout")
-        if task.info.state == vim.TaskInfo.State.success:
-            return True, task.info.result
-        if task.info.state == vim.TaskInfo.State.error:
-            error_msg = task.info.error
-            host_thumbprint = None
-            try:
-                error_msg = error_msg.msg
-                if hasattr(task.info.error, 'thumbprint'):
-                    host_thumbprint = task.info.error.thumbprint
-            except AttributeError:
-                pass
-            finally:
-                raise_from(TaskError(error_msg, host_thumbprint), task.info.error)
-        if task.info.state in [vim.TaskInfo.State.running, vim.TaskInfo.State.queued]:
-            sleep_time = min(2 ** failure_counter + randint(1, 1000) / 1000, max_backoff)
-            time.sleep(sleep_time)
-            failure_counter += 1
+    content = vim.ServiceInstance('ServiceInstance', tasks[0]._stub).RetrieveContent()
+    collector = content.propertyCollector.CreatePropertyCollector()
+    try:
+        object_specs = [vmodl.query.PropertyCollector.ObjectSpec(obj=task, skip=False) for task in tasks]
+        property_specs = [
+            vmodl.query.PropertyCollector.PropertySpec(type=vim.Task, all=False, pathSet=['info.state', 'info.result', 'info.error'])
+        ]
+        if vm is not None:
+            object_specs.append(vmodl.query.PropertyCollector.ObjectSpec(obj=vm, skip=False))
+            property_specs.append(
+                vmodl.query.PropertyCollector.PropertySpec(type=vim.VirtualMachine, all=False, pathSet=['runtime.question'])
+            )
+        collector.CreateFilter(
+            vmodl.query.PropertyCollector.FilterSpec(objectSet=object_specs, propSet=property_specs),
+            partialUpdates=True
+        )
+
+        task_infos = dict((task, {}) for task in tasks)
+        results = {}
+        version = ''
+        while len(results) < len(task_infos):
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                raise TaskError("Timeout")
+            options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=max(1, int(min(remaining, max_backoff))))
+            update_set = collector.WaitForUpdatesEx(version, options)
+            if update_set is None:
+                # Nothing changed within maxWaitSeconds
+                continue
+            version = update_set.version
+            for filter_update in update_set.filterSet:
+                for object_update in filter_update.objectSet:
+                    changes = dict((change.name, change.val) for change in object_update.changeSet or [])
+                    if object_update.obj not in task_infos:
+                        if changes.get('runtime.question'):
+                            if not answers:
+                                raise TaskError("%s" % to_text(changes['runtime.question'].text))
+                            answer_question(vm, make_answer_response(vm, answers))
+                        continue
+
+                    task_info = task_infos[object_update.obj]
+                    task_info.update(changes)
+                    if task_info.get('info.state') == vim.TaskInfo.State.success:
+                        results[object_update.obj] = task_info.get('info.result')
+                    elif task_info.get('info.state') == vim.TaskInfo.State.error:
+                        _raise_task_error(task_info.get('info.error'))
+    finally:
+        collector.DestroyPropertyCollector()
+
+    return [results[task] for task in tasks]
 
 
 def wait_for_vm_ip(content, vm, timeout=300):
@@ -171,11 +229,134 @@ def wait_for_vm_ip(content, vm, timeout=300):
     return facts
 
 
+# Maximum number of objects returned by one RetrievePropertiesEx / ContinueRetrievePropertiesEx call
+PROPERTY_COLLECTOR_PAGE_SIZE = 1000
+
+# Name to managed object indexes built by the object lookups, per connection (SOAP stub)
+_OBJECT_NAME_INDEXES = weakref.WeakKeyDictionary()
+
+
+def retrieve_properties(content, vimtype, properties, folder=None, recurse=True, page_size=PROPERTY_COLLECTOR_PAGE_SIZE):
+    """
+    Retrieve properties of all the managed objects of the given types below a folder with the PropertyCollector
+    Args:
+        content: ServiceContent of the connection
+        vimtype: list of managed object types, e.g. [vim.VirtualMachine]
+        properties: list of property paths to retrieve for every object, e.g. ['name', 'runtime.host'],
+            or dict of managed object type to the list of property paths to retrieve for it
+        folder: folder to search in, defaults to the root folder
+        recurse: search in the subfolders as well
+        page_size: maximum number of objects returned per round-trip
+
+    Returns: generator of (managed object, dict of property path to value) tuples, objects deleted
+    in the meantime are skipped and properties which are not set are missing from the dict
+    """
+    container = content.viewManager.CreateContainerView(folder or content.rootFolder, vimtype, recurse)
+    traversal_spec = vmodl.query.PropertyCollector.TraversalSpec(
+        name='traverseView',
+        path='view',
+        skip=False,
+        type=vim.view.ContainerView
+    )
+    object_spec = vmodl.query.PropertyCollector.ObjectSpec(
+        obj=container,
+        skip=True,
+        selectSet=[traversal_spec]
+    )
+    if not isinstance(properties, dict):
+        properties = dict((obj_type, properties) for obj_type in vimtype)
+    property_specs = [
+        vmodl.query.PropertyCollector.PropertySpec(type=obj_type, all=False, pathSet=list(properties[obj_type]))
+        for obj_type in vimtype
+    ]
+    filter_spec = vmodl.query.PropertyCollector.FilterSpec(
+        objectSet=[object_spec],
+        propSet=property_specs,
+        reportMissingObjectsInResults=False
+    )
+    options = vmodl.query.PropertyCollector.RetrieveOptions(maxObjects=page_size)
+
+    collector = content.propertyCollector
+    result = None
+    try:
+        result = collector.RetrievePropertiesEx(specSet=[filter_spec], options=options)
+        while result:
+            for object_content in result.objects:
+                yield object_content.obj, dict((prop.name, prop.val) for prop in object_content.propSet or [])
+            if not result.token:
+                break
+            result = collector.ContinueRetrievePropertiesEx(token=result.token)
+    finally:
+        if result and result.token:
+            # The caller stopped before the last page
+            collector.CancelRetrievePropertiesEx(token=result.token)
+        container.Destroy()
+
+
+def _object_name_index_key(vimtype, folder, recurse):
+    return (
+        tuple(sorted(obj_type.__name__ for obj_type in vimtype)),
+        getattr(folder, '_moId', None),
+        bool(recurse),
+    )
+
+
+def _build_object_name_index(content, vimtype, folder=None, recurse=True):
+    """
+    Retrieve the names of all the objects of the given types and store them in the name index of the connection
+    Returns: OrderedDict of managed object to name, in the order of the container view
+    """
+    folder = folder or content.rootFolder
+    objects = OrderedDict()
+    index = OrderedDict()
+    for obj, props in retrieve_properties(content, vimtype, ['name'], folder=folder, recurse=recurse):
+        if 'name' not in props:
+            continue
+        objects[obj] = props['name']
+        index.setdefault(to_text(unquote(props['name'])), []).append(obj)
+
+    stub = getattr(content.propertyCollector, '_stub', None)
+    if stub is not None:
+        _OBJECT_NAME_INDEXES.setdefault(stub, {})[_object_name_index_key(vimtype, folder, recurse)] = index
+    return objects
+
+
+def _lookup_object_name_index(content, vimtype, name, folder=None, recurse=True):
+    """
+    Find the objects called name (compared unquoted) through the name index of the connection. An indexed match is
+    verified with one read of its name, and the index is rebuilt when it is missing, outdated or has no match,
+    so a lookup costs one round-trip when the index is current and one paged retrieval otherwise.
+    """
+    name = to_text(name)
+    folder = folder or content.rootFolder
+    stub = getattr(content.propertyCollector, '_stub', None)
+    index = None
+    if stub is not None:
+        index = _OBJECT_NAME_INDEXES.get(stub, {}).get(_object_name_index_key(vimtype, folder, recurse))
+
+    if index is not None:
+        matches = index.get(name)
+        if matches:
+            try:
+                if to_text(unquote(matches[0].name)) == name:
+                    return matches
+            except vmodl.fault.ManagedObjectNotFound:
+                pass
+
+    objects = _build_object_name_index(content, vimtype, folder=folder, recurse=recurse)
+    return [obj for obj, obj_name in iteritems(objects) if to_text(unquote(obj_name)) == name]
+
+
 def find_obj(content, vimtype, name, first=True, folder=None):
-    container = content.viewManager.CreateContainerView(folder or content.rootFolder, recursive=True, type=vimtype)
-    # Get all objects matching type (and name if given)
-    obj_list = [obj for obj in container.view if not name or to_text(unquote(obj.name)) == to_text(unquote(name))]
-    container.Destroy()
+    if not name:
+        # Get all objects matching type
+        obj_list = list(_build_object_name_index(content, vimtype, folder=folder))
+    elif first:
+        obj_list = _lookup_object_name_index(content, vimtype, unquote(name), folder=folder)
+    else:
+        # Get all objects matching type and name, without trusting the index for the complete list
+        objects = _build_object_name_index(content, vimtype, folder=folder)
+        obj_list = [obj for obj, obj_name in iteritems(objects) if to_text(unquote(obj_name)) == to_text(unquote(name))]
 
     # Return first match or None
     if first:
@@ -204,13 +385,9 @@ def find_object_by_name(content, name, obj_type, folder=None, recurse=True):
 
     name = name.strip()
 
-    objects = get_all_objs(content, obj_type, folder=folder, recurse=recurse)
-    for obj in objects:
-        try:
-            if unquote(obj.name) == name:
-                return obj
-        except vmodl.fault.ManagedObjectNotFound:
-            pass
+    objects = _lookup_object_name_index(content, obj_type, name, folder=folder, recurse=recurse)
+    if objects:
+        return objects[0]
 
     return None
 
@@ -790,14 +967,7 @@ def get_all_objs(content, vimtype, folder=None, recurse=True):
     if not folder:
         folder = content.rootFolder
 
-    obj = {}
-    container = content.viewManager.CreateContainerView(folder, vimtype, recurse)
-    for managed_object_ref in container.view:
-        try:
-            obj.update({managed_object_ref: managed_object_ref.name})
-        except vmodl.fault.ManagedObjectNotFound:
-            pass
-    return obj
+    return dict(_build_object_name_index(content, vimtype, folder=folder, recurse=recurse))
 
 
 def run_command_in_guest(content, vm, username, password, program_path, program_args, program_cwd, program_env):
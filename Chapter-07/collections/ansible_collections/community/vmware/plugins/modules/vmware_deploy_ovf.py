@@ -123,6 +123,18 @@ options:
         description:
         - Resource Pool to deploy to.
         type: str
+    upload_buffer_size:
+        default: 1048576
+        description:
+        - Size in bytes of the buffer used to read and send every disk file.
+        type: int
+        version_added: '2.2.0'
+    upload_workers:
+        default: 4
+        description:
+        - Number of disk files uploaded at the same time.
+        type: int
+        version_added: '2.2.0'
     wait:
         default: true
         description:
@@ -215,6 +227,12 @@ except ImportError:
     pass
 
 
+# Size of the buffer used to read and send a disk file
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+# Minimum number of seconds between two lease progress updates with the same percentage
+LEASE_PROGRESS_INTERVAL = 10
+
+
 def path_exists(value):
     if not isinstance(value, string_types):
         value = str(value)
@@ -224,21 +242,45 @@ def path_exists(value):
     return value
 
 
-class ProgressReader(io.FileIO):
-    def __init__(self, name, mode='r', closefd=True):
+class FileRangeReader(object):
+    '''
+    Read a range of a file, e.g. a disk stored in an OVA, into a buffer reused for every block.
+    http.client sends the returned views of the buffer without copying them. It asks for 8 KiB
+    blocks, the blocks returned have the size of the buffer instead.
+    '''
+    def __init__(self, name, offset, size, buffer_size=UPLOAD_BUFFER_SIZE):
         self.bytes_read = 0
-        io.FileIO.__init__(self, name, mode=mode, closefd=closefd)
+        self._remaining = size
+        self._buffer = memoryview(bytearray(buffer_size))
+        self._f = io.open(name, 'rb', buffering=0)
+        self._f.seek(offset)
 
-    def read(self, size=10240):
-        chunk = io.FileIO.read(self, size)
-        self.bytes_read += len(chunk)
-        return chunk
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._f.close()
+
+    def read(self, size=-1):
+        length = min(self._remaining, len(self._buffer))
+        if length <= 0:
+            return b''
+        count = self._f.readinto(self._buffer[:length])
+        if not count:
+            raise IOError('Unexpected end of file %s' % self._f.name)
+        self._remaining -= count
+        self.bytes_read += count
+        return self._buffer[:count]
 
 
 class TarFileProgressReader(tarfile.ExFileObject):
-    def __init__(self, *args):
+    def __init__(self, *args, **kwargs):
         self.bytes_read = 0
-        tarfile.ExFileObject.__init__(self, *args)
+        self.buffer_size = kwargs.pop('buffer_size', UPLOAD_BUFFER_SIZE)
+        tarfile.ExFileObject.__init__(self, *args, **kwargs)
 
     def __enter__(self):
         return self
@@ -249,15 +291,17 @@ class TarFileProgressReader(tarfile.ExFileObject):
         except Exception:
             pass
 
-    def read(self, size=10240):
-        chunk = tarfile.ExFileObject.read(self, size)
+    def read(self, size=-1):
+        chunk = tarfile.ExFileObject.read(self, self.buffer_size)
         self.bytes_read += len(chunk)
         return chunk
 
 
 class VMDKUploader(Thread):
-    def __init__(self, vmdk, url, validate_certs=True, tarinfo=None, create=False):
+    def __init__(self, vmdk, url, validate_certs=True, tarinfo=None, create=False, buffer_size=UPLOAD_BUFFER_SIZE, compressed=False):
         Thread.__init__(self)
+        # Do not keep the module running once it failed because of another file
+        self.daemon = True
 
         self.vmdk = vmdk
 
@@ -269,6 +313,8 @@ class VMDKUploader(Thread):
         self.url = url
         self.validate_certs = validate_certs
         self.tarinfo = tarinfo
+        self.buffer_size = buffer_size
+        self.compressed = compressed
 
         self.f = None
         self.e = None
@@ -309,18 +355,21 @@ class VMDKUploader(Thread):
         open_url(self.url, data=self.f, validate_certs=self.validate_certs, **self._request_opts())
 
     def run(self):
-        if self.tarinfo:
-            try:
-                with TarFileProgressReader(self.vmdk, self.tarinfo) as self.f:
+        try:
+            if not self.tarinfo:
+                with FileRangeReader(self.vmdk, 0, self.size, self.buffer_size) as self.f:
                     self._open_url()
-            except Exception:
-                self.e = sys.exc_info()
-        else:
-            try:
-                with ProgressReader(self.vmdk, 'rb') as self.f:
+            elif not self.compressed and not self.tarinfo.issparse():
+                # The file is stored as is in the OVA, read it directly from the archive
+                with FileRangeReader(self.vmdk.name, self.tarinfo.offset_data, self.size, self.buffer_size) as self.f:
                     self._open_url()
-            except Exception:
-                self.e = sys.exc_info()
+            else:
+                # The archive object is not shared with the other uploaders
+                with tarfile.open(self.vmdk.name) as tar:
+                    with TarFileProgressReader(tar, self.tarinfo, buffer_size=self.buffer_size) as self.f:
+                        self._open_url()
+        except Exception:
+            self.e = sys.exc_info()
 
 
 class VMwareDeployOvf(PyVmomi):
@@ -336,6 +385,7 @@ class VMwareDeployOvf(PyVmomi):
 
         self.ovf_descriptor = None
         self.tar = None
+        self.tar_compressed = False
 
         self.lease = None
         self.import_spec = None
@@ -406,7 +456,11 @@ class VMwareDeployOvf(PyVmomi):
             self.module.fail_json(msg="%s" % e)
 
         if tarfile.is_tarfile(self.params['ovf']):
-            self.tar = tarfile.open(self.params['ovf'])
+            try:
+                self.tar = tarfile.open(self.params['ovf'], mode='r:')
+            except tarfile.ReadError:
+                self.tar = tarfile.open(self.params['ovf'])
+                self.tar_compressed = True
             ovf = None
             for candidate in self.tar.getmembers():
                 dummy, ext = os.path.splitext(candidate.name)
@@ -524,6 +578,8 @@ class VMwareDeployOvf(PyVmomi):
     def upload(self):
         if self.params['ovf'] is None:
             self.module.fail_json(msg="OVF path is required for upload operation.")
+        if self.params['upload_workers'] < 1 or self.params['upload_buffer_size'] < 1:
+            self.module.fail_json(msg="upload_workers and upload_buffer_size must be greater than 0.")
 
         ovf_dir = os.path.dirname(self.params['ovf'])
 
@@ -576,27 +632,49 @@ class VMwareDeployOvf(PyVmomi):
                     device_upload_url,
                     self.params['validate_certs'],
                     tarinfo=vmdk_tarinfo,
-                    create=file_item.create
+                    create=file_item.create,
+                    buffer_size=self.params['upload_buffer_size'],
+                    compressed=self.tar_compressed
                 )
             )
 
+        self.run_uploaders(lease, uploaders)
+
+    def run_uploaders(self, lease, uploaders):
+        '''
+        Upload up to upload_workers files at the same time and report the overall progress to the lease
+        '''
         total_size = sum(u.size for u in uploaders)
-        total_bytes_read = [0] * len(uploaders)
-        for i, uploader in enumerate(uploaders):
-            uploader.start()
-            while uploader.is_alive():
-                time.sleep(0.1)
-                total_bytes_read[i] = uploader.bytes_read
-                lease.HttpNfcLeaseProgress(int(100.0 * sum(total_bytes_read) / total_size))
-
-            if uploader.e:
-                lease.HttpNfcLeaseAbort(
-                    vmodl.fault.SystemError(reason='%s' % to_native(uploader.e[1]))
-                )
-                self.module.fail_json(
-                    msg='%s' % to_native(uploader.e[1]),
-                    exception=''.join(traceback.format_tb(uploader.e[2]))
-                )
+        pending = list(uploaders)
+        running = []
+        progress = None
+        progress_time = 0
+        while pending or running:
+            while pending and len(running) < self.params['upload_workers']:
+                uploader = pending.pop(0)
+                uploader.start()
+                running.append(uploader)
+
+            time.sleep(0.1)
+            for uploader in list(running):
+                if uploader.is_alive():
+                    continue
+                running.remove(uploader)
+                if uploader.e:
+                    lease.HttpNfcLeaseAbort(
+                        vmodl.fault.SystemError(reason='%s' % to_native(uploader.e[1]))
+                    )
+                    self.module.fail_json(
+                        msg='%s' % to_native(uploader.e[1]),
+                        exception=''.join(traceback.format_tb(uploader.e[2]))
+                    )
+
+            # The progress also keeps the lease alive
+            percent = int(100.0 * sum(u.bytes_read for u in uploaders) / total_size)
+            if percent != progress or time.time() - progress_time >= LEASE_PROGRESS_INTERVAL:
+                lease.HttpNfcLeaseProgress(percent)
+                progress = percent
+                progress_time = time.time()
 
     def complete(self):
         self.lease.HttpNfcLeaseComplete()
@@ -713,6 +791,14 @@ def main():
         'properties': {
             'type': 'dict',
         },
+        'upload_buffer_size': {
+            'type': 'int',
+            'default': 1024 * 1024,
+        },
+        'upload_workers': {
+            'type': 'int',
+            'default': 4,
+        },
         'wait': {
             'type': 'bool',
             'default': True,
@@ -82,6 +82,18 @@ options:
     - If the vmdk file is too large, you can increase the value.
     default: 30
     type: int
+  download_buffer_size:
+    description:
+    - Size in bytes of the buffer used to receive and write every device file.
+    default: 2097152
+    type: int
+    version_added: '2.2.0'
+  download_workers:
+    description:
+    - Number of device files downloaded at the same time.
+    default: 4
+    type: int
+    version_added: '2.2.0'
 extends_documentation_fragment:
 - community.vmware.vmware.documentation
 
@@ -108,8 +120,9 @@ instance:
 
 import os
 import hashlib
+from multiprocessing.pool import ThreadPool
 from time import sleep
-from threading import Thread
+from threading import Event, Thread
 from ansible.module_utils.urls import open_url
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_text, to_bytes
@@ -124,7 +137,8 @@ except ImportError:
 class LeaseProgressUpdater(Thread):
     def __init__(self, http_nfc_lease, update_interval):
         Thread.__init__(self)
-        self._running = True
+        self.daemon = True
+        self._stopped = Event()
         self.httpNfcLease = http_nfc_lease
         self.updateInterval = update_interval
         self.progressPercent = 0
@@ -133,24 +147,21 @@ class LeaseProgressUpdater(Thread):
         self.progressPercent = progress_percent
 
     def stop(self):
-        self._running = False
+        self._stopped.set()
 
     def run(self):
-        while self._running:
+        while not self._stopped.is_set():
             try:
-                if self.httpNfcLease.state == vim.HttpNfcLease.State.done:
+                if self.httpNfcLease.state in (vim.HttpNfcLease.State.done, vim.HttpNfcLease.State.error):
                     return
                 self.httpNfcLease.HttpNfcLeaseProgress(self.progressPercent)
-                sleep_sec = 0
-                while True:
-                    if self.httpNfcLease.state == vim.HttpNfcLease.State.done or self.httpNfcLease.state == vim.HttpNfcLease.State.error:
-                        return
-                    sleep_sec += 1
-                    sleep(1)
-                    if sleep_sec == self.updateInterval:
-                        break
             except Exception:
                 return
+            self._stopped.wait(self.updateInterval)
+
+
+class DeviceDownloadError(Exception):
+    pass
 
 
 class VMwareExportVmOvf(PyVmomi):
@@ -158,8 +169,8 @@ class VMwareExportVmOvf(PyVmomi):
         super(VMwareExportVmOvf, self).__init__(module)
         self.mf_file = ''
         self.ovf_dir = ''
-        # set read device content chunk size to 2 MB
-        self.chunk_size = 2 * 2 ** 20
+        # set read device content chunk size, 2 MB by default
+        self.chunk_size = self.params['download_buffer_size']
         # set lease progress update interval to 15 seconds
         self.lease_interval = 15
         self.facts = {'device_files': []}
@@ -175,42 +186,75 @@ class VMwareExportVmOvf(PyVmomi):
                                           % (self.ovf_dir, to_text(err)))
         self.mf_file = os.path.join(self.ovf_dir, vm_obj.name + '.mf')
 
-    def download_device_files(self, headers, temp_target_disk, device_url, lease_updater, total_bytes_written,
-                              total_bytes_to_write):
-        mf_content = 'SHA256(' + os.path.basename(temp_target_disk) + ')= '
+    def download_device_files(self, headers, temp_target_disk, device_url, bytes_written, index):
+        """
+        Download a device file, called from the download workers
+        Returns: tuple of the number of bytes written and the SHA256 digest of the file
+        Raises: DeviceDownloadError
+        """
         sha256_hash = hashlib.sha256()
         response = None
 
-        with open(self.mf_file, 'a') as mf_handle:
-            with open(temp_target_disk, 'wb') as handle:
+        with open(temp_target_disk, 'wb') as handle:
+            try:
+                response = open_url(device_url, headers=headers, validate_certs=False, timeout=self.download_timeout)
+            except Exception as err:
+                raise DeviceDownloadError('Exception caught when getting %s, %s' % (device_url, to_text(err)))
+            if not response:
+                raise DeviceDownloadError('Getting %s failed' % device_url)
+            if response.getcode() >= 400:
+                raise DeviceDownloadError('Getting %s return code %d' % (device_url, response.getcode()))
+            current_bytes_written = 0
+            # Receive every block in the same buffer
+            buf = memoryview(bytearray(self.chunk_size))
+            while True:
+                if hasattr(response, 'readinto'):
+                    count = response.readinto(buf)
+                else:
+                    block = response.read(len(buf))
+                    count = len(block)
+                    buf[:count] = block
+                if not count:
+                    break
+                block = buf[:count]
+                handle.write(block)
+                sha256_hash.update(block)
+                current_bytes_written += count
+                bytes_written[index] = current_bytes_written
+            handle.flush()
+            os.fsync(handle.fileno())
+        return current_bytes_written, sha256_hash.hexdigest()
+
+    def download_device_files_concurrently(self, headers, downloads, lease_updater, total_bytes_to_write):
+        """
+        Download the device files with up to download_workers at the same time
+        Returns: list of the number of bytes written for every device file
+        """
+        bytes_written = [0] * len(downloads)
+        pool = ThreadPool(max(1, min(self.params['download_workers'], len(downloads))))
+        try:
+            results = [
+                pool.apply_async(self.download_device_files, (headers, temp_target_disk, device_url, bytes_written, index))
+                for index, (temp_target_disk, device_url) in enumerate(downloads)
+            ]
+            sizes = []
+            for (temp_target_disk, device_url), result in zip(downloads, results):
+                while not result.ready():
+                    result.wait(1)
+                    lease_updater.progressPercent = min(100, int((sum(bytes_written) * 100) / total_bytes_to_write))
                 try:
-                    response = open_url(device_url, headers=headers, validate_certs=False, timeout=self.download_timeout)
-                except Exception as err:
-                    lease_updater.httpNfcLease.HttpNfcLeaseAbort()
-                    lease_updater.stop()
-                    self.module.fail_json(msg='Exception caught when getting %s, %s' % (device_url, to_text(err)))
-                if not response:
-                    lease_updater.httpNfcLease.HttpNfcLeaseAbort()
-                    lease_updater.stop()
-                    self.module.fail_json(msg='Getting %s failed' % device_url)
-                if response.getcode() >= 400:
+                    current_bytes_written, digest = result.get()
+                except DeviceDownloadError as err:
                     lease_updater.httpNfcLease.HttpNfcLeaseAbort()
                     lease_updater.stop()
-                    self.module.fail_json(msg='Getting %s return code %d' % (device_url, response.getcode()))
-                current_bytes_written = 0
-                block = response.read(self.chunk_size)
-                while block:
-                    handle.write(block)
-                    sha256_hash.update(block)
-                    handle.flush()
-                    os.fsync(handle.fileno())
-                    current_bytes_written += len(block)
-                    block = response.read(self.chunk_size)
-                written_percent = ((current_bytes_written + total_bytes_written) * 100) / total_bytes_to_write
-                lease_updater.progressPercent = int(written_percent)
-            mf_handle.write(mf_content + sha256_hash.hexdigest() + '\n')
-        self.facts['device_files'].append(temp_target_disk)
-        return current_bytes_written
+                    self.module.fail_json(msg=to_text(err))
+                sizes.append(current_bytes_written)
+                with open(self.mf_file, 'a') as mf_handle:
+                    mf_handle.write('SHA256(' + os.path.basename(temp_target_disk) + ')= ' + digest + '\n')
+                self.facts['device_files'].append(temp_target_disk)
+        finally:
+            pool.terminate()
+        return sizes
 
     def export_to_ovf_files(self, vm_obj):
         self.create_export_dir(vm_obj=vm_obj)
@@ -220,11 +264,11 @@ class VMwareExportVmOvf(PyVmomi):
         self.download_timeout = self.params['download_timeout']
 
         ovf_files = []
+        downloads = []
         # get http nfc lease firstly
         http_nfc_lease = vm_obj.ExportVm()
         # create a thread to track file download progress
         lease_updater = LeaseProgressUpdater(http_nfc_lease, self.lease_interval)
-        total_bytes_written = 0
         # total storage space occupied by the virtual machine across all datastores
         total_bytes_to_write = vm_obj.summary.storage.unshared
         # new deployed VM with no OS installed
@@ -264,18 +308,14 @@ class VMwareExportVmOvf(PyVmomi):
                         if '*' in device_url:
                             device_url = device_url.replace('*', self.params['hostname'])
                         if file_download:
-                            current_bytes_written = self.download_device_files(headers=headers,
-                                                                               temp_target_disk=temp_target_disk,
-                                                                               device_url=device_url,
-                                                                               lease_updater=lease_updater,
-                                                                               total_bytes_written=total_bytes_written,
-                                                                               total_bytes_to_write=total_bytes_to_write)
-                            total_bytes_written += current_bytes_written
+                            downloads.append((temp_target_disk, device_url))
                             ovf_file = vim.OvfManager.OvfFile()
                             ovf_file.deviceId = deviceUrl.key
                             ovf_file.path = device_file_name
-                            ovf_file.size = current_bytes_written
                             ovf_files.append(ovf_file)
+                    sizes = self.download_device_files_concurrently(headers, downloads, lease_updater, total_bytes_to_write)
+                    for ovf_file, current_bytes_written in zip(ovf_files, sizes):
+                        ovf_file.size = current_bytes_written
                     break
                 if http_nfc_lease.state == vim.HttpNfcLease.State.initializing:
                     sleep(2)
@@ -337,6 +377,8 @@ def main():
         export_with_images=dict(type='bool', default=False),
         export_with_extraconfig=dict(type='bool', default=False),
         download_timeout=dict(type='int', default=30),
+        download_buffer_size=dict(type='int', default=2 * 1024 * 1024),
+        download_workers=dict(type='int', default=4),
     )
 
     module = AnsibleModule(argument_spec=argument_spec,
@@ -345,6 +387,8 @@ def main():
                                ['name', 'uuid', 'moid'],
                            ],
                            )
+    if module.params['download_workers'] < 1 or module.params['download_buffer_size'] < 1:
+        module.fail_json(msg='download_workers and download_buffer_size must be greater than 0.')
     pyv = VMwareExportVmOvf(module)
     vm = pyv.get_vm()
     if vm:
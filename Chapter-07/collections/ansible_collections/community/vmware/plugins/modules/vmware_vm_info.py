@@ -223,7 +223,7 @@ except ImportError:
     pass
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.community.vmware.plugins.module_utils.vmware import PyVmomi, get_all_objs, vmware_argument_spec, _get_vm_prop, get_parent_datacenter
+from ansible_collections.community.vmware.plugins.module_utils.vmware import PyVmomi, vmware_argument_spec, _get_vm_prop, retrieve_properties
 from ansible_collections.community.vmware.plugins.module_utils.vmware_rest_client import VmwareRestClient
 
 
@@ -232,13 +232,88 @@ class VmwareVmInfo(PyVmomi):
         super(VmwareVmInfo, self).__init__(module)
         if self.module.params.get('show_tag'):
             self.vmware_client = VmwareRestClient(self.module)
+        self.custom_field_names = dict((x.key, x.name) for x in self.custom_field_mgr)
+        self.inventory = dict()
 
     def get_tag_info(self, vm_dynamic_obj):
         return self.vmware_client.get_tags_for_vm(vm_mid=vm_dynamic_obj._moId)
 
-    def get_vm_attributes(self, vm):
-        return dict((x.name, v.value) for x in self.custom_field_mgr
-                    for v in vm.customValue if x.key == v.key)
+    def get_vm_attributes(self, vm, custom_values=None):
+        if custom_values is None:
+            custom_values = vm.customValue
+        return dict((self.custom_field_names[v.key], v.value) for v in custom_values
+                    if v.key in self.custom_field_names)
+
+    def get_vm_properties(self, folder=None):
+        """
+        Get the properties of all virtual machines below the folder with paged PropertyCollector calls
+        """
+        properties = [
+            'summary.config.name',
+            'summary.config.guestFullName',
+            'summary.config.uuid',
+            'summary.runtime.powerState',
+            'summary.runtime.host',
+            'summary.guest.ipAddress',
+            'config.hardware.device',
+            'config.datastoreUrl',
+            'config.template',
+            'guest.net',
+            'parent',
+            'parentVApp',
+        ]
+        if self.module.params.get('show_attribute'):
+            properties.append('customValue')
+        return retrieve_properties(self.content, [vim.VirtualMachine], properties, folder=folder)
+
+    def load_inventory(self):
+        """
+        Get the names and parents of the hosts, clusters, resource pools, datacenters and folders
+        """
+        inventory_properties = ['name', 'parent']
+        properties = {
+            vim.HostSystem: inventory_properties + ['summary.config.name'],
+            vim.ComputeResource: inventory_properties,
+            vim.ResourcePool: inventory_properties,
+            vim.Datacenter: inventory_properties,
+            vim.Folder: inventory_properties,
+        }
+        self.inventory = dict(retrieve_properties(self.content, list(properties), properties))
+
+    def get_inventory_prop(self, obj, path):
+        props = self.inventory.get(obj)
+        if props is None:
+            # Not part of the inventory snapshot, e.g. the root folder or a vApp created meanwhile
+            return _get_vm_prop(obj, path.split('.'))
+        return props.get(path)
+
+    def get_vm_folder_path(self, vm_props):
+        """
+        Find the folder path of a virtual machine like PyVmomi.get_vm_path
+        """
+        folder_name = None
+        folder = vm_props.get('parent')
+        if folder:
+            folder_name = self.get_inventory_prop(folder, 'name')
+            fp = self.get_inventory_prop(folder, 'parent')
+            # climb back up the tree to find our path, stop before the root folder
+            while fp is not None and fp != self.content.rootFolder:
+                fp_name = self.get_inventory_prop(fp, 'name')
+                if fp_name is None:
+                    break
+                folder_name = fp_name + '/' + folder_name
+                fp = self.get_inventory_prop(fp, 'parent')
+            folder_name = '/' + folder_name
+        return folder_name
+
+    def get_vm_datacenter(self, vm_props):
+        """
+        Walk the inventory snapshot to find the datacenter of a virtual machine like get_parent_datacenter
+        """
+        obj = vm_props.get('parent') or vm_props.get('parentVApp')
+        while obj is not None and not isinstance(obj, vim.Datacenter):
+            obj = self.get_inventory_prop(obj, 'parent') or _get_vm_prop(obj, ('parentVApp',))
+        return obj
 
     # https://github.com/vmware/pyvmomi-community-samples/blob/master/samples/getallvms.py
     def get_all_virtual_machines(self):
@@ -252,25 +327,29 @@ class VmwareVmInfo(PyVmomi):
             if not folder_obj:
                 self.module.fail_json(msg="Failed to find folder specified by %(folder)s" % self.params)
 
-        virtual_machines = get_all_objs(self.content, [vim.VirtualMachine], folder=folder_obj)
+        self.load_inventory()
+        vm_type = self.module.params.get('vm_type')
         _virtual_machines = []
 
-        for vm in virtual_machines:
-            _ip_address = ""
-            summary = vm.summary
-            if summary.guest is not None:
-                _ip_address = summary.guest.ipAddress
-                if _ip_address is None:
-                    _ip_address = ""
+        for vm, props in self.get_vm_properties(folder=folder_obj):
+            is_template = props.get('config.template')
+            if vm_type == 'vm' and is_template:
+                continue
+            if vm_type == 'template' and not is_template:
+                continue
+
+            _ip_address = props.get('summary.guest.ipAddress')
+            if _ip_address is None:
+                _ip_address = ""
             _mac_address = []
-            all_devices = _get_vm_prop(vm, ('config', 'hardware', 'device'))
+            all_devices = props.get('config.hardware.device')
             if all_devices:
                 for dev in all_devices:
                     if isinstance(dev, vim.vm.device.VirtualEthernetCard):
                         _mac_address.append(dev.macAddress)
 
             net_dict = {}
-            vmnet = _get_vm_prop(vm, ('guest', 'net'))
+            vmnet = props.get('guest.net')
             if vmnet:
                 for device in vmnet:
                     net_dict[device.macAddress] = dict()
@@ -284,39 +363,40 @@ class VmwareVmInfo(PyVmomi):
 
             esxi_hostname = None
             esxi_parent = None
-            if summary.runtime.host:
-                esxi_hostname = summary.runtime.host.summary.config.name
-                esxi_parent = summary.runtime.host.parent
+            esxi_host = props.get('summary.runtime.host')
+            if esxi_host:
+                esxi_hostname = self.get_inventory_prop(esxi_host, 'summary.config.name')
+                esxi_parent = self.get_inventory_prop(esxi_host, 'parent')
 
             cluster_name = None
             if esxi_parent and isinstance(esxi_parent, vim.ClusterComputeResource):
-                cluster_name = summary.runtime.host.parent.name
+                cluster_name = self.get_inventory_prop(esxi_parent, 'name')
 
             vm_attributes = dict()
             if self.module.params.get('show_attribute'):
-                vm_attributes = self.get_vm_attributes(vm)
+                vm_attributes = self.get_vm_attributes(vm, props.get('customValue', []))
 
             vm_tags = list()
             if self.module.params.get('show_tag'):
                 vm_tags = self.get_tag_info(vm)
 
-            vm_folder = PyVmomi.get_vm_path(content=self.content, vm_name=vm)
-            datacenter = get_parent_datacenter(vm)
+            vm_folder = self.get_vm_folder_path(props)
+            datacenter = self.get_vm_datacenter(props)
             datastore_url = list()
             datastore_attributes = ('name', 'url')
-            if vm.config.datastoreUrl:
-                for entry in vm.config.datastoreUrl:
+            if props.get('config.datastoreUrl'):
+                for entry in props['config.datastoreUrl']:
                     datastore_url.append({key: getattr(entry, key) for key in dir(entry) if key in datastore_attributes})
             virtual_machine = {
-                "guest_name": summary.config.name,
-                "guest_fullname": summary.config.guestFullName,
-                "power_state": summary.runtime.powerState,
+                "guest_name": props.get('summary.config.name'),
+                "guest_fullname": props.get('summary.config.guestFullName'),
+                "power_state": props.get('summary.runtime.powerState'),
                 "ip_address": _ip_address,  # Kept for backward compatibility
                 "mac_address": _mac_address,  # Kept for backward compatibility
-                "uuid": summary.config.uuid,
+                "uuid": props.get('summary.config.uuid'),
                 "vm_network": net_dict,
                 "esxi_hostname": esxi_hostname,
-                "datacenter": datacenter.name,
+                "datacenter": self.get_inventory_prop(datacenter, 'name'),
                 "cluster": cluster_name,
                 "attributes": vm_attributes,
                 "tags": vm_tags,
@@ -324,15 +404,7 @@ class VmwareVmInfo(PyVmomi):
                 "moid": vm._moId,
                 "datastore_url": datastore_url,
             }
-
-            vm_type = self.module.params.get('vm_type')
-            is_template = _get_vm_prop(vm, ('config', 'template'))
-            if vm_type == 'vm' and not is_template:
-                _virtual_machines.append(virtual_machine)
-            elif vm_type == 'template' and is_template:
-                _virtual_machines.append(virtual_machine)
-            elif vm_type == 'all':
-                _virtual_machines.append(virtual_machine)
+            _virtual_machines.append(virtual_machine)
         return _virtual_machines
 
 
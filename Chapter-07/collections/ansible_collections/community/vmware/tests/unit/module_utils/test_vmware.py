@@ -8,6 +8,8 @@ __metaclass__ = type
 
 import ssl
 import sys
+from collections import namedtuple
+
 import pytest
 
 pyvmomi = pytest.importorskip('pyVmomi')
@@ -242,3 +244,218 @@ def test_connect_to_api_validate_certs(monkeypatch, fake_ansible_module):
 ])
 def test_option_diff(test_options, test_current_options, test_truthy_strings_as_bool):
     assert option_diff(test_options, test_current_options, test_truthy_strings_as_bool)[0].value == test_options["data"]
+
+
+DynamicProperty = namedtuple('DynamicProperty', ['name', 'val'])
+ObjectContent = namedtuple('ObjectContent', ['obj', 'propSet'])
+RetrieveResult = namedtuple('RetrieveResult', ['objects', 'token'])
+
+
+class FakeStub(object):
+    pass
+
+
+class FakeManagedObject(object):
+    def __init__(self, moid, name, collector):
+        self._moId = moid
+        self._name = name
+        self._collector = collector
+        self.deleted = False
+
+    @property
+    def name(self):
+        self._collector.calls.append('name')
+        if self.deleted:
+            raise vmware_module_utils.vmodl.fault.ManagedObjectNotFound()
+        return self._name
+
+
+class FakePropertyCollector(object):
+    """ Serve the names of objects through paged RetrievePropertiesEx calls """
+
+    def __init__(self):
+        self._stub = FakeStub()
+        self.objects = []
+        self.calls = []
+        self._pages = {}
+
+    def add(self, name):
+        obj = FakeManagedObject('vm-%d' % len(self.objects), name, self)
+        self.objects.append(obj)
+        return obj
+
+    def _page(self, objects, page_size):
+        page, rest = objects[:page_size], objects[page_size:]
+        token = None
+        if rest:
+            token = 'token-%d' % len(self._pages)
+            self._pages[token] = (rest, page_size)
+        return RetrieveResult([ObjectContent(obj, [DynamicProperty('name', obj._name)]) for obj in page], token)
+
+    def RetrievePropertiesEx(self, specSet, options):
+        self.calls.append('RetrievePropertiesEx')
+        objects = [obj for obj in self.objects if not obj.deleted]
+        return self._page(objects, options.maxObjects)
+
+    def ContinueRetrievePropertiesEx(self, token):
+        self.calls.append('ContinueRetrievePropertiesEx')
+        return self._page(*self._pages.pop(token))
+
+    def CancelRetrievePropertiesEx(self, token):
+        self.calls.append('CancelRetrievePropertiesEx')
+        del self._pages[token]
+
+
+@pytest.fixture
+def fake_content():
+    content = mock.Mock()
+    content.viewManager.CreateContainerView.return_value = mock.Mock(spec=vmware_module_utils.vim.view.ContainerView)
+    content.propertyCollector = FakePropertyCollector()
+    content.rootFolder = mock.Mock(_moId='group-d1')
+    return content
+
+
+def test_find_object_by_name_uses_paged_retrieval(fake_content):
+    collector = fake_content.propertyCollector
+    for index in range(2500):
+        collector.add('vm%d' % index)
+
+    vm = vmware_module_utils.find_vm_by_name(fake_content, 'vm2100')
+    assert vm is collector.objects[2100]
+    assert collector.calls == ['RetrievePropertiesEx', 'ContinueRetrievePropertiesEx', 'ContinueRetrievePropertiesEx']
+    assert fake_content.viewManager.CreateContainerView.return_value.Destroy.called
+
+    del collector.calls[:]
+    assert vmware_module_utils.find_vm_by_name(fake_content, 'vm7') is collector.objects[7]
+    assert collector.calls == ['name']
+
+
+def test_find_object_by_name_refreshes_index(fake_content):
+    collector = fake_content.propertyCollector
+    first = collector.add('web')
+    assert vmware_module_utils.find_vm_by_name(fake_content, 'web') is first
+
+    # The indexed object was deleted and a new one took its name
+    first.deleted = True
+    second = collector.add('web')
+    del collector.calls[:]
+    assert vmware_module_utils.find_vm_by_name(fake_content, 'web') is second
+    assert collector.calls == ['name', 'RetrievePropertiesEx']
+
+    # Objects created after the index was built are found too
+    third = collector.add('db')
+    assert vmware_module_utils.find_vm_by_name(fake_content, 'db') is third
+    assert vmware_module_utils.find_vm_by_name(fake_content, 'missing') is None
+
+
+def test_find_obj_and_get_all_objs(fake_content):
+    collector = fake_content.propertyCollector
+    slashed = collector.add('a%2fb')
+    other = collector.add('c')
+    twin = collector.add('a%2fb')
+
+    assert vmware_module_utils.find_obj(fake_content, [vmware_module_utils.vim.VirtualMachine], 'a/b') is slashed
+    assert vmware_module_utils.find_obj(fake_content, [vmware_module_utils.vim.VirtualMachine], 'a/b', first=False) == [slashed, twin]
+    assert vmware_module_utils.find_obj(fake_content, [vmware_module_utils.vim.VirtualMachine], None, first=False) == [slashed, other, twin]
+    assert vmware_module_utils.get_all_objs(fake_content, [vmware_module_utils.vim.VirtualMachine]) == {
+        slashed: 'a%2fb',
+        other: 'c',
+        twin: 'a%2fb',
+    }
+
+
+def test_retrieve_properties_cancels_unread_pages(fake_content):
+    collector = fake_content.propertyCollector
+    for index in range(5):
+        collector.add('vm%d' % index)
+
+    results = vmware_module_utils.retrieve_properties(fake_content, [vmware_module_utils.vim.VirtualMachine], ['name'], page_size=2)
+    assert next(results) == (collector.objects[0], {'name': 'vm0'})
+    results.close()
+    assert collector.calls == ['RetrievePropertiesEx', 'CancelRetrievePropertiesEx']
+
+
+UpdateSet = namedtuple('UpdateSet', ['version', 'filterSet'])
+FilterUpdate = namedtuple('FilterUpdate', ['objectSet'])
+ObjectUpdate = namedtuple('ObjectUpdate', ['obj', 'changeSet'])
+PropertyChange = namedtuple('PropertyChange', ['name', 'val'])
+
+
+class FakeTaskStub(object):
+    """ Stub answering the PropertyCollector calls of wait_for_tasks with a list of update sets """
+
+    def __init__(self, updates):
+        self.updates = list(updates)
+        self.calls = []
+
+    def InvokeMethod(self, mo, info, args):
+        self.calls.append((info.name, args))
+        if info.name == 'RetrieveContent':
+            return mock.Mock(propertyCollector=vmware_module_utils.vmodl.query.PropertyCollector('propertyCollector', self))
+        if info.name == 'CreatePropertyCollector':
+            return vmware_module_utils.vmodl.query.PropertyCollector('session[1]', self)
+        if info.name == 'WaitForUpdatesEx':
+            return self.updates.pop(0)
+        return None
+
+    def waits(self):
+        return [args[0] for name, args in self.calls if name == 'WaitForUpdatesEx']
+
+
+def task_update(version, *task_changes):
+    return UpdateSet(version, [FilterUpdate([
+        ObjectUpdate(obj, [PropertyChange(name, val) for name, val in changes.items()]) for obj, changes in task_changes
+    ])])
+
+
+def test_wait_for_tasks_returns_when_all_tasks_finish():
+    vim = vmware_module_utils.vim
+    stub = FakeTaskStub([])
+    first, second = vim.Task('task-1', stub), vim.Task('task-2', stub)
+    stub.updates = [
+        task_update('1', (first, {'info.state': 'running'}), (second, {'info.state': 'queued'})),
+        task_update('2', (second, {'info.state': 'success', 'info.result': 'second'})),
+        None,
+        task_update('3', (first, {'info.state': 'success', 'info.result': 'first'})),
+    ]
+
+    assert vmware_module_utils.wait_for_tasks([first, second]) == ['first', 'second']
+    assert stub.waits() == ['', '1', '2', '2']
+    assert [name for name, args in stub.calls] == [
+        'RetrieveContent',
+        'CreatePropertyCollector',
+        'CreateFilter',
+        'WaitForUpdatesEx',
+        'WaitForUpdatesEx',
+        'WaitForUpdatesEx',
+        'WaitForUpdatesEx',
+        'Destroy',
+    ]
+
+
+def test_wait_for_task_result_and_error():
+    vim = vmware_module_utils.vim
+    stub = FakeTaskStub([])
+    task = vim.Task('task-1', stub)
+    stub.updates = [task_update('1', (task, {'info.state': 'success', 'info.result': 'done'}))]
+    assert vmware_module_utils.wait_for_task(task) == (True, 'done')
+
+    error = vim.fault.InvalidState(msg='The operation is not allowed in the current state.')
+    stub.updates = [task_update('1', (task, {'info.state': 'error', 'info.error': error}))]
+    with pytest.raises(vmware_module_utils.TaskError) as exc:
+        vmware_module_utils.wait_for_task(task)
+    assert exc.value.args == ('The operation is not allowed in the current state.', None)
+    assert stub.calls[-1][0] == 'Destroy'
+
+
+def test_wait_for_task_question_and_timeout():
+    vim = vmware_module_utils.vim
+    stub = FakeTaskStub([])
+    task, vm = vim.Task('task-1', stub), vim.VirtualMachine('vm-1', stub)
+    question = vim.vm.QuestionInfo(id='1', text='Did you move or copy it?')
+    stub.updates = [task_update('1', (task, {'info.state': 'running'}), (vm, {'runtime.question': question}))]
+    with pytest.raises(vmware_module_utils.TaskError, match='Did you move or copy it'):
+        vmware_module_utils.wait_for_task(task, vm=vm)
+
+    with pytest.raises(vmware_module_utils.TaskError, match='Timeout'):
+        vmware_module_utils.wait_for_task(task, timeout=0)
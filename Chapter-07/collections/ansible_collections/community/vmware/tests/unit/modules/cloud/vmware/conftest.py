@@ -0,0 +1,98 @@
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import threading
+import time
+
+import pytest
+
+from ansible.module_utils.six.moves import BaseHTTPServer, socketserver
+
+
+class NfcServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """ Local stand-in for the NFC endpoint of a HTTP NFC lease, serving and receiving disk files """
+
+    daemon_threads = True
+
+    def __init__(self):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), NfcRequestHandler)
+        self.files = {}
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        # Seconds every transfer is held open, to make concurrent transfers overlap
+        self.delay = 0
+        self.lock = threading.Lock()
+
+    def url(self, path):
+        return 'http://127.0.0.1:%d/%s' % (self.server_address[1], path)
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def leave(self):
+        with self.lock:
+            self.active -= 1
+
+
+class NfcRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _receive(self):
+        self.server.enter()
+        try:
+            self.server.requests.append((self.command, self.path, dict(self.headers.items())))
+            remaining = int(self.headers['Content-Length'])
+            chunks = []
+            while remaining:
+                chunk = self.rfile.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            self.server.files[self.path.lstrip('/')] = b''.join(chunks)
+            time.sleep(self.server.delay)
+        finally:
+            self.server.leave()
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_POST = _receive
+    do_PUT = _receive
+
+    def do_GET(self):
+        data = self.server.files.get(self.path.lstrip('/'))
+        if data is None:
+            self.send_error(404)
+            return
+        self.server.enter()
+        try:
+            time.sleep(self.server.delay)
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            view = memoryview(data)
+            for offset in range(0, len(data), 1024 * 1024):
+                self.wfile.write(view[offset:offset + 1024 * 1024])
+        finally:
+            self.server.leave()
+
+
+@pytest.fixture
+def nfc_server():
+    server = NfcServer()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,141 @@
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import io
+import os
+import tarfile
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+pyvmomi = pytest.importorskip('pyVmomi')
+
+from ansible_collections.community.vmware.plugins.module_utils import vmware as vmware_module_utils
+from ansible_collections.community.vmware.plugins.modules import vmware_deploy_ovf
+
+
+DISKS = {
+    'disk1.vmdk': os.urandom(3 * 1024 * 1024 + 17),
+    'disk2.vmdk': os.urandom(1024 * 1024),
+    'nvram': os.urandom(8 * 1024),
+}
+
+
+@pytest.fixture
+def disks(tmp_path):
+    paths = {}
+    for name, data in DISKS.items():
+        path = str(tmp_path / name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths[name] = path
+    return paths
+
+
+def make_ova(path, mode):
+    with tarfile.open(path, mode) as tar:
+        descriptor = b'<Envelope/>'
+        info = tarfile.TarInfo('vm.ovf')
+        info.size = len(descriptor)
+        tar.addfile(info, io.BytesIO(descriptor))
+        for name, data in sorted(DISKS.items()):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
+
+
+def run(uploader):
+    uploader.start()
+    uploader.join()
+    assert uploader.e is None
+    return uploader
+
+
+@pytest.fixture
+def deploy_ovf(monkeypatch):
+    module = mock.Mock()
+    module.params = dict(upload_workers=2, upload_buffer_size=256 * 1024)
+    module.fail_json.side_effect = SystemExit
+    monkeypatch.setattr(vmware_module_utils, 'connect_to_api', lambda module, return_si: (None, mock.Mock()))
+    return vmware_deploy_ovf.VMwareDeployOvf(module)
+
+
+def test_upload_file(nfc_server, disks):
+    uploader = run(vmware_deploy_ovf.VMDKUploader(disks['disk1.vmdk'], nfc_server.url('disk1.vmdk'), buffer_size=256 * 1024))
+    run(vmware_deploy_ovf.VMDKUploader(disks['nvram'], nfc_server.url('nvram'), create=True))
+
+    assert nfc_server.files == {'disk1.vmdk': DISKS['disk1.vmdk'], 'nvram': DISKS['nvram']}
+    assert uploader.bytes_read == len(DISKS['disk1.vmdk'])
+    assert [(method, headers['Content-Type']) for method, path, headers in nfc_server.requests] == [
+        ('POST', 'application/x-vnd.vmware-streamVmdk'),
+        ('PUT', 'application/octet-stream'),
+    ]
+
+
+@pytest.mark.parametrize('mode, compressed, reader', [
+    ('w', False, vmware_deploy_ovf.FileRangeReader),
+    ('w:gz', True, vmware_deploy_ovf.TarFileProgressReader),
+])
+def test_upload_from_ova(nfc_server, tmp_path, mode, compressed, reader):
+    with tarfile.open(make_ova(str(tmp_path / 'vm.ova'), mode)) as tar:
+        uploaders = [
+            run(vmware_deploy_ovf.VMDKUploader(tar, nfc_server.url(name), tarinfo=tar.getmember(name), compressed=compressed))
+            for name in DISKS
+        ]
+
+    assert nfc_server.files == DISKS
+    assert all(isinstance(uploader.f, reader) for uploader in uploaders)
+
+
+def test_file_range_reader_reuses_buffer(disks):
+    data = DISKS['disk1.vmdk']
+    with vmware_deploy_ovf.FileRangeReader(disks['disk1.vmdk'], 1000, 600 * 1024, buffer_size=256 * 1024) as reader:
+        blocks = []
+        while True:
+            block = reader.read(8192)
+            if not block:
+                break
+            blocks.append(len(block))
+            assert block.obj is reader._buffer.obj
+            assert bytes(block) == data[1000 + sum(blocks[:-1]):1000 + sum(blocks)]
+    assert blocks == [256 * 1024, 256 * 1024, 88 * 1024]
+    assert reader.bytes_read == 600 * 1024
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_uploaders(nfc_server, disks, deploy_ovf, workers):
+    nfc_server.delay = 0.3
+    deploy_ovf.params['upload_workers'] = workers
+    lease = mock.Mock()
+    uploaders = [vmware_deploy_ovf.VMDKUploader(disks[name], nfc_server.url(name)) for name in sorted(DISKS)]
+
+    deploy_ovf.run_uploaders(lease, uploaders)
+
+    assert nfc_server.files == DISKS
+    assert nfc_server.max_active == workers
+    progress = [args[0] for args, kwargs in lease.HttpNfcLeaseProgress.call_args_list]
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+    assert not lease.HttpNfcLeaseAbort.called
+
+
+def test_run_uploaders_failure(nfc_server, disks, deploy_ovf):
+    lease = mock.Mock()
+    uploaders = [
+        vmware_deploy_ovf.VMDKUploader(disks['disk2.vmdk'], nfc_server.url('disk2.vmdk')),
+        vmware_deploy_ovf.VMDKUploader(disks['nvram'], 'http://127.0.0.1:1/nvram'),
+    ]
+
+    with pytest.raises(SystemExit):
+        deploy_ovf.run_uploaders(lease, uploaders)
+
+    assert lease.HttpNfcLeaseAbort.called
+    assert 'Connection refused' in deploy_ovf.module.fail_json.call_args[1]['msg']
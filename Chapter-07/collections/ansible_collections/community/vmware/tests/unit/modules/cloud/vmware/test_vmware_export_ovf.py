@@ -0,0 +1,77 @@
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import hashlib
+import os
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+pyvmomi = pytest.importorskip('pyVmomi')
+
+from ansible_collections.community.vmware.plugins.module_utils import vmware as vmware_module_utils
+from ansible_collections.community.vmware.plugins.modules import vmware_export_ovf
+
+
+DEVICE_FILES = {
+    'vm-1.vmdk': os.urandom(3 * 1024 * 1024 + 17),
+    'vm-2.vmdk': os.urandom(1024 * 1024),
+    'vm.nvram': os.urandom(8 * 1024),
+}
+
+
+@pytest.fixture
+def export_ovf(monkeypatch, tmp_path):
+    module = mock.Mock()
+    module.params = dict(download_workers=2, download_buffer_size=256 * 1024)
+    module.fail_json.side_effect = SystemExit
+    monkeypatch.setattr(vmware_module_utils, 'connect_to_api', lambda module, return_si: (None, mock.Mock()))
+    export = vmware_export_ovf.VMwareExportVmOvf(module)
+    export.ovf_dir = str(tmp_path)
+    export.mf_file = str(tmp_path / 'vm.mf')
+    return export
+
+
+def test_download_device_files_concurrently(nfc_server, export_ovf):
+    nfc_server.files.update(DEVICE_FILES)
+    nfc_server.delay = 0.3
+    names = sorted(DEVICE_FILES)
+    downloads = [(os.path.join(export_ovf.ovf_dir, name), nfc_server.url(name)) for name in names]
+    lease_updater = mock.Mock(progressPercent=0)
+
+    sizes = export_ovf.download_device_files_concurrently({}, downloads, lease_updater, sum(len(data) for data in DEVICE_FILES.values()))
+
+    assert sizes == [len(DEVICE_FILES[name]) for name in names]
+    assert nfc_server.max_active == 2
+    for name in names:
+        with open(os.path.join(export_ovf.ovf_dir, name), 'rb') as f:
+            assert f.read() == DEVICE_FILES[name]
+    with open(export_ovf.mf_file) as f:
+        assert f.read() == ''.join(
+            'SHA256(%s)= %s\n' % (name, hashlib.sha256(DEVICE_FILES[name]).hexdigest()) for name in names
+        )
+    assert export_ovf.facts['device_files'] == [path for path, url in downloads]
+    assert 0 < lease_updater.progressPercent <= 100
+
+
+def test_download_device_files_failure(nfc_server, export_ovf):
+    nfc_server.files.update(DEVICE_FILES)
+    downloads = [
+        (os.path.join(export_ovf.ovf_dir, 'vm-1.vmdk'), nfc_server.url('vm-1.vmdk')),
+        (os.path.join(export_ovf.ovf_dir, 'missing.vmdk'), nfc_server.url('missing.vmdk')),
+    ]
+    lease_updater = mock.Mock(progressPercent=0)
+
+    with pytest.raises(SystemExit):
+        export_ovf.download_device_files_concurrently({}, downloads, lease_updater, 1024)
+
+    assert lease_updater.httpNfcLease.HttpNfcLeaseAbort.called
+    assert lease_updater.stop.called
+    assert 'missing.vmdk' in export_ovf.module.fail_json.call_args[1]['msg']
@@ -0,0 +1,151 @@
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+pyvmomi = pytest.importorskip('pyVmomi')
+
+from pyVmomi import vim
+
+from ansible_collections.community.vmware.plugins.module_utils import vmware as vmware_module_utils
+from ansible_collections.community.vmware.plugins.modules import vmware_vm_info
+
+
+class NoAccessorStub(object):
+    """ Stub failing on every property read, so only the prefetched snapshot can be used """
+
+    def InvokeAccessor(self, mo, info):
+        raise AssertionError('Unexpected read of %s.%s' % (mo._moId, info.name))
+
+
+STUB = NoAccessorStub()
+
+ROOT_FOLDER = vim.Folder('group-d1', STUB)
+DATACENTER = vim.Datacenter('datacenter-2', STUB)
+VM_FOLDER = vim.Folder('group-v3', STUB)
+WEB_FOLDER = vim.Folder('group-v10', STUB)
+HOST_FOLDER = vim.Folder('group-h4', STUB)
+CLUSTER = vim.ClusterComputeResource('domain-c7', STUB)
+RESOURCE_POOL = vim.ResourcePool('resgroup-8', STUB)
+VAPP = vim.VirtualApp('resgroup-v20', STUB)
+HOST = vim.HostSystem('host-9', STUB)
+VM = vim.VirtualMachine('vm-1', STUB)
+TEMPLATE = vim.VirtualMachine('vm-2', STUB)
+
+INVENTORY = [
+    (DATACENTER, {'name': 'DC1', 'parent': ROOT_FOLDER}),
+    (VM_FOLDER, {'name': 'vm', 'parent': DATACENTER}),
+    (WEB_FOLDER, {'name': 'web', 'parent': VM_FOLDER}),
+    (HOST_FOLDER, {'name': 'host', 'parent': DATACENTER}),
+    (CLUSTER, {'name': 'Cluster', 'parent': HOST_FOLDER}),
+    (RESOURCE_POOL, {'name': 'Resources', 'parent': CLUSTER}),
+    (VAPP, {'name': 'vApp', 'parent': RESOURCE_POOL}),
+    (HOST, {'name': 'esx1', 'parent': CLUSTER, 'summary.config.name': 'esx1.example.com'}),
+]
+
+VIRTUAL_MACHINES = [
+    (VM, {
+        'summary.config.name': 'web01',
+        'summary.config.guestFullName': 'Ubuntu Linux (64-bit)',
+        'summary.config.uuid': '4207072c-edd8-3bd5-64dc-903fd3a0db04',
+        'summary.runtime.powerState': 'poweredOn',
+        'summary.runtime.host': HOST,
+        'summary.guest.ipAddress': '10.0.0.5',
+        'config.hardware.device': [vim.vm.device.VirtualVmxnet3(key=4000, macAddress='00:50:56:87:a5:9a')],
+        'config.datastoreUrl': [vim.vm.ConfigInfo.DatastoreUrlPair(name='ds1', url='/vmfs/volumes/1')],
+        'config.template': False,
+        'guest.net': [vim.vm.GuestInfo.NicInfo(macAddress='00:50:56:87:a5:9a', ipAddress=['10.0.0.5', 'fe80::1'])],
+        'parent': WEB_FOLDER,
+        'customValue': [vim.CustomFieldsManager.StringValue(key=101, value='backup')],
+    }),
+    (TEMPLATE, {
+        'summary.config.name': 'template01',
+        'summary.runtime.powerState': 'poweredOff',
+        'config.template': True,
+        'parentVApp': VAPP,
+    }),
+]
+
+
+def fake_retrieve_properties(calls):
+    def retrieve_properties(content, vimtype, properties, folder=None):
+        calls.append((vimtype, properties))
+        if vimtype == [vim.VirtualMachine]:
+            return iter(VIRTUAL_MACHINES)
+        return iter(INVENTORY)
+    return retrieve_properties
+
+
+@pytest.fixture
+def vm_info(monkeypatch):
+    def create(**params):
+        module = mock.Mock()
+        module.params = dict(vm_type='all', show_attribute=False, show_tag=False, folder=None)
+        module.params.update(params)
+        content = mock.Mock(rootFolder=ROOT_FOLDER)
+        content.customFieldsManager.field = [vim.CustomFieldsManager.FieldDef(key=101, name='job')]
+        monkeypatch.setattr(vmware_module_utils, 'connect_to_api', lambda module, return_si: (None, content))
+        return vmware_vm_info.VmwareVmInfo(module)
+    return create
+
+
+def test_get_all_virtual_machines_from_snapshot(monkeypatch, vm_info):
+    calls = []
+    monkeypatch.setattr(vmware_vm_info, 'retrieve_properties', fake_retrieve_properties(calls))
+
+    virtual_machines = vm_info(show_attribute=True).get_all_virtual_machines()
+
+    assert len(calls) == 2
+    assert 'customValue' in calls[1][1]
+    assert virtual_machines == [
+        {
+            'guest_name': 'web01',
+            'guest_fullname': 'Ubuntu Linux (64-bit)',
+            'power_state': 'poweredOn',
+            'ip_address': '10.0.0.5',
+            'mac_address': ['00:50:56:87:a5:9a'],
+            'uuid': '4207072c-edd8-3bd5-64dc-903fd3a0db04',
+            'vm_network': {'00:50:56:87:a5:9a': {'ipv4': ['10.0.0.5'], 'ipv6': ['fe80::1']}},
+            'esxi_hostname': 'esx1.example.com',
+            'datacenter': 'DC1',
+            'cluster': 'Cluster',
+            'attributes': {'job': 'backup'},
+            'tags': [],
+            'folder': '/DC1/vm/web',
+            'moid': 'vm-1',
+            'datastore_url': [{'name': 'ds1', 'url': '/vmfs/volumes/1'}],
+        },
+        {
+            'guest_name': 'template01',
+            'guest_fullname': None,
+            'power_state': 'poweredOff',
+            'ip_address': '',
+            'mac_address': [],
+            'uuid': None,
+            'vm_network': {},
+            'esxi_hostname': None,
+            'datacenter': 'DC1',
+            'cluster': None,
+            'attributes': {},
+            'tags': [],
+            'folder': None,
+            'moid': 'vm-2',
+            'datastore_url': [],
+        },
+    ]
+
+
+@pytest.mark.parametrize('vm_type, expected', [('vm', ['vm-1']), ('template', ['vm-2'])])
+def test_get_all_virtual_machines_vm_type(monkeypatch, vm_info, vm_type, expected):
+    calls = []
+    monkeypatch.setattr(vmware_vm_info, 'retrieve_properties', fake_retrieve_properties(calls))
+
+    virtual_machines = vm_info(vm_type=vm_type).get_all_virtual_machines()
+
+    assert [vm['moid'] for vm in virtual_machines] == expected
+    assert 'customValue' not in calls[1][1]
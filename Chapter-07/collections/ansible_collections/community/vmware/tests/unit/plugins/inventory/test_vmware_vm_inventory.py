@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import threading
+from collections import namedtuple
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import pytest
+
+pyvmomi = pytest.importorskip('pyVmomi')
+
+from pyVmomi import vim
+
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.loader import inventory_loader
+from ansible.template import Templar
+
+from ansible_collections.community.vmware.plugins.inventory import vmware_vm_inventory
+from ansible_collections.community.vmware.plugins.inventory.vmware_vm_inventory import BaseVMwareInventory
+
+
+Tag = namedtuple('Tag', ['id', 'name', 'category_id'])
+Category = namedtuple('Category', ['id', 'name'])
+DynamicID = namedtuple('DynamicID', ['type', 'id'])
+TagToObjects = namedtuple('TagToObjects', ['tag_id', 'object_ids'])
+DynamicProperty = namedtuple('DynamicProperty', ['name', 'val'])
+ObjectContent = namedtuple('ObjectContent', ['obj', 'propSet'])
+
+
+class FakeTagging(object):
+    """ vSphere Automation tagging services counting their calls """
+
+    def __init__(self, tags, categories, associations, bulk=True):
+        self.calls = []
+        self._lock = threading.Lock()
+        self._tags = dict((tag.id, tag) for tag in tags)
+        self._categories = dict((category.id, category) for category in categories)
+        self._associations = associations
+        self.Tag = self._service('Tag', list=lambda: [tag.id for tag in tags], get=self._tags.get)
+        self.Category = self._service('Category', get=self._categories.get)
+        methods = dict(list_attached_objects=lambda tag_id: self._associations.get(tag_id, []))
+        if bulk:
+            methods['list_attached_objects_on_tags'] = lambda tag_ids: [
+                TagToObjects(tag_id, self._associations.get(tag_id, [])) for tag_id in tag_ids
+            ]
+        self.TagAssociation = self._service('TagAssociation', **methods)
+
+    def _service(self, service_name, **methods):
+        service = type(service_name, (object,), {})()
+        for name, method in methods.items():
+            setattr(service, name, self._counted('%s.%s' % (service_name, name), method))
+        return service
+
+    def _counted(self, name, method):
+        def call(*args):
+            with self._lock:
+                self.calls.append(name)
+            return method(*args)
+        return call
+
+
+def make_tagging(count, bulk=True):
+    categories = [Category('cat-%d' % index, 'category%d' % index) for index in range(3)]
+    tags = [Tag('tag-%d' % index, 'tag%d' % index, 'cat-%d' % (index % 3)) for index in range(count)]
+    associations = {
+        'tag-0': [DynamicID('VirtualMachine', 'vm-1'), DynamicID('HostSystem', 'host-1')],
+        'tag-1': [DynamicID('VirtualMachine', 'vm-1'), DynamicID('VirtualMachine', 'vm-2')],
+        'tag-4': [DynamicID('VirtualMachine', 'vm-2')],
+        'tag-5': [DynamicID('HostSystem', 'host-1')],
+    }
+    return FakeTagging(tags, categories, associations, bulk=bulk)
+
+
+def new_inventory(tagging):
+    inventory = BaseVMwareInventory('vcenter', 'user', 'pass', 443, False, True, None, None)
+    inventory.rest_content = type('Client', (object,), {'tagging': tagging})()
+    return inventory
+
+
+@pytest.mark.parametrize('bulk', [True, False])
+def test_get_tags_by_object(bulk):
+    tagging = make_tagging(250, bulk=bulk)
+
+    tags_by_vm = new_inventory(tagging).get_tags_by_object('VirtualMachine')
+
+    assert tags_by_vm == {
+        'vm-1': [('tag0', 'category0'), ('tag1', 'category1')],
+        'vm-2': [('tag1', 'category1'), ('tag4', 'category1')],
+    }
+    # Only the tags attached to a VM are read, and every category once
+    assert tagging.calls.count('Tag.list') == 1
+    assert tagging.calls.count('Tag.get') == 3
+    assert tagging.calls.count('Category.get') == 2
+    if bulk:
+        assert tagging.calls.count('TagAssociation.list_attached_objects_on_tags') == 3
+        assert 'TagAssociation.list_attached_objects' not in tagging.calls
+    else:
+        assert tagging.calls.count('TagAssociation.list_attached_objects') == 250
+
+
+def test_get_tags_by_object_without_tags():
+    tagging = make_tagging(0)
+    assert new_inventory(tagging).get_tags_by_object('VirtualMachine') is None
+    assert tagging.calls == ['Tag.list']
+
+
+class NoAccessorStub(object):
+    """ Stub failing on every property read, so only the prefetched properties can be used """
+
+    def InvokeAccessor(self, mo, info):
+        raise AssertionError('Unexpected read of %s.%s' % (mo._moId, info.name))
+
+
+class PrefetchedStub(object):
+    """ Stub serving the root folder, the only object the plugin reads directly """
+
+    def InvokeAccessor(self, mo, info):
+        return {'name': 'Datacenters', 'parent': None}[info.name]
+
+
+def make_content(vm_count):
+    stub = NoAccessorStub()
+    root = vim.Folder('group-d1', PrefetchedStub())
+    datacenter = vim.Datacenter('datacenter-2', stub)
+    vm_folder = vim.Folder('group-v3', stub)
+    folders = [
+        (datacenter, {'name': 'DC1', 'parent': root}),
+        (vm_folder, {'name': 'vm', 'parent': datacenter}),
+    ]
+    for index in range(10):
+        folders.append((vim.Folder('group-v%d' % (100 + index), stub), {'name': 'folder%d' % index, 'parent': vm_folder}))
+
+    vms = []
+    for index in range(vm_count):
+        vm = vim.VirtualMachine('vm-%d' % index, stub)
+        vms.append(ObjectContent(vm, [
+            DynamicProperty('name', 'vm%d' % index),
+            DynamicProperty('runtime.connectionState', 'connected'),
+            DynamicProperty('parent', folders[2 + index % 10][0]),
+            DynamicProperty('customValue', [vim.CustomFieldsManager.StringValue(key=100 + index % 3, value='value%d' % index)]),
+        ]))
+
+    content = mock.Mock()
+    content.customFieldsManager.field = [vim.CustomFieldsManager.FieldDef(key=100 + index, name='field%d' % index) for index in range(3)]
+    return content, vms, folders
+
+
+def populate(vm_count, monkeypatch, properties=None):
+    content, vms, folders = make_content(vm_count)
+    calls = []
+
+    def retrieve_properties(content, vimtype, properties):
+        calls.append(('retrieve_properties', vimtype, properties))
+        return iter(folders)
+
+    def get_managed_objects_properties(vim_type, properties=None, resources=None, strict=False):
+        calls.append(('get_managed_objects_properties', vim_type, properties))
+        return [ObjectContent(vm.obj, [prop for prop in vm.propSet if prop.name in properties]) for vm in vms]
+
+    monkeypatch.setattr(vmware_vm_inventory, 'retrieve_properties', retrieve_properties)
+    plugin = inventory_loader.get('community.vmware.vmware_vm_inventory')
+    plugin.inventory = InventoryData()
+    plugin.templar = Templar(loader=DataLoader())
+    plugin.set_options(direct=dict(
+        hostname='vcenter',
+        username='user',
+        password='pass',
+        properties=properties or ['name', 'customValue'],
+        hostnames=['name'],
+        with_path=True,
+        keyed_groups=[],
+        compose={'ansible_host': 'name'},
+    ))
+    plugin.pyv = mock.Mock(content=content, with_tags=False, get_managed_objects_properties=get_managed_objects_properties)
+    return plugin, plugin._populate_from_source(), calls
+
+
+def test_populate_from_prefetched_properties(monkeypatch):
+    plugin, hostvars, calls = populate(30, monkeypatch)
+
+    assert calls == [
+        ('get_managed_objects_properties', vim.VirtualMachine, ['name', 'customValue', 'runtime.connectionState', 'parent']),
+        ('retrieve_properties', [vim.Folder, vim.Datacenter], ['name', 'parent']),
+    ]
+    assert hostvars['vm4'] == {
+        'name': 'vm4',
+        'runtime': {'connectionState': 'connected'},
+        'field1': 'value4',
+        'path': 'Datacenters/DC1/vm/folder4',
+    }
+    assert 'vm4' in [host.name for host in plugin.inventory.groups['Datacenters_DC1_vm_folder4'].hosts]
+
+
+def test_populate_keeps_requested_parent(monkeypatch):
+    plugin, hostvars, calls = populate(1, monkeypatch, properties=['name', 'parent'])
+
+    assert calls[0][2] == ['name', 'parent', 'runtime.connectionState']
+    assert hostvars['vm0']['path'] == 'Datacenters/DC1/vm/folder0'
+    assert hostvars['vm0']['parent'] == "'vim.Folder:group-v100'"
+    assert 'customValue' not in hostvars['vm0']
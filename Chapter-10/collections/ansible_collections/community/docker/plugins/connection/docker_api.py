@@ -73,6 +73,7 @@ import io
 import os
 import os.path
 import shutil
+import stat
 import tarfile
 
 from ansible.errors import AnsibleFileNotFound, AnsibleConnectionFailure
@@ -102,6 +103,82 @@ MIN_DOCKER_API = None
 
 display = Display()
 
+# Size of the blocks read from uploaded files and from downloaded archives
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _regular_file_tar_generator(b_in_path, file_stat, out_file, user_id, group_id, user_name=None, chunk_size=STREAM_CHUNK_SIZE):
+    '''
+    Generate a tar archive containing the regular file ``b_in_path`` under the name ``out_file``,
+    in chunks of at most ``chunk_size`` bytes. Only the current chunk is kept in memory.
+    '''
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise AnsibleConnectionFailure('Local file "%s" is not a regular file' % to_native(b_in_path))
+
+    tarinfo = tarfile.TarInfo()
+    tarinfo.name = to_text(out_file)
+    tarinfo.type = tarfile.REGTYPE
+    tarinfo.size = file_stat.st_size
+    tarinfo.mtime = int(file_stat.st_mtime)
+    tarinfo.mode = stat.S_IMODE(file_stat.st_mode) & 0o700
+    tarinfo.uid = user_id
+    tarinfo.uname = user_name or ''
+    tarinfo.gid = group_id
+    tarinfo.gname = ''
+
+    header = tarinfo.tobuf(tarfile.GNU_FORMAT, 'utf-8', 'surrogateescape')
+    yield header
+
+    remaining = tarinfo.size
+    with open(b_in_path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(remaining, chunk_size))
+            if not chunk:
+                raise AnsibleConnectionFailure(
+                    'Local file "%s" was truncated while it was being uploaded' % to_native(b_in_path))
+            remaining -= len(chunk)
+            yield chunk
+
+    # Pad the file to a full block, end the archive with two empty blocks and pad it to a full record
+    length = len(header) + tarinfo.size
+    padding = -tarinfo.size % tarfile.BLOCKSIZE + 2 * tarfile.BLOCKSIZE
+    padding += -(length + padding) % tarfile.RECORDSIZE
+    yield tarfile.NUL * padding
+
+
+class _ChunkStreamReader(io.RawIOBase):
+    '''
+    Read-only file object returning the data of an iterable of byte chunks, such as the stream returned
+    by ``get_archive()``. Only the current chunk is kept in memory.
+    '''
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._iterator = iter(stream)
+        self._chunk = b''
+        self._offset = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while self._offset >= len(self._chunk):
+            try:
+                self._chunk = next(self._iterator)
+            except StopIteration:
+                return 0
+            self._offset = 0
+        length = min(len(b), len(self._chunk) - self._offset)
+        b[:length] = memoryview(self._chunk)[self._offset:self._offset + length]
+        self._offset += length
+        return length
+
+    def close(self):
+        close = getattr(self._stream, 'close', None)
+        if close is not None:
+            close()
+        super(_ChunkStreamReader, self).close()
+
 
 class Connection(ConnectionBase):
     ''' Local docker based connections '''
@@ -293,33 +370,16 @@ class Connection(ConnectionBase):
 
         out_dir, out_file = os.path.split(out_path)
 
-        # TODO: stream tar file, instead of creating it in-memory into a BytesIO
-
-        bio = io.BytesIO()
-        with tarfile.open(fileobj=bio, mode='w|', dereference=True, encoding='utf-8') as tar:
-            # Note that without both name (bytes) and arcname (unicode), this either fails for
-            # Python 2.6/2.7, Python 3.5/3.6, or Python 3.7+. Only when passing both (in this
-            # form) it works with Python 2.6, 2.7, 3.5, 3.6, and 3.7 up to 3.9.
-            tarinfo = tar.gettarinfo(b_in_path, arcname=to_text(out_file))
-            user_id, group_id = self.ids[self.actual_user]
-            tarinfo.uid = user_id
-            tarinfo.uname = ''
-            if self.actual_user:
-                tarinfo.uname = self.actual_user
-            tarinfo.gid = group_id
-            tarinfo.gname = ''
-            tarinfo.mode &= 0o700
-            with open(b_in_path, 'rb') as f:
-                tar.addfile(tarinfo, fileobj=f)
-        data = bio.getvalue()
+        user_id, group_id = self.ids[self.actual_user]
+        # dereference the local path like tarfile's dereference=True did
+        file_stat = os.stat(b_in_path)
 
         ok = self._call_client(lambda: self.client.put_archive(
             self.get_option('remote_addr'),
             out_dir,
-            data,  # can also be file object for streaming; this is only clear from the
-                   # implementation of put_archive(), which uses requests's put().
-                   # See https://2.python-requests.org/en/master/user/advanced/#streaming-uploads
-                   # WARNING: might not work with all transports!
+            # put_archive() passes the data to requests's put(), which sends a generator with
+            # chunked transfer encoding; see https://2.python-requests.org/en/master/user/advanced/#chunk-encoded-requests
+            _regular_file_tar_generator(b_in_path, file_stat, out_file, user_id, group_id, user_name=self.actual_user),
         ), not_found_can_be_resource=True)
         if not ok:
             raise AnsibleConnectionFailure(
@@ -348,14 +408,7 @@ class Connection(ConnectionBase):
                 in_path,
             ), not_found_can_be_resource=True)
 
-            # TODO: stream tar file instead of downloading it into a BytesIO
-
-            bio = io.BytesIO()
-            for chunk in stream:
-                bio.write(chunk)
-            bio.seek(0)
-
-            with tarfile.open(fileobj=bio, mode='r|') as tar:
+            with _ChunkStreamReader(stream) as reader, tarfile.open(fileobj=reader, mode='r|', bufsize=STREAM_CHUNK_SIZE) as tar:
                 symlink_member = None
                 first = True
                 for member in tar:
@@ -369,7 +422,7 @@ class Connection(ConnectionBase):
                         raise AnsibleConnectionFailure('Remote file "%s" is not a regular file or a symbolic link' % in_path)
                     in_f = tar.extractfile(member)  # in Python 2, this *cannot* be used in `with`...
                     with open(b_out_path, 'wb') as out_f:
-                        shutil.copyfileobj(in_f, out_f, member.size)
+                        shutil.copyfileobj(in_f, out_f)
                 if first:
                     raise AnsibleConnectionFailure('Received tarfile is empty!')
                 # If the only member was a file, it's already extracted. If it is a symlink, process it now.
@@ -21,11 +21,18 @@ requirements:
     - L(Docker SDK for Python,https://docker-py.readthedocs.io/en/stable/) >= 1.10.0
 extends_documentation_fragment:
     - ansible.builtin.constructed
+    - ansible.builtin.inventory_cache
     - community.docker.docker
     - community.docker.docker.docker_py_1_documentation
 description:
     - Reads inventories from the Docker API.
     - Uses a YAML configuration file that ends with C(docker.[yml|yaml]).
+    - When the inventory cache is enabled, the inspection results are cached per Docker daemon and listed
+      container. A container is only inspected again when its entry in the container list changed, apart
+      from its uptime. Its state, exit code and health status are part of the entry.
+    - A container restarted between two runs without changing state, for example by a restart policy, keeps
+      its cached inspection results. Their start time (C(docker_state.StartedAt)), C(docker_restartcount) and
+      the health check log can then be stale. Refresh the cache to get them.
 options:
     plugin:
         description:
@@ -103,6 +110,27 @@ options:
               See the examples for how to do that.
         type: bool
         default: false
+
+    skip_inspect:
+        description:
+            - Do not inspect the containers, and only use the information returned by the container list.
+            - This saves one API call per container, but the C(docker_xxx) variables are then created from the
+              keys of the container list, which differ from the inspection results. For example, C(docker_state)
+              is a string like C(running), C(docker_labels) contains the labels, and C(docker_config) does
+              not exist.
+            - The I(add_legacy_groups) and the SSH port lookup of I(connection_type=ssh) use the listed values.
+        type: bool
+        default: false
+        version_added: 2.4.0
+
+    inspect_workers:
+        description:
+            - The number of containers inspected concurrently.
+            - The requests share the connection pool of the Docker SDK for Python client, which holds 10
+              connections by default. Values above that open additional connections that are not reused.
+        type: int
+        default: 8
+        version_added: 2.4.0
 '''
 
 EXAMPLES = '''
@@ -148,11 +176,15 @@ compose:
   ansible_ssh_port: ansible_ssh_port | default(22, true)
 '''
 
+import hashlib
+import json
 import re
 
+from multiprocessing.pool import ThreadPool
+
 from ansible.errors import AnsibleError
-from ansible.module_utils.common.text.converters import to_native
-from ansible.plugins.inventory import BaseInventoryPlugin, Constructable
+from ansible.module_utils.common.text.converters import to_bytes, to_native
+from ansible.plugins.inventory import BaseInventoryPlugin, Constructable, Cacheable
 
 from ansible_collections.community.docker.plugins.module_utils.common import (
     RequestException,
@@ -171,8 +203,10 @@ except Exception:
 MIN_DOCKER_PY = '1.7.0'
 MIN_DOCKER_API = None
 
+STATUS_DETAILS = re.compile(r'\(([^)]*)\)')
+
 
-class InventoryModule(BaseInventoryPlugin, Constructable):
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     ''' Host inventory parser for ansible using Docker daemon as source. '''
 
     NAME = 'community.docker.docker_containers'
@@ -180,7 +214,69 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
     def _slugify(self, value):
         return 'docker_%s' % (re.sub(r'[^\w-]', '_', value).lower().lstrip('_'))
 
-    def _populate(self, client):
+    def _inspection_key(self, container):
+        # The Status field contains the container's uptime, which changes on every listing. Only keep its
+        # state and the parts in parentheses: the exit code, and the health status or whether it is paused.
+        listed = dict(container)
+        status = listed.pop('Status', None)
+        if status is not None:
+            listed['Status'] = [status.split(' ', 1)[0]] + STATUS_DETAILS.findall(status)
+        data = json.dumps([self.get_option('docker_host'), listed], sort_keys=True)
+        return hashlib.sha1(to_bytes(data)).hexdigest()
+
+    def _inspect_containers(self, client, containers, cached_inspections):
+        '''
+        Inspect the containers, reusing the cached inspection results of the ones whose list entry is unchanged.
+        Return the inspection results in the order of ``containers`` and the inspection results to cache.
+        '''
+        keys = [self._inspection_key(container) for container in containers]
+        inspections = dict((key, cached_inspections[key]) for key in keys if key in cached_inspections)
+        missing = [(key, container) for key, container in zip(keys, containers) if key not in inspections]
+
+        def inspect(entry):
+            key, container = entry
+            try:
+                return key, client.inspect_container(container.get('Id'))
+            except APIError as exc:
+                raise AnsibleError("Error inspecting container %s - %s" % (container.get('Id'), str(exc)))
+
+        workers = min(self.get_option('inspect_workers') or 1, len(missing))
+        if workers > 1:
+            pool = ThreadPool(workers)
+            try:
+                results = pool.map(inspect, missing)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [inspect(entry) for entry in missing]
+        inspections.update(results)
+
+        return [inspections[key] for key in keys], inspections
+
+    @staticmethod
+    def _get_ssh_port(inspect, container, ssh_port):
+        if inspect is None:
+            # Same as the host port lookup below, but on the 'Ports' list of the container list
+            ports = [
+                port for port in container.get('Ports') or []
+                if port.get('PrivatePort') == ssh_port and port.get('PublicPort')
+            ]
+            ports.sort(key=lambda port: ['tcp', 'udp', 'sctp'].index(port.get('Type', 'tcp')))
+            if not ports:
+                return dict()
+            return dict(HostIp=ports[0].get('IP', ''), HostPort=str(ports[0]['PublicPort']))
+
+        # The same lookup as docker-py's port(), without inspecting the container again
+        network_settings = inspect.get('NetworkSettings') or dict()
+        port_settings = network_settings.get('Ports') or dict()
+        for protocol in ('tcp', 'udp', 'sctp'):
+            host_ports = port_settings.get('{0}/{1}'.format(ssh_port, protocol))
+            if host_ports:
+                return host_ports[0]
+        return dict()
+
+    def _populate(self, client, cached_inspections=None):
         strict = self.get_option('strict')
 
         ssh_port = self.get_option('private_ssh_port')
@@ -189,12 +285,19 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
         verbose_output = self.get_option('verbose_output')
         connection_type = self.get_option('connection_type')
         add_legacy_groups = self.get_option('add_legacy_groups')
+        skip_inspect = self.get_option('skip_inspect')
 
         try:
             containers = client.containers(all=True)
         except APIError as exc:
             raise AnsibleError("Error listing containers: %s" % to_native(exc))
 
+        if skip_inspect:
+            inspections = [None] * len(containers)
+            new_inspections = dict()
+        else:
+            inspections, new_inspections = self._inspect_containers(client, containers, cached_inspections or dict())
+
         if add_legacy_groups:
             self.inventory.add_group('running')
             self.inventory.add_group('stopped')
@@ -206,7 +309,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
                 if value is not None:
                     extra_facts[var_name] = value
 
-        for container in containers:
+        for container, inspect in zip(containers, inspections):
             id = container.get('Id')
             short_id = id[:13]
 
@@ -224,19 +327,20 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
             )
             full_facts = dict()
 
-            try:
-                inspect = client.inspect_container(id)
-            except APIError as exc:
-                raise AnsibleError("Error inspecting container %s - %s" % (name, str(exc)))
-
-            state = inspect.get('State') or dict()
-            config = inspect.get('Config') or dict()
-            labels = config.get('Labels') or dict()
-
-            running = state.get('Running')
+            if inspect is not None:
+                details = inspect
+                state = inspect.get('State') or dict()
+                config = inspect.get('Config') or dict()
+                labels = config.get('Labels') or dict()
+                running = state.get('Running')
+                image_name = config.get('Image')
+            else:
+                details = container
+                labels = container.get('Labels') or dict()
+                running = container.get('State') == 'running'
+                image_name = container.get('Image')
 
             # Add container to groups
-            image_name = config.get('Image')
             if image_name and add_legacy_groups:
                 self.inventory.add_group('image_{0}'.format(image_name))
                 self.inventory.add_host(name, group='image_{0}'.format(image_name))
@@ -257,11 +361,8 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
 
             if connection_type == 'ssh':
                 # Figure out ssh IP and Port
-                try:
-                    # Lookup the public facing port Nat'ed to ssh port.
-                    port = client.port(container, ssh_port)[0]
-                except (IndexError, AttributeError, TypeError):
-                    port = dict()
+                # Lookup the public facing port Nat'ed to ssh port.
+                port = self._get_ssh_port(inspect, container, ssh_port)
 
                 try:
                     ip = default_ip if port['HostIp'] == '0.0.0.0' else port['HostIp']
@@ -285,7 +386,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
                 facts.update(extra_facts)
 
             full_facts.update(facts)
-            for key, value in inspect.items():
+            for key, value in details.items():
                 fact_key = self._slugify(key)
                 full_facts[fact_key] = value
 
@@ -321,6 +422,8 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
                 else:
                     self.inventory.add_host(name, group='stopped')
 
+        return new_inspections
+
     def verify_file(self, path):
         """Return the possibly of a file being consumable by this plugin."""
         return (
@@ -333,9 +436,19 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
     def parse(self, inventory, loader, path, cache=True):
         super(InventoryModule, self).parse(inventory, loader, path, cache)
         self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        user_cache_setting = self.get_option('cache')
+        cached_inspections = None
+        if user_cache_setting and cache:
+            try:
+                cached_inspections = self._cache[cache_key]
+            except KeyError:
+                pass
+
         client = self._create_client()
         try:
-            self._populate(client)
+            inspections = self._populate(client, cached_inspections)
         except DockerException as e:
             raise AnsibleError(
                 'An unexpected docker error occurred: {0}'.format(e)
@@ -344,3 +457,6 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
             raise AnsibleError(
                 'An unexpected requests error occurred when docker-py tried to talk to the docker daemon: {0}'.format(e)
             )
+
+        if user_cache_setting:
+            self._cache[cache_key] = inspections
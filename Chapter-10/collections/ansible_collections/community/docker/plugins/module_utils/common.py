@@ -270,6 +270,7 @@ class AnsibleDockerClientBase(Client):
         NEEDS_DOCKER_PY2 = (LooseVersion(min_docker_version) >= LooseVersion('2.0.0'))
 
         self.docker_py_version = LooseVersion(docker_version)
+        self._lookup_index = None
 
         if HAS_DOCKER_MODELS and HAS_DOCKER_SSLADAPTER:
             self.fail("Cannot have both the docker-py and docker python modules (old and new version of Docker "
@@ -429,6 +430,28 @@ class AnsibleDockerClientBase(Client):
         except Exception as exc:
             self.fail("Error inspecting container: %s" % exc)
 
+    def enable_lookup_index(self):
+        '''
+        Keep the container and network lists that get_container() and get_network() fall back to
+        for the rest of the module run, so that several lookups share a single list call.
+
+        The lists are not refreshed: an entry for a container or network removed in the meantime
+        resolves to None, and ones created in the meantime are still found by inspecting them.
+        '''
+        if self._lookup_index is None:
+            self._lookup_index = dict()
+
+    def clear_lookup_index(self):
+        if self._lookup_index is not None:
+            self._lookup_index.clear()
+
+    def _lookup_list(self, kind, list_function):
+        if self._lookup_index is None:
+            return list_function()
+        if kind not in self._lookup_index:
+            self._lookup_index[kind] = list_function()
+        return self._lookup_index[kind]
+
     def get_container(self, name=None):
         '''
         Lookup a container and return the inspection results.
@@ -440,9 +463,27 @@ class AnsibleDockerClientBase(Client):
         if not name.startswith('/'):
             search_name = '/' + name
 
+        # The daemon resolves IDs, names and unique ID prefixes itself. Only ambiguous ID prefixes
+        # and link aliases (names containing a slash) need the container list.
+        inspect_name = search_name[1:]
+        if inspect_name and '/' not in inspect_name:
+            try:
+                self.log("Inspecting container %s" % inspect_name)
+                result = self.inspect_container(container=inspect_name)
+                self.log("Completed container inspection")
+                return result
+            except NotFound as dummy:
+                return None
+            except SSLError as exc:
+                self._handle_ssl_error(exc)
+            except APIError as exc:
+                self.log("Cannot inspect container %s directly: %s" % (inspect_name, exc))
+            except Exception as exc:
+                self.fail("Error inspecting container: %s" % exc)
+
         result = None
         try:
-            for container in self.containers(all=True):
+            for container in self._lookup_list('containers', lambda: self.containers(all=True)):
                 self.log("testing container: %s" % (container['Names']))
                 if isinstance(container['Names'], list) and search_name in container['Names']:
                     result = container
@@ -473,8 +514,24 @@ class AnsibleDockerClientBase(Client):
         result = None
 
         if network_id is None:
+            # As for containers, the network list is only needed when the daemon reports the name
+            # or ID prefix as ambiguous.
+            try:
+                self.log("Inspecting network %s" % name)
+                result = self.inspect_network(name)
+                self.log("Completed network inspection")
+                return result
+            except NotFound as dummy:
+                return None
+            except SSLError as exc:
+                self._handle_ssl_error(exc)
+            except APIError as exc:
+                self.log("Cannot inspect network %s directly: %s" % (name, exc))
+            except Exception as exc:
+                self.fail("Error inspecting network: %s" % exc)
+
             try:
-                for network in self.networks():
+                for network in self._lookup_list('networks', self.networks):
                     self.log("testing network: %s" % (network['Name']))
                     if name == network['Name']:
                         result = network
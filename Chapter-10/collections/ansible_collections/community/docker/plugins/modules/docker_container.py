@@ -3652,6 +3652,10 @@ def main():
         # (assuming no explicit value is specified for network_mode)
         client.module.params['network_mode'] = client.module.params['networks'][0]['name']
 
+    # The container is looked up several times during a run; share one container list between
+    # the lookups that cannot be answered by inspecting the container directly
+    client.enable_lookup_index()
+
     try:
         cm = ContainerManager(client)
         client.module.exit_json(**sanitize_result(cm.results))
@@ -0,0 +1,181 @@
+# Copyright (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import os
+import tarfile
+import tracemalloc
+
+import pytest
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader
+
+from ansible_collections.community.docker.plugins.connection.docker_api import (
+    _ChunkStreamReader,
+    _regular_file_tar_generator,
+)
+
+
+class FakeClient(object):
+    '''Docker client consuming and producing archives the way a daemon does, chunk by chunk.'''
+
+    def __init__(self, archive_path=None, chunk_size=1000):
+        self.archive_path = archive_path
+        self.chunk_size = chunk_size
+        self.received = None
+        self.max_chunk = 0
+        self.closed = False
+
+    def put_archive(self, container, path, data):
+        self.received = (container, path, tarfile.open(fileobj=_ChunkStreamReader(self._measure(data)), mode='r|'))
+        return True
+
+    def _measure(self, data):
+        for chunk in data:
+            self.max_chunk = max(self.max_chunk, len(chunk))
+            yield chunk
+
+    def get_archive(self, container, path):
+        def stream():
+            try:
+                with open(self.archive_path, 'rb') as f:
+                    while True:
+                        chunk = f.read(self.chunk_size)
+                        if not chunk:
+                            return
+                        yield chunk
+            finally:
+                self.closed = True
+
+        return stream(), {}
+
+
+@pytest.fixture
+def connection():
+    conn = connection_loader.get('community.docker.docker_api', PlayContext(), None)
+    conn.set_option('remote_addr', 'container')
+    conn.ids[None] = (1000, 1001)
+    conn._connected = True
+    return conn
+
+
+def write_file(path, size):
+    with open(path, 'wb') as f:
+        block = bytes(bytearray(range(256))) * 256
+        while size > 0:
+            f.write(block[:size])
+            size -= len(block)
+
+
+def test_tar_generator(tmp_path):
+    path = str(tmp_path / 'file')
+    write_file(path, 100000)
+    os.chmod(path, 0o755)
+
+    chunks = list(_regular_file_tar_generator(path.encode(), os.stat(path), 'out', 1000, 1001, user_name='me', chunk_size=4096))
+    assert max(len(chunk) for chunk in chunks) == 4096
+    data = b''.join(chunks)
+    assert len(data) % tarfile.RECORDSIZE == 0
+
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:') as tar:
+        members = tar.getmembers()
+        assert [m.name for m in members] == ['out']
+        assert (members[0].uid, members[0].gid, members[0].uname, members[0].mode) == (1000, 1001, 'me', 0o700)
+        with open(path, 'rb') as f:
+            assert tar.extractfile(members[0]).read() == f.read()
+
+
+def test_tar_generator_truncated_file(tmp_path):
+    path = str(tmp_path / 'file')
+    write_file(path, 10000)
+    file_stat = os.stat(path)
+    write_file(path, 5000)
+
+    with pytest.raises(AnsibleConnectionFailure, match='truncated'):
+        list(_regular_file_tar_generator(path.encode(), file_stat, 'out', 0, 0))
+
+
+def test_put_file(connection, tmp_path):
+    path = str(tmp_path / 'file')
+    write_file(path, 300000)
+    connection.client = FakeClient()
+
+    connection.put_file(path, '/tmp/dest')
+
+    container, out_dir, tar = connection.client.received
+    assert (container, out_dir) == ('container', '/tmp')
+    member = tar.next()
+    assert member.name == 'dest'
+    with open(path, 'rb') as f:
+        assert tar.extractfile(member).read() == f.read()
+    assert tar.next() is None
+
+
+@pytest.mark.parametrize('chunk_size', [1, 511, 10240, 1 << 20])
+def test_fetch_file(connection, tmp_path, chunk_size):
+    path = str(tmp_path / 'file')
+    write_file(path, 123456)
+    archive = str(tmp_path / 'archive.tar')
+    with tarfile.open(archive, mode='w') as tar:
+        tar.add(path, arcname='file')
+    connection.client = FakeClient(archive, chunk_size=chunk_size)
+
+    dest = str(tmp_path / 'dest')
+    connection.fetch_file('/tmp/file', dest)
+
+    with open(path, 'rb') as f, open(dest, 'rb') as g:
+        assert f.read() == g.read()
+    assert connection.client.closed
+
+
+def test_fetch_file_rejects_multiple_files(connection, tmp_path):
+    path = str(tmp_path / 'file')
+    write_file(path, 1000)
+    archive = str(tmp_path / 'archive.tar')
+    with tarfile.open(archive, mode='w') as tar:
+        tar.add(path, arcname='file')
+        tar.add(path, arcname='other')
+    connection.client = FakeClient(archive)
+
+    with pytest.raises(AnsibleConnectionFailure, match='more than one file'):
+        connection.fetch_file('/tmp/file', str(tmp_path / 'dest'))
+    assert connection.client.closed
+
+
+def test_transfers_use_bounded_memory(connection, tmp_path):
+    size = 32 * 1024 * 1024
+    path = str(tmp_path / 'file')
+    write_file(path, size)
+    connection.client = FakeClient(chunk_size=64 * 1024)
+
+    def consume_put_archive(container, out_dir, data):
+        for chunk in data:
+            connection.client.max_chunk = max(connection.client.max_chunk, len(chunk))
+        return True
+
+    connection.client.put_archive = consume_put_archive
+    tracemalloc.start()
+    try:
+        connection.put_file(path, '/tmp/dest')
+        put_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert put_peak < 4 * 1024 * 1024
+
+    archive = str(tmp_path / 'archive.tar')
+    with tarfile.open(archive, mode='w') as tar:
+        tar.add(path, arcname='file')
+    connection.client.archive_path = archive
+    tracemalloc.start()
+    try:
+        connection.fetch_file('/tmp/file', str(tmp_path / 'dest'))
+        fetch_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert fetch_peak < 4 * 1024 * 1024
+    assert os.path.getsize(str(tmp_path / 'dest')) == size
@@ -226,3 +226,132 @@ def test_populate_stack(inventory, mocker):
     assert len(inventory.inventory.groups['unix://var/run/docker.sock'].hosts) == 1
     assert len(inventory.inventory.groups) == 10
     assert len(inventory.inventory.hosts) == 1
+
+
+class CountingClient(FakeClient):
+    def __init__(self, *hosts):
+        super(CountingClient, self).__init__(*hosts)
+        self.inspected = []
+
+    def inspect_container(self, id):
+        self.inspected.append(id)
+        return super(CountingClient, self).inspect_container(id)
+
+
+def make_host(index):
+    return {
+        'Id': '{0:064x}'.format(index),
+        'Name': '/container_{0}'.format(index),
+        'Image': 'sha256:349f492ff18add678364a62a67ce9a13487f14293ae0af1baf02398aa432f385',
+        'State': {
+            'Running': index % 2 == 0,
+        },
+        'Config': {
+            'Image': 'image_{0}'.format(index % 3),
+        },
+    }
+
+
+def new_inventory(mocker, options):
+    inventory = InventoryModule()
+    inventory.inventory = InventoryData()
+    inventory.get_option = mocker.MagicMock(side_effect=create_get_option(dict({
+        'compose': {},
+        'groups': {},
+        'keyed_groups': {},
+        'docker_host': 'unix://var/run/docker.sock',
+    }, **options)))
+    return inventory
+
+
+def test_populate_concurrent_inspection(mocker):
+    hosts = [make_host(index) for index in range(20)]
+    client = CountingClient(*hosts)
+    inventory = new_inventory(mocker, {
+        'verbose_output': True,
+        'connection_type': 'docker-api',
+        'add_legacy_groups': True,
+        'inspect_workers': 4,
+    })
+    inventory._populate(client)
+
+    assert sorted(client.inspected) == sorted(host['Id'] for host in hosts)
+    for host in hosts:
+        host_vars = inventory.inventory.get_host(host['Name'][1:]).get_vars()
+        assert host_vars['docker_id'] == host['Id']
+        assert host_vars['docker_config'] == host['Config']
+    assert len(inventory.inventory.groups['running'].hosts) == 10
+    assert len(inventory.inventory.groups['image_image_2'].hosts) == 6
+
+
+def test_populate_reuses_cached_inspections(mocker):
+    client = CountingClient(make_host(1), make_host(2))
+    options = {
+        'verbose_output': True,
+        'connection_type': 'docker-api',
+        'inspect_workers': 1,
+    }
+    cached = new_inventory(mocker, options)._populate(client)
+    assert len(client.inspected) == 2
+    assert len(cached) == 2
+
+    client.inspected = []
+    client.list_reply[1]['Status'] = 'Up 2 hours (healthy)'
+    cached = new_inventory(mocker, options)._populate(client, cached)
+    assert client.inspected == [make_host(2)['Id']]
+
+    client.inspected = []
+    client.list_reply[1]['Status'] = 'Up 3 hours (healthy)'
+    inventory = new_inventory(mocker, options)
+    assert inventory._populate(client, cached) == cached
+    assert client.inspected == []
+    assert inventory.inventory.get_host('container_2').get_vars()['docker_state'] == {'Running': True}
+
+    client.list_reply[1]['Status'] = 'Up 3 hours (unhealthy)'
+    cached = new_inventory(mocker, options)._populate(client, cached)
+    assert client.inspected == [make_host(2)['Id']]
+
+    client.inspected = []
+    client.list_reply[1]['Image'] = 'other'
+    inventory = new_inventory(mocker, options)
+    cached = inventory._populate(client, cached)
+    assert client.inspected == [make_host(2)['Id']]
+    assert len(cached) == 2
+
+    client.inspected = []
+    inventory = new_inventory(mocker, dict(options, docker_host='tcp://other:2375'))
+    inventory._populate(client, cached)
+    assert len(client.inspected) == 2
+
+
+def test_populate_skip_inspect(mocker):
+    client = CountingClient(LOVING_THARP_STACK)
+    client.list_reply[0].update({
+        'State': 'running',
+        'Labels': {'com.docker.stack.namespace': 'my_stack'},
+        'Ports': [
+            {'PrivatePort': 22, 'Type': 'udp', 'IP': '10.0.0.1', 'PublicPort': 1022},
+            {'PrivatePort': 22, 'Type': 'tcp', 'IP': '0.0.0.0', 'PublicPort': 32802},
+            {'PrivatePort': 80, 'Type': 'tcp'},
+        ],
+    })
+    inventory = new_inventory(mocker, {
+        'verbose_output': True,
+        'connection_type': 'ssh',
+        'add_legacy_groups': True,
+        'skip_inspect': True,
+        'default_ip': '127.0.0.1',
+        'private_ssh_port': 22,
+    })
+    assert inventory._populate(client) == {}
+    assert client.inspected == []
+
+    host_vars = inventory.inventory.get_host('loving_tharp').get_vars()
+    assert host_vars['ansible_ssh_host'] == '127.0.0.1'
+    assert host_vars['ansible_ssh_port'] == '32802'
+    assert host_vars['docker_state'] == 'running'
+    assert host_vars['docker_stack'] == 'my_stack'
+    assert 'docker_config' not in host_vars
+    assert len(inventory.inventory.groups['stack_my_stack'].hosts) == 1
+    assert len(inventory.inventory.groups['running'].hosts) == 1
+    assert len(inventory.inventory.groups['image_quay.io/ansible/ubuntu1804-test-container:1.21.0'].hosts) == 1
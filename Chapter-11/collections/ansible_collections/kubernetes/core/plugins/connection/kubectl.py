@@ -169,15 +169,51 @@ DOCUMENTATION = r"""
         env:
           - name: K8S_AUTH_VERIFY_SSL
         aliases: [ kubectl_verify_ssl ]
+      kubectl_persistent:
+        description:
+          - Run the commands through a C(kubectl exec) session with a shell in the container, kept open between
+            tasks, instead of starting C(kubectl exec) for each command. This is similar to the ssh ControlPersist.
+          - The session is held by a background process listening on a socket in C(~/.ansible/cp). It is closed
+            after I(kubectl_persistent_timeout) seconds without commands, or when the connection is reset.
+          - Works best with pipelining enabled, files are still transferred with their own C(kubectl exec).
+        type: bool
+        default: False
+        version_added: 2.4.0
+        vars:
+          - name: ansible_kubectl_persistent
+        env:
+          - name: K8S_AUTH_PERSISTENT
+      kubectl_persistent_timeout:
+        description:
+          - The number of seconds a persistent session stays open without commands.
+        type: int
+        default: 60
+        version_added: 2.4.0
+        vars:
+          - name: ansible_kubectl_persistent_timeout
+        env:
+          - name: K8S_AUTH_PERSISTENT_TIMEOUT
 """
 
 import distutils.spawn
+import errno
+import hashlib
 import os
 import os.path
+import select
+import socket
+import struct
 import subprocess
+import sys
+import time
+import uuid
 
 from ansible.parsing.yaml.loader import AnsibleLoader
-from ansible.errors import AnsibleError, AnsibleFileNotFound
+from ansible.errors import (
+    AnsibleConnectionFailure,
+    AnsibleError,
+    AnsibleFileNotFound,
+)
 from ansible.module_utils.six.moves import shlex_quote
 from ansible.module_utils._text import to_bytes
 from ansible.plugins.connection import ConnectionBase, BUFSIZE
@@ -203,6 +239,138 @@ CONNECTION_OPTIONS = {
     "kubectl_token": "--token",
 }
 
+# Directory of the sockets of the persistent sessions, like the ssh ControlPath
+CONTROL_PATH_DIR = "~/.ansible/cp"
+# Seconds to wait for a new persistent session to accept commands
+SESSION_START_TIMEOUT = 10
+
+# A command sent to a persistent session: the lengths of its end marker and
+# script, an empty marker stops the session
+COMMAND_HEADER = struct.Struct("!II")
+# Its result: whether the session is still alive, the return code and the
+# lengths of stdout and stderr
+RESULT_HEADER = struct.Struct("!?iII")
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), BUFSIZE))
+        if not chunk:
+            raise EOFError("connection closed")
+        data += chunk
+    return bytes(data)
+
+
+def _read_command_output(process, marker):
+    """Read the output of a command run by the shell process up to the marker
+    printed after it, on stdout and stderr.
+
+    Returns the return code printed with the marker, stdout and stderr. The
+    return code is None when the shell ended first.
+    """
+    stdout_fd = process.stdout.fileno()
+    stderr_fd = process.stderr.fileno()
+    output = {stdout_fd: b"", stderr_fd: b""}
+    end = b"\n" + marker
+    done = {}
+    while len(done) < 2:
+        ready, dummy, dummy = select.select(
+            [fd for fd in output if fd not in done], [], []
+        )
+        for fd in ready:
+            chunk = os.read(fd, BUFSIZE)
+            if not chunk:
+                return None, output[stdout_fd], output[stderr_fd]
+            output[fd] += chunk
+            start = max(0, len(output[fd]) - len(chunk) - len(end) - 16)
+            index = output[fd].find(end, start)
+            if index != -1 and output[fd].endswith(b"\n"):
+                trailer = index + len(end)
+                done[fd] = output[fd][trailer:]
+                output[fd] = output[fd][:index]
+    return int(done[stdout_fd].strip()), output[stdout_fd], output[stderr_fd]
+
+
+def _run_command(process, conn):
+    """Run the command sent to conn by the shell process.
+
+    Returns whether the session is still alive and the result to send back,
+    None when there is nothing to send.
+    """
+    try:
+        marker_size, script_size = COMMAND_HEADER.unpack(
+            _recv_exactly(conn, COMMAND_HEADER.size)
+        )
+        marker = _recv_exactly(conn, marker_size)
+        script = _recv_exactly(conn, script_size)
+    except (EOFError, OSError):
+        # The connection went away before sending a command
+        return True, None
+    if not marker:
+        return False, b""
+
+    try:
+        process.stdin.write(script)
+        process.stdin.flush()
+        returncode, stdout, stderr = _read_command_output(process, marker)
+    except (IOError, OSError) as e:
+        returncode, stdout, stderr = None, b"", to_bytes(e)
+    alive = returncode is not None
+    result = RESULT_HEADER.pack(alive, returncode or 0, len(stdout), len(stderr))
+    return alive, result + stdout + stderr
+
+
+def serve_session(path, timeout, local_cmd):
+    """Run the kubectl exec shell local_cmd and the commands sent to the unix
+    socket path, one at a time, until none was sent for timeout seconds."""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listener.bind(path)
+    except (IOError, OSError):
+        # Another process holds the session
+        listener.close()
+        return
+    listener.listen(16)
+    listener.settimeout(timeout)
+    process = subprocess.Popen(
+        local_cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        while True:
+            try:
+                conn, dummy = listener.accept()
+            except socket.timeout:
+                break
+            conn.settimeout(None)
+            try:
+                alive, result = _run_command(process, conn)
+                if not alive:
+                    # The next command starts a new session from now on
+                    os.unlink(path)
+                if result is not None:
+                    conn.sendall(result)
+            except (IOError, OSError):
+                pass
+            finally:
+                conn.close()
+            if not alive:
+                break
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+        listener.close()
+        if process.poll() is None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+            except (IOError, OSError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
+
 
 class Connection(ConnectionBase):
     """ Local kubectl based connections """
@@ -299,6 +467,9 @@ class Connection(ConnectionBase):
         """ Run a command in the container """
         super(Connection, self).exec_command(cmd, in_data=in_data, sudoable=sudoable)
 
+        if self.get_option("{0}_persistent".format(self.transport)):
+            return self._exec_persistent(cmd, in_data)
+
         local_cmd, censored_local_cmd = self._build_exec_cmd(
             [self._play_context.executable, "-c", cmd]
         )
@@ -318,6 +489,129 @@ class Connection(ConnectionBase):
         stdout, stderr = p.communicate(in_data)
         return (p.returncode, stdout, stderr)
 
+    def _session_path(self, local_cmd):
+        digest = hashlib.sha1(
+            to_bytes("\0".join(local_cmd), errors="surrogate_or_strict")
+        ).hexdigest()
+        return os.path.join(
+            os.path.expanduser(CONTROL_PATH_DIR),
+            "{0}-{1}".format(self.transport, digest[:20]),
+        )
+
+    def _connect_session(self, start=True):
+        """Connect to the persistent session of the container, started first
+        when there is none and start is true."""
+        local_cmd, censored_local_cmd = self._build_exec_cmd(
+            [self._play_context.executable]
+        )
+        path = self._session_path(local_cmd)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+            return sock
+        except (IOError, OSError) as e:
+            if not start:
+                sock.close()
+                return None
+            if e.errno == errno.ECONNREFUSED:
+                # Left behind by a session that did not stop cleanly
+                os.unlink(path)
+
+        display.vvv(
+            "ESTABLISH PERSISTENT SESSION %s" % (censored_local_cmd,),
+            host=self._play_context.remote_addr,
+        )
+        control_dir = os.path.dirname(path)
+        if not os.path.isdir(control_dir):
+            os.makedirs(control_dir, 0o700)
+        subprocess.Popen(
+            [
+                sys.executable,
+                __file__,
+                path,
+                str(self.get_option("{0}_persistent_timeout".format(self.transport))),
+            ]
+            + [to_bytes(i, errors="surrogate_or_strict") for i in local_cmd],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True,
+        )
+        deadline = time.time() + SESSION_START_TIMEOUT
+        while True:
+            try:
+                sock.connect(path)
+                return sock
+            except (IOError, OSError) as e:
+                if time.time() > deadline:
+                    sock.close()
+                    raise AnsibleConnectionFailure(
+                        "failed to start the {0} session: {1}".format(self.transport, e)
+                    )
+                time.sleep(0.05)
+
+    def _exec_persistent(self, cmd, in_data=None):
+        """Run cmd through the shell of the persistent session.
+
+        The command runs in its own shell, with in_data as a here-document
+        for its stdin. A random marker and the return code are then printed
+        on stdout and stderr, to find the end of its output.
+        """
+        marker = to_bytes("__ANSIBLE_%s__" % uuid.uuid4().hex)
+
+        script = to_bytes(
+            "%s -c %s" % (self._play_context.executable, shlex_quote(cmd)),
+            errors="surrogate_or_strict",
+        )
+        if in_data:
+            in_data = to_bytes(in_data, errors="surrogate_or_strict")
+            if not in_data.endswith(b"\n"):
+                in_data += b"\n"
+            script += b" <<'" + marker + b"'\n" + in_data + marker + b"\n"
+        else:
+            script += b" </dev/null\n"
+        script += b"printf '\\n%s %d\\n' " + marker + b" $?\n"
+        script += b"printf '\\n%s\\n' " + marker + b" >&2\n"
+
+        sock = self._connect_session()
+        display.vvv(
+            "EXEC (persistent) %s" % (cmd,), host=self._play_context.remote_addr
+        )
+        try:
+            sock.sendall(
+                COMMAND_HEADER.pack(len(marker), len(script)) + marker + script
+            )
+            alive, returncode, stdout_size, stderr_size = RESULT_HEADER.unpack(
+                _recv_exactly(sock, RESULT_HEADER.size)
+            )
+            stdout = _recv_exactly(sock, stdout_size)
+            stderr = _recv_exactly(sock, stderr_size)
+        except (EOFError, IOError, OSError) as e:
+            raise AnsibleConnectionFailure(
+                "lost the {0} session: {1}".format(self.transport, e)
+            )
+        finally:
+            sock.close()
+        if not alive:
+            raise AnsibleConnectionFailure(
+                "the {0} session ended unexpectedly: {1}".format(self.transport, stderr)
+            )
+        return (returncode, stdout, stderr)
+
+    def _stop_session(self):
+        sock = self._connect_session(start=False)
+        if sock is None:
+            return
+        try:
+            sock.sendall(COMMAND_HEADER.pack(0, 0))
+            # Wait for the session to stop
+            sock.recv(1)
+        except (IOError, OSError):
+            pass
+        finally:
+            sock.close()
+
     def _prefix_login_path(self, remote_path):
         """Make sure that we put files into a standard path
 
@@ -419,7 +713,18 @@ class Connection(ConnectionBase):
                 to_bytes(out_path, errors="strict"),
             )
 
+    def reset(self):
+        """ Stop the persistent session, the next command starts a new one """
+        if self.get_option("{0}_persistent".format(self.transport)):
+            self._stop_session()
+
     def close(self):
-        """ Terminate the connection. Nothing to do for kubectl"""
+        """ Terminate the connection. Nothing to do for kubectl, a persistent
+        session is kept for the next tasks"""
         super(Connection, self).close()
         self._connected = False
+
+
+if __name__ == "__main__":
+    # The background process of a persistent session
+    serve_session(sys.argv[1], int(sys.argv[2]), sys.argv[3:])
@@ -18,6 +18,11 @@ DOCUMENTATION = """
       - Groups by cluster name, namespace, namespace_services, namespace_pods, and labels.
       - Uses the kubectl connection plugin to access the Kubernetes cluster.
       - Uses k8s.(yml|yaml) YAML configuration file to set parameter values.
+      - When no namespaces are given, Pods and Services are listed once for the whole cluster, in chunks, and
+        split by namespace. The connections are queried concurrently.
+      - When the inventory cache is enabled, the objects are kept in the cache with the resourceVersion they were
+        listed at, and the following runs only read the changes since that version, for up to 2 seconds. The
+        objects are listed again when that version expired.
 
     options:
       plugin:
@@ -85,6 +90,9 @@ DOCUMENTATION = """
                   - List of namespaces. If not specified, will fetch all containers for all namespaces user is authorized
                     to access.
 
+    extends_documentation_fragment:
+      - inventory_cache
+
     requirements:
     - "python >= 3.6"
     - "kubernetes >= 12.0.0"
@@ -112,10 +120,18 @@ plugin: kubernetes.core.k8s
 connections:
   - kubeconfig: /path/to/config
     context: 'awx/192-168-64-4:8443/developer'
+
+# Keep the objects in a cache, only the changes are read on the next runs
+plugin: kubernetes.core.k8s
+cache: true
+cache_plugin: jsonfile
+cache_connection: /tmp/k8s_inventory
 """
 
 import json
 
+from concurrent.futures import ThreadPoolExecutor
+
 from ansible.errors import AnsibleError
 from ansible_collections.kubernetes.core.plugins.module_utils.common import (
     K8sAnsibleMixin,
@@ -126,11 +142,22 @@ from ansible_collections.kubernetes.core.plugins.module_utils.common import (
 from ansible.plugins.inventory import BaseInventoryPlugin, Constructable, Cacheable
 
 try:
+    from kubernetes.client.rest import ApiException
     from kubernetes.dynamic.exceptions import DynamicApiError
+    from kubernetes.dynamic.resource import ResourceInstance
 except ImportError:
     pass
 
 
+# Number of objects read by each list call
+LIST_CHUNK_SIZE = 500
+# Number of list calls in flight at a time
+FETCH_WORKERS = 8
+# Seconds the changes since a cached list are read for, when no bookmark ends
+# the watch before
+CHANGES_TIMEOUT = 2
+
+
 def format_dynamic_api_exc(exc):
     if exc.body:
         if exc.headers and exc.headers.get("Content-Type") == "application/json":
@@ -168,15 +195,18 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable, K8sAnsibleM
                 )
             )
 
-        source_data = None
-        if cache and cache_key in self._cache:
+        self._snapshot = {}
+        use_cache = self.has_option("cache") and self.get_option("cache")
+        if use_cache and cache:
             try:
-                source_data = self._cache[cache_key]
+                self._snapshot = self._cache[cache_key]
             except KeyError:
                 pass
 
-        if not source_data:
-            self.fetch_objects(connections)
+        self.fetch_objects(connections)
+
+        if use_cache:
+            self._cache[cache_key] = self._snapshot
 
     def fetch_objects(self, connections):
 
@@ -184,6 +214,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable, K8sAnsibleM
             if not isinstance(connections, list):
                 raise K8sInventoryException("Expecting connections to be a list.")
 
+            clusters = []
             for connection in connections:
                 if not isinstance(connection, dict):
                     raise K8sInventoryException(
@@ -193,20 +224,211 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable, K8sAnsibleM
                 name = connection.get(
                     "name", self.get_default_host_name(client.configuration.host)
                 )
-                if connection.get("namespaces"):
-                    namespaces = connection["namespaces"]
-                else:
-                    namespaces = self.get_available_namespaces(client)
-                for namespace in namespaces:
-                    self.get_pods_for_namespace(client, name, namespace)
-                    self.get_services_for_namespace(client, name, namespace)
+                clusters.append((name, client, connection.get("namespaces")))
         else:
             client = get_api_client()
             name = self.get_default_host_name(client.configuration.host)
-            namespaces = self.get_available_namespaces(client)
+            clusters = [(name, client, None)]
+
+        for name, client, namespaces, pods, services in self.list_clusters(clusters):
             for namespace in namespaces:
-                self.get_pods_for_namespace(client, name, namespace)
-                self.get_services_for_namespace(client, name, namespace)
+                self.get_pods_for_namespace(
+                    client, name, namespace, pods.get(namespace, [])
+                )
+                self.get_services_for_namespace(
+                    client, name, namespace, services.get(namespace, [])
+                )
+
+    def list_clusters(self, clusters):
+        """
+        List the namespaces, pods and services of (name, client, namespaces) clusters.
+
+        Without namespaces, each kind is listed once for the whole cluster and
+        split by namespace, or per namespace when the user can't list it
+        cluster wide. The lists of all clusters are read concurrently.
+
+        Yields (name, client, namespaces, pods, services) tuples, pods and
+        services being dictionaries of objects by namespace.
+        """
+        snapshot = getattr(self, "_snapshot", {})
+        lists = {}
+
+        def _list(name, client, kind, namespace=None):
+            cache = snapshot.get(name, {})
+            key = "{0}/{1}".format(kind, namespace or "")
+            return name, key, self.list_objects(client, kind, namespace, cache.get(key))
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            futures = []
+            for name, client, namespaces in clusters:
+                for kind in ("Pod", "Service"):
+                    for namespace in namespaces or [None]:
+                        futures.append(
+                            executor.submit(_list, name, client, kind, namespace)
+                        )
+                if not namespaces:
+                    futures.append(executor.submit(_list, name, client, "Namespace"))
+
+            retries = []
+            for future in futures:
+                name, key, objects = future.result()
+                lists.setdefault(name, {})[key] = objects
+            for name, client, namespaces in clusters:
+                if namespaces:
+                    continue
+                namespaces = self._namespace_names(lists[name]["Namespace/"])
+                for kind in ("Pod", "Service"):
+                    if lists[name]["{0}/".format(kind)] is not None:
+                        continue
+                    # Not allowed cluster wide, list every namespace instead
+                    for namespace in namespaces:
+                        retries.append(
+                            executor.submit(_list, name, client, kind, namespace)
+                        )
+            for future in retries:
+                name, key, objects = future.result()
+                lists[name][key] = objects
+
+        self._snapshot = lists
+        for name, client, namespaces in clusters:
+            cluster = lists[name]
+            if not namespaces:
+                namespaces = self._namespace_names(cluster["Namespace/"])
+            by_kind = {}
+            for key, objects in cluster.items():
+                kind = key.split("/")[0]
+                if kind == "Namespace" or objects is None:
+                    continue
+                instances = ResourceInstance(
+                    client,
+                    dict(kind=kind + "List", apiVersion="v1", items=objects["items"]),
+                )
+                for item in instances.items:
+                    by_kind.setdefault(kind, {}).setdefault(
+                        item.metadata.namespace, []
+                    ).append(item)
+            yield (
+                name,
+                client,
+                namespaces,
+                by_kind.get("Pod", {}),
+                by_kind.get("Service", {}),
+            )
+
+    @staticmethod
+    def _namespace_names(objects):
+        return [item["metadata"]["name"] for item in objects["items"]]
+
+    def list_objects(self, client, kind, namespace=None, cached=None):
+        """
+        List the v1 objects of kind in namespace, or in every namespace.
+
+        The objects are read LIST_CHUNK_SIZE at a time. When cached holds a
+        previous list, only the changes since its resourceVersion are read,
+        unless that version expired.
+
+        Returns a dictionary with the resourceVersion of the list and its items
+        as dictionaries, or None when the user can't list the objects of a
+        namespaced kind cluster wide.
+        """
+        resource = client.resources.get(api_version="v1", kind=kind)
+        if cached:
+            objects = self.list_changes(client, resource, namespace, cached)
+            if objects is not None:
+                return objects
+
+        items = []
+        _continue = None
+        try:
+            while True:
+                obj = resource.get(
+                    namespace=namespace, limit=LIST_CHUNK_SIZE, _continue=_continue
+                )
+                items.extend(obj.to_dict()["items"])
+                _continue = getattr(obj.metadata, "continue", None)
+                if not _continue:
+                    break
+        except DynamicApiError as exc:
+            if exc.status == 403 and resource.namespaced and namespace is None:
+                return None
+            self.display.debug(exc)
+            raise K8sInventoryException(
+                "Error fetching %s list: %s" % (kind, format_dynamic_api_exc(exc))
+            )
+        return dict(resourceVersion=obj.metadata.resourceVersion, items=items)
+
+    def list_changes(self, client, resource, namespace, cached):
+        """
+        Apply the changes since a previous list of the objects of resource.
+
+        The apiserver sends the changes since the previous list first, so they
+        are read until the watch ends after CHANGES_TIMEOUT seconds, a bookmark
+        comes, or the current resourceVersion is reached. That version is the
+        latest of the whole cluster, and is usually only reached when nothing
+        changed since it.
+
+        Returns the updated list, or None when the resourceVersion of the
+        previous list expired and the objects have to be listed again.
+        """
+        items = dict(
+            ((item["metadata"].get("namespace"), item["metadata"]["name"]), item)
+            for item in cached["items"]
+        )
+        resource_version = cached["resourceVersion"]
+        try:
+            current = resource.get(
+                namespace=namespace, limit=1
+            ).metadata.resourceVersion
+            if current == resource_version:
+                return cached
+            params = dict(
+                namespace=namespace,
+                resource_version=resource_version,
+                timeout=CHANGES_TIMEOUT,
+            )
+            try:
+                events = client.watch(resource, allow_watch_bookmarks=True, **params)
+            except TypeError:
+                # The kubernetes client is too old to request bookmarks
+                events = client.watch(resource, **params)
+        except (ApiException, DynamicApiError) as exc:
+            self.display.debug(exc)
+            return None
+
+        try:
+            for event in events:
+                obj = event["raw_object"]
+                if event["type"] == "ERROR":
+                    return None
+                resource_version = obj["metadata"]["resourceVersion"]
+                if event["type"] != "BOOKMARK":
+                    key = (obj["metadata"].get("namespace"), obj["metadata"]["name"])
+                    if event["type"] == "DELETED":
+                        items.pop(key, None)
+                    else:
+                        items[key] = obj
+                if event["type"] == "BOOKMARK" or self._version_reached(
+                    resource_version, current
+                ):
+                    break
+            else:
+                # All the changes up to the start of the watch were read
+                if self._version_reached(current, resource_version):
+                    resource_version = current
+        except (ApiException, DynamicApiError) as exc:
+            self.display.debug(exc)
+            return None
+        finally:
+            events.close()
+        return dict(resourceVersion=resource_version, items=list(items.values()))
+
+    @staticmethod
+    def _version_reached(resource_version, current):
+        # resourceVersions are opaque, but increasing integers with the etcd storage
+        try:
+            return int(resource_version) >= int(current)
+        except (TypeError, ValueError):
+            return resource_version == current
 
     @staticmethod
     def get_default_host_name(host):
@@ -228,15 +450,16 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable, K8sAnsibleM
             )
         return [namespace.metadata.name for namespace in obj.items]
 
-    def get_pods_for_namespace(self, client, name, namespace):
-        v1_pod = client.resources.get(api_version="v1", kind="Pod")
-        try:
-            obj = v1_pod.get(namespace=namespace)
-        except DynamicApiError as exc:
-            self.display.debug(exc)
-            raise K8sInventoryException(
-                "Error fetching Pod list: %s" % format_dynamic_api_exc(exc)
-            )
+    def get_pods_for_namespace(self, client, name, namespace, pods=None):
+        if pods is None:
+            v1_pod = client.resources.get(api_version="v1", kind="Pod")
+            try:
+                pods = v1_pod.get(namespace=namespace).items
+            except DynamicApiError as exc:
+                self.display.debug(exc)
+                raise K8sInventoryException(
+                    "Error fetching Pod list: %s" % format_dynamic_api_exc(exc)
+                )
 
         namespace_group = "namespace_{0}".format(namespace)
         namespace_pods_group = "{0}_pods".format(namespace_group)
@@ -247,7 +470,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable, K8sAnsibleM
         self.inventory.add_group(namespace_pods_group)
         self.inventory.add_child(namespace_group, namespace_pods_group)
 
-        for pod in obj.items:
+        for pod in pods:
             pod_name = pod.metadata.name
             pod_groups = []
             pod_annotations = (
@@ -345,15 +568,16 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable, K8sAnsibleM
                     namespace,
                 )
 
-    def get_services_for_namespace(self, client, name, namespace):
-        v1_service = client.resources.get(api_version="v1", kind="Service")
-        try:
-            obj = v1_service.get(namespace=namespace)
-        except DynamicApiError as exc:
-            self.display.debug(exc)
-            raise K8sInventoryException(
-                "Error fetching Service list: %s" % format_dynamic_api_exc(exc)
-            )
+    def get_services_for_namespace(self, client, name, namespace, services=None):
+        if services is None:
+            v1_service = client.resources.get(api_version="v1", kind="Service")
+            try:
+                services = v1_service.get(namespace=namespace).items
+            except DynamicApiError as exc:
+                self.display.debug(exc)
+                raise K8sInventoryException(
+                    "Error fetching Service list: %s" % format_dynamic_api_exc(exc)
+                )
 
         namespace_group = "namespace_{0}".format(namespace)
         namespace_services_group = "{0}_services".format(namespace_group)
@@ -364,7 +588,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable, K8sAnsibleM
         self.inventory.add_group(namespace_services_group)
         self.inventory.add_child(namespace_group, namespace_services_group)
 
-        for service in obj.items:
+        for service in services:
             service_name = service.metadata.name
             service_labels = (
                 {} if not service.metadata.labels else dict(service.metadata.labels)
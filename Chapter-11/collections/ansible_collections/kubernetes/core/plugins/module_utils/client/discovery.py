@@ -16,14 +16,24 @@
 import json
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import hashlib
 import tempfile
 from functools import partial
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 import kubernetes.dynamic
 import kubernetes.dynamic.discovery
 from kubernetes import __version__
+from kubernetes.dynamic.discovery import CacheEncoder, ResourceGroup
 from kubernetes.dynamic.exceptions import (
+    DynamicApiError,
+    NotFoundError,
     ResourceNotFoundError,
     ResourceNotUniqueError,
     ServiceUnavailableError,
@@ -33,10 +43,39 @@ from ansible_collections.kubernetes.core.plugins.module_utils.client.resource im
     ResourceList,
 )
 
+DISCOVERY_PREFIX = "apis"
+
+# Servers supporting aggregated discovery (Kubernetes 1.26+) return the resources of
+# every group version in a single document, the others fall back to application/json.
+AGGREGATED_DISCOVERY_ACCEPT = ",".join(
+    [
+        "application/json;g=apidiscovery.k8s.io;v=v2;as=APIGroupDiscoveryList",
+        "application/json;g=apidiscovery.k8s.io;v=v2beta1;as=APIGroupDiscoveryList",
+        "application/json",
+    ]
+)
+
+# Maximum number of group versions requested at the same time
+DISCOVERY_WORKERS = 8
+
+
+def group_version_path(prefix, group, version):
+    return "/".join(filter(None, [prefix, group, version]))
+
 
 class Discoverer(kubernetes.dynamic.discovery.Discoverer):
+    """Discoverer storing each group version in the cache file on its own.
+
+    When a search misses, the cached group versions are not thrown away but
+    revalidated with the ETag the server returned for them, so that only the
+    group versions which changed are downloaded again. The cache file is updated
+    under a lock and merged with the entries written by other processes.
+    """
+
     def __init__(self, client, cache_file):
         self.client = client
+        self.__stale = set()
+        self.__refreshed = set()
         default_cache_file_name = "k8srcp-{0}.json".format(
             hashlib.sha256(self.__get_default_cache_id()).hexdigest()
         )
@@ -78,35 +117,330 @@ class Discoverer(kubernetes.dynamic.discovery.Discoverer):
         return None
 
     def __init_cache(self, refresh=False):
-        if refresh or not os.path.exists(self.__cache_file):
-            self._cache = {"library_version": __version__}
-            refresh = True
+        if refresh:
+            # Keep what was discovered so far, the group list and the group versions
+            # are revalidated before being used again.
+            self.__stale = set(self.__group_versions(self._cache.get("resources")))
+            # The List resource of default_groups() is not served by the cluster
+            self.__stale.discard((DISCOVERY_PREFIX, "", "v1"))
+            self.__stale.add(DISCOVERY_PREFIX)
+            self._cache.pop("version", None)
         else:
-            try:
-                with open(self.__cache_file, "r") as f:
-                    self._cache = json.load(f, cls=partial(CacheDecoder, self.client))
-                if self._cache.get("library_version") != __version__:
-                    # Version mismatch, need to refresh cache
-                    self.invalidate_cache()
-            except Exception:
-                self.invalidate_cache()
+            self._cache = self.__read_cache() or {"library_version": __version__}
         self._load_server_info()
         self.discover()
-        if refresh:
-            self._write_cache()
+
+    def __read_cache(self):
+        try:
+            with open(self.__cache_file, "r") as f:
+                cache = json.load(f, cls=partial(CacheDecoder, self.client))
+        except Exception:
+            return None
+        if cache.get("library_version") != __version__:
+            # Version mismatch, need to refresh cache
+            return None
+        return cache
+
+    @contextmanager
+    def __lock(self):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.__cache_file + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _write_cache(self):
+        try:
+            with self.__lock():
+                cache = self.__merge_cache(self.__read_cache())
+                fd, tmp = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(self.__cache_file)),
+                    prefix=".k8srcp-",
+                )
+                try:
+                    with os.fdopen(fd, "w") as f:
+                        json.dump(cache, f, cls=CacheEncoder)
+                    os.rename(tmp, self.__cache_file)
+                except Exception:
+                    os.remove(tmp)
+                    raise
+        except Exception:
+            # Failing to write the cache isn't a big enough error to crash on
+            pass
+
+    def __merge_cache(self, cache):
+        """Merge the group versions discovered by this process into the cache of the file.
+
+        Group versions not requested yet by this process are taken from the file, so that
+        processes using the same cache file complete it instead of overwriting each other.
+        """
+        if not cache:
+            return self._cache
+        merged = dict(self._cache)
+        etags = dict(self._cache.get("etags", {}))
+        resources = {}
+        for prefix, groups in (self._cache.get("resources") or {}).items():
+            cached_groups = cache.get("resources", {}).get(prefix, {})
+            if prefix not in self.__refreshed:
+                # The group list was not requested again, keep the groups added by others
+                resources[prefix] = dict(cached_groups)
+            else:
+                resources[prefix] = {}
+            for group, versions in groups.items():
+                resources[prefix][group] = dict(versions)
+                for version, resource_group in versions.items():
+                    cached = cached_groups.get(group, {}).get(version)
+                    path = group_version_path(prefix, group, version)
+                    if (
+                        isinstance(resource_group, ResourceGroup)
+                        and not resource_group.resources
+                        and isinstance(cached, ResourceGroup)
+                        and cached.resources
+                    ):
+                        resources[prefix][group][version] = cached
+                        if path in cache.get("etags", {}):
+                            etags[path] = cache["etags"][path]
+        merged["resources"] = resources
+        merged["etags"] = etags
+        return merged
+
+    @staticmethod
+    def __group_versions(resources, prefix="*", group="*", version="*"):
+        """Yield the (prefix, group, version) of the resource groups matching a search."""
+        for _prefix, groups in (resources or {}).items():
+            if prefix not in ("*", _prefix) or not isinstance(groups, dict):
+                continue
+            for _group, versions in groups.items():
+                if group not in ("*", _group) or not isinstance(versions, dict):
+                    continue
+                for _version, resource_group in versions.items():
+                    if version in ("*", _version) and isinstance(
+                        resource_group, ResourceGroup
+                    ):
+                        yield _prefix, _group, _version
+
+    def _request_discovery(self, path, etag=None, accept="application/json"):
+        """GET a discovery document, sending the ETag received for it previously.
+
+        Returns the document and its ETag, the document is None when it did not change.
+        """
+        header_params = {"Accept": accept}
+        if etag:
+            header_params["If-None-Match"] = etag
+        try:
+            response = self.client.request(
+                "GET", path, header_params=header_params, serialize=False
+            )
+        except DynamicApiError as e:
+            if e.status == 304:
+                return None, etag
+            raise
+        return json.loads(response.data.decode("utf8")), response.headers.get("ETag")
+
+    def parse_api_groups(self, request_resources=False, update=False):
+        """Discovers all API groups present in the cluster"""
+        if (
+            not self._cache.get("resources")
+            or update
+            or DISCOVERY_PREFIX in self.__stale
+        ):
+            self.__discover_groups()
+        if request_resources:
+            self._fetch_group_versions(self._cache["resources"])
+        return self._cache["resources"]
+
+    def __discover_groups(self):
+        cached = self._cache.get("resources") or {}
+        etags = self._cache.setdefault("etags", {})
+        groups = self.default_groups(request_resources=False)
+
+        document, etag = self._request_discovery(
+            "/" + DISCOVERY_PREFIX,
+            etags.get(DISCOVERY_PREFIX) if cached else None,
+            AGGREGATED_DISCOVERY_ACCEPT,
+        )
+        self.__stale.discard(DISCOVERY_PREFIX)
+        if document is None:
+            # The group list did not change
+            return
+        etags[DISCOVERY_PREFIX] = etag
+        self.__refreshed.add(DISCOVERY_PREFIX)
+
+        core = cached.get("api", {}).get("", {}).get("v1")
+        if core is not None:
+            groups["api"][""]["v1"] = core
+
+        if document.get("kind") == "APIGroupDiscoveryList":
+            groups[DISCOVERY_PREFIX].update(
+                self.__aggregated_groups(DISCOVERY_PREFIX, document)
+            )
+            document, etag = self._request_discovery(
+                "/api", etags.get("api") if core else None, AGGREGATED_DISCOVERY_ACCEPT
+            )
+            if document is not None and document.get("kind") == "APIGroupDiscoveryList":
+                etags["api"] = etag
+                groups["api"] = self.__aggregated_groups("api", document)
+                self.__refreshed.add("api")
+        else:
+            for group in document.get("groups") or []:
+                new_group = {}
+                for version_raw in group["versions"]:
+                    version = version_raw["version"]
+                    resource_group = (
+                        cached.get(DISCOVERY_PREFIX, {})
+                        .get(group["name"], {})
+                        .get(version)
+                    )
+                    preferred = version_raw == group.get("preferredVersion")
+                    resources = resource_group.resources if resource_group else {}
+                    new_group[version] = ResourceGroup(preferred, resources=resources)
+                groups[DISCOVERY_PREFIX][group["name"]] = new_group
+
+        # Forget the ETags of the group versions removed from the cluster
+        for path in list(etags):
+            if path.count("/") and not self.__is_discovered(groups, path):
+                etags.pop(path)
+        self._cache["resources"] = groups
+        self._write_cache()
+
+    @staticmethod
+    def __is_discovered(groups, path):
+        parts = path.split("/")
+        prefix, version = parts[0], parts[-1]
+        group = parts[1] if len(parts) == 3 else ""
+        return group in groups.get(prefix, {}) and version in groups[prefix][group]
+
+    def __aggregated_groups(self, prefix, document):
+        """Convert an APIGroupDiscoveryList into {group: {version: ResourceGroup}}."""
+        groups = {}
+        for item in document.get("items") or []:
+            group = item.get("metadata", {}).get("name", "")
+            versions = {}
+            # The versions of an aggregated document are sorted by preference
+            for index, entry in enumerate(item.get("versions") or []):
+                resources = {}
+                if entry.get("freshness") != "Stale":
+                    resources = self._resources_from_list(
+                        prefix,
+                        group,
+                        entry["version"],
+                        index == 0,
+                        self.__aggregated_resources(entry),
+                    )
+                    self.__stale.discard((prefix, group, entry["version"]))
+                versions[entry["version"]] = ResourceGroup(
+                    index == 0, resources=resources
+                )
+            groups[group] = versions
+        return groups
+
+    @staticmethod
+    def __aggregated_resources(entry):
+        """Convert the resources of an aggregated discovery version to an APIResourceList."""
+        resources = []
+        for resource in entry.get("resources") or []:
+            namespaced = resource.get("scope") == "Namespaced"
+            resources.append(
+                {
+                    "name": resource["resource"],
+                    "singularName": resource.get("singularResource", ""),
+                    "namespaced": namespaced,
+                    "kind": (resource.get("responseKind") or {}).get("kind", ""),
+                    "verbs": resource.get("verbs", []),
+                    "shortNames": resource.get("shortNames", []),
+                    "categories": resource.get("categories", []),
+                }
+            )
+            for subresource in resource.get("subresources") or []:
+                resources.append(
+                    {
+                        "name": "{0}/{1}".format(
+                            resource["resource"], subresource["subresource"]
+                        ),
+                        "namespaced": namespaced,
+                        "kind": (subresource.get("responseKind") or {}).get("kind", ""),
+                        "verbs": subresource.get("verbs", []),
+                    }
+                )
+        return resources
+
+    def _fetch_group_versions(self, resources, prefix="*", group="*", version="*"):
+        """Request the group versions matching a search which are missing or stale, concurrently.
+
+        Returns True when any of the group versions changed.
+        """
+        etags = self._cache.setdefault("etags", {})
+        pending = []
+        for key in self.__group_versions(resources, prefix, group, version):
+            resource_group = resources[key[0]][key[1]][key[2]]
+            if key == (DISCOVERY_PREFIX, "", "v1"):
+                continue
+            if not resource_group.resources or key in self.__stale:
+                pending.append((key, resource_group))
+        if not pending:
+            return False
+
+        def fetch(item):
+            (prefix, group, version), resource_group = item
+            path = group_version_path(prefix, group, version)
+            etag = etags.get(path) if resource_group.resources else None
+            try:
+                document, etag = self._request_discovery("/" + path, etag)
+            except ServiceUnavailableError:
+                document, etag = {}, None
+            except NotFoundError:
+                # Searching this group version raises ResourceNotFoundError
+                return item, None, None
+            return item, document, etag
+
+        changed = False
+        with ThreadPoolExecutor(
+            max_workers=min(DISCOVERY_WORKERS, len(pending))
+        ) as executor:
+            for (key, resource_group), document, etag in executor.map(fetch, pending):
+                self.__stale.discard(key)
+                if document is None:
+                    continue
+                path = group_version_path(*key)
+                resource_group.resources = self._resources_from_list(
+                    key[0],
+                    key[1],
+                    key[2],
+                    resource_group.preferred,
+                    document.get("resources") or [],
+                )
+                if etag:
+                    etags[path] = etag
+                else:
+                    etags.pop(path, None)
+                changed = True
+        return changed
 
     def get_resources_for_api_version(self, prefix, group, version, preferred):
         """ returns a dictionary of resources associated with provided (prefix, group, version)"""
+        path = group_version_path(prefix, group, version)
+        try:
+            document, etag = self._request_discovery("/" + path)
+        except ServiceUnavailableError:
+            document, etag = {}, None
+        if etag:
+            self._cache.setdefault("etags", {})[path] = etag
+        self.__stale.discard((prefix, group, version))
+        return self._resources_from_list(
+            prefix, group, version, preferred, document.get("resources") or []
+        )
 
+    def _resources_from_list(
+        self, prefix, group, version, preferred, resources_response
+    ):
+        """Build the resources of a group version from the resources of its APIResourceList."""
         resources = defaultdict(list)
         subresources = defaultdict(dict)
 
-        path = "/".join(filter(None, [prefix, group, version]))
-        try:
-            resources_response = self.client.request("GET", path).resources or []
-        except ServiceUnavailableError:
-            resources_response = []
-
         resources_raw = list(
             filter(lambda resource: "/" not in resource["name"], resources_response)
         )
@@ -193,7 +527,26 @@ class LazyDiscoverer(Discoverer, kubernetes.dynamic.LazyDiscoverer):
 
     @property
     def update_cache(self):
-        self.__update_cache
+        return self.__update_cache
+
+    def search(self, **kwargs):
+        # Same as kubernetes.dynamic.LazyDiscoverer.search, whose private helpers share
+        # the name mangling of this class, except that the group versions walked by the
+        # search are requested concurrently instead of one after the other.
+        parts = self.__build_search(**kwargs)
+        if self._fetch_group_versions(self.__resources, *parts[:3]):
+            self.__update_cache = True
+        try:
+            results = self.__search(parts, self.__resources, [])
+        except ResourceNotFoundError:
+            results = []
+        if not results:
+            self.invalidate_cache()
+            if self._fetch_group_versions(self.__resources, *parts[:3]):
+                self.__update_cache = True
+            results = self.__search(parts, self.__resources, [])
+        self.__maybe_write_cache()
+        return results
 
 
 class CacheDecoder(json.JSONDecoder):
@@ -20,11 +20,13 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import base64
+import copy
 import time
 import os
 import traceback
 import sys
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from ansible_collections.kubernetes.core.plugins.module_utils.version import (
@@ -475,15 +477,16 @@ class K8sAnsibleMixin(object):
             if not resource_list:
                 resource_list = [result]
 
-            for resource_instance in resource_list:
-                success, res, duration = self.wait(
-                    resource,
-                    resource_instance,
-                    sleep=wait_sleep,
-                    timeout=wait_timeout,
-                    state=state,
-                    condition=condition,
-                )
+            waited = self.wait_all(
+                resource,
+                resource_list,
+                sleep=wait_sleep,
+                timeout=wait_timeout,
+                state=state,
+                condition=condition,
+                label_selectors=label_selectors,
+            )
+            for success, res, duration in waited:
                 if not success:
                     self.fail(
                         msg="Failed to gather information about %s(s) even"
@@ -563,29 +566,169 @@ class K8sAnsibleMixin(object):
         state,
         label_selectors=None,
     ):
+        return self._wait_for_all(
+            resource,
+            [(name, namespace)],
+            predicate,
+            sleep,
+            timeout,
+            state,
+            label_selectors=label_selectors,
+        )[0]
+
+    def _wait_for_all(
+        self,
+        resource,
+        objects,
+        predicate,
+        sleep,
+        timeout,
+        state,
+        label_selectors=None,
+    ):
+        """Wait for the predicate to be true for each of the (name, namespace) of objects.
+
+        The objects of a namespace are listed once, then followed with a single watch
+        resuming from the resourceVersion of the list, instead of being requested again
+        every sleep seconds. The list and the watch only cover the objects matching
+        label_selectors. The objects are polled when the resource cannot be watched
+        or when the watch fails. Returns a (success, result, duration) per object.
+        """
         start = datetime.now()
 
         def _wait_for_elapsed():
             return (datetime.now() - start).seconds
 
-        response = None
-        while _wait_for_elapsed() < timeout:
-            try:
+        results = {}
+        last_seen = {}
+        can_watch = "watch" in (resource.verbs or [])
+
+        def _check(key, instance):
+            if instance is None:
+                done = state == "absent"
+            else:
+                last_seen[key] = instance
+                done = predicate(instance)
+            if done:
+                result = instance.to_dict() if instance else {}
+                results[key] = (True, result, _wait_for_elapsed())
+            return done
+
+        namespaces = []
+        for name, namespace in objects:
+            if namespace not in namespaces:
+                namespaces.append(namespace)
+
+        for namespace in namespaces:
+            pending = set(
+                name
+                for name, _namespace in objects
+                if _namespace == namespace and (name, namespace) not in results
+            )
+            # A single object is requested and watched by name
+            name = next(iter(pending)) if len(pending) == 1 else None
+            while pending and _wait_for_elapsed() < timeout:
                 params = dict(name=name, namespace=namespace)
                 if label_selectors:
                     params["label_selector"] = ",".join(label_selectors)
-                response = resource.get(**params)
-                if predicate(response):
+                try:
+                    response = resource.get(**params)
+                except NotFoundError:
+                    response = None
+                if name:
+                    instances = {name: response} if response else {}
+                elif response:
+                    instances = dict(
+                        (item.metadata.name, item) for item in response.items or []
+                    )
+                else:
+                    instances = {}
+                for item in list(pending):
+                    if _check((item, namespace), instances.get(item)):
+                        pending.discard(item)
+                if not pending:
+                    break
+
+                if can_watch:
+                    resource_version = None
                     if response:
-                        return True, response.to_dict(), _wait_for_elapsed()
-                    return True, {}, _wait_for_elapsed()
+                        resource_version = response.metadata.resourceVersion
+                    try:
+                        can_watch = self._watch_pending(
+                            resource,
+                            name,
+                            namespace,
+                            resource_version,
+                            pending,
+                            _check,
+                            timeout - _wait_for_elapsed(),
+                            label_selectors,
+                        )
+                    except Exception as e:
+                        # Not allowed to watch, or the watch failed, poll instead.
+                        # An expired resourceVersion only requires to list again.
+                        can_watch = getattr(e, "status", None) == 410
+                    if can_watch or not pending:
+                        continue
                 time.sleep(sleep)
-            except NotFoundError:
-                if state == "absent":
-                    return True, {}, _wait_for_elapsed()
-        if response:
-            response = response.to_dict()
-        return False, response, _wait_for_elapsed()
+
+        for name, namespace in objects:
+            if (name, namespace) not in results:
+                instance = last_seen.get((name, namespace))
+                results[(name, namespace)] = (
+                    False,
+                    instance.to_dict() if instance else None,
+                    _wait_for_elapsed(),
+                )
+        return [results[(name, namespace)] for name, namespace in objects]
+
+    def _watch_pending(
+        self,
+        resource,
+        name,
+        namespace,
+        resource_version,
+        pending,
+        check,
+        timeout,
+        label_selectors=None,
+    ):
+        """Follow the events of the pending objects of a namespace until they pass check.
+
+        Returns when every object passed, when the watch ends after timeout seconds, or
+        when the resourceVersion expired and the objects have to be listed again. Returns
+        False when the server sent an error and the objects should be polled instead.
+        """
+        if timeout <= 0:
+            return True
+        params = dict(
+            name=name,
+            namespace=namespace,
+            resource_version=resource_version,
+            timeout=int(timeout) or 1,
+        )
+        if label_selectors:
+            params["label_selector"] = ",".join(label_selectors)
+        events = resource.watch(**params)
+        try:
+            for event in events:
+                if event["type"] == "ERROR":
+                    status = event["raw_object"]
+                    # A 410 means the resourceVersion is too old, list again
+                    return status.get("code") == 410
+                if event["type"] == "BOOKMARK":
+                    continue
+                item = event["object"].metadata.name
+                if item not in pending:
+                    continue
+                instance = event["object"] if event["type"] != "DELETED" else None
+                if check((item, namespace), instance):
+                    pending.discard(item)
+                    if not pending:
+                        break
+        finally:
+            events.close()
+        return True
 
     def wait(
         self,
@@ -597,6 +740,40 @@ class K8sAnsibleMixin(object):
         condition=None,
         label_selectors=None,
     ):
+        predicate = self._wait_predicate(definition["kind"], state, condition)
+        name = definition["metadata"]["name"]
+        namespace = definition["metadata"].get("namespace")
+        return self._wait_for(
+            resource, name, namespace, predicate, sleep, timeout, state, label_selectors
+        )
+
+    def wait_all(
+        self,
+        resource,
+        definitions,
+        sleep,
+        timeout,
+        state="present",
+        condition=None,
+        label_selectors=None,
+    ):
+        """Same as wait for several objects of resource, watched together per namespace."""
+        predicate = self._wait_predicate(resource.kind, state, condition)
+        objects = [
+            (definition["metadata"]["name"], definition["metadata"].get("namespace"))
+            for definition in definitions
+        ]
+        return self._wait_for_all(
+            resource,
+            objects,
+            predicate,
+            sleep,
+            timeout,
+            state,
+            label_selectors=label_selectors,
+        )
+
+    def _wait_predicate(self, kind, state, condition):
         def _deployment_ready(deployment):
             # FIXME: frustratingly bool(deployment.status) is True even if status is empty
             # Furthermore deployment.status.availableReplicas == deployment.status.replicas == None if status is empty
@@ -684,18 +861,9 @@ class K8sAnsibleMixin(object):
             DaemonSet=_daemonset_ready,
             Pod=_pod_ready,
         )
-        kind = definition["kind"]
         if state == "present":
-            predicate = (
-                waiter.get(kind, lambda x: x) if not condition else _custom_condition
-            )
-        else:
-            predicate = _resource_absent
-        name = definition["metadata"]["name"]
-        namespace = definition["metadata"].get("namespace")
-        return self._wait_for(
-            resource, name, namespace, predicate, sleep, timeout, state, label_selectors
-        )
+            return waiter.get(kind, lambda x: x) if not condition else _custom_condition
+        return _resource_absent
 
     def set_resource_definitions(self, module):
         resource_definition = module.params.get("resource_definition")
@@ -782,24 +950,97 @@ class K8sAnsibleMixin(object):
                 resource = self.find_resource(kind, api_version, fail=True)
                 flattened_definitions.append((resource, definition))
 
-        for (resource, definition) in flattened_definitions:
-            kind = definition.get("kind", self.kind)
-            api_version = definition.get("apiVersion", self.api_version)
-            definition = self.set_defaults(resource, definition)
-            self.warnings = []
-            if self.params["validate"] is not None:
-                self.warnings = self.validate(definition)
-            result = self.perform_action(resource, definition)
-            if self.warnings:
-                result["warnings"] = self.warnings
-            changed = changed or result["changed"]
-            results.append(result)
+        workers = self.params.get("workers") or 1
+        if workers > 1 and len(flattened_definitions) > 1:
+            results = self.perform_actions_in_waves(flattened_definitions, workers)
+            changed = any(result["changed"] for result in results)
+        else:
+            for (resource, definition) in flattened_definitions:
+                kind = definition.get("kind", self.kind)
+                api_version = definition.get("apiVersion", self.api_version)
+                definition = self.set_defaults(resource, definition)
+                self.warnings = []
+                if self.params["validate"] is not None:
+                    self.warnings = self.validate(definition)
+                result = self.perform_action(resource, definition)
+                if self.warnings:
+                    result["warnings"] = self.warnings
+                changed = changed or result["changed"]
+                results.append(result)
 
         if len(results) == 1:
             self.exit_json(**results[0])
 
         self.exit_json(**{"changed": changed, "result": {"results": results}})
 
+    def perform_actions_in_waves(self, flattened_definitions, workers):
+        """
+        Apply the definitions with up to workers objects in flight at a time.
+
+        The objects are grouped into waves by apply_waves(), every wave is done
+        before the next one starts and no other wave starts once an object
+        failed. Results are returned in the order of the definitions.
+        """
+        prepared = []
+        for resource, definition in flattened_definitions:
+            definition = self.set_defaults(resource, definition)
+            warnings = []
+            if self.params["validate"] is not None:
+                self.warnings = []
+                warnings = self.validate(definition)
+            prepared.append((resource, definition, warnings or []))
+        # perform_action() removes them from the shared params
+        self.remove_aliases()
+        self.warnings = []
+
+        results = [None] * len(prepared)
+        failure = None
+        start = time.time()
+        for index, wave in enumerate(apply_waves(prepared, self.params.get("state"))):
+
+            def _perform(position):
+                resource, definition, warnings = prepared[position]
+                started = time.time()
+                result = self._perform_action_isolated(resource, definition, warnings)
+                result["timing"] = dict(
+                    wave=index,
+                    started=round(started - start, 3),
+                    elapsed=round(time.time() - started, 3),
+                )
+                return position, result
+
+            with ThreadPoolExecutor(max_workers=min(workers, len(wave))) as executor:
+                for position, result in executor.map(_perform, wave):
+                    if "failed" in result and failure is None:
+                        failure = result
+                    results[position] = result
+            if failure is not None:
+                failure.pop("failed")
+                failure.pop("timing")
+                self.fail_json(**failure)
+        return results
+
+    def _perform_action_isolated(self, resource, definition, warnings):
+        """
+        Run perform_action() on a shallow copy of self, so the warnings of
+        the object and a call to fail_json() stay local to the calling thread.
+        """
+
+        def _fail_json(**kwargs):
+            raise _ActionFailed(kwargs)
+
+        worker = copy.copy(self)
+        worker.warnings = list(warnings)
+        worker.fail_json = _fail_json
+        worker.fail = lambda msg=None: _fail_json(msg=msg)
+        try:
+            result = worker.perform_action(resource, definition)
+        except _ActionFailed as e:
+            return dict(e.kwargs, failed=True)
+        if warnings:
+            result["warnings"] = warnings
+        return result
+
     def validate(self, resource):
         def _prepend_resource_info(resource, msg):
             return "%s %s: %s" % (resource["kind"], resource["metadata"]["name"], msg)
@@ -1430,6 +1671,66 @@ class K8sAnsibleMixin(object):
         return result
 
 
+class _ActionFailed(Exception):
+    def __init__(self, kwargs):
+        super(_ActionFailed, self).__init__(kwargs.get("msg"))
+        self.kwargs = kwargs
+
+
+# Kinds the other objects of a bulk apply may depend on, applied in that order
+# before everything else.
+APPLY_WAVES = [
+    ("Namespace", "CustomResourceDefinition"),
+    (
+        "ServiceAccount",
+        "Secret",
+        "ConfigMap",
+        "StorageClass",
+        "PersistentVolume",
+        "PersistentVolumeClaim",
+        "ClusterRole",
+        "ClusterRoleBinding",
+        "Role",
+        "RoleBinding",
+        "ResourceQuota",
+        "LimitRange",
+        "PriorityClass",
+        "NetworkPolicy",
+    ),
+]
+
+
+def apply_waves(prepared, state=None):
+    """
+    Group (resource, definition, ...) tuples into lists of positions which can
+    be applied concurrently. Namespaces and CRDs come first, then the kinds of
+    APPLY_WAVES, then everything else; the order is reversed for state=absent.
+    An object listed more than once is moved to a later wave on each repeat.
+    """
+    rank = {}
+    for wave, kinds in enumerate(APPLY_WAVES):
+        rank.update((kind, wave) for kind in kinds)
+
+    seen = {}
+    waves = {}
+    for position, item in enumerate(prepared):
+        resource, definition = item[0], item[1]
+        metadata = definition.get("metadata", {})
+        identity = (
+            resource.group_version,
+            resource.kind,
+            metadata.get("namespace"),
+            metadata.get("name") or metadata.get("generateName"),
+        )
+        repeat = seen.get(identity, 0)
+        seen[identity] = repeat + 1
+        key = (rank.get(resource.kind, len(APPLY_WAVES)), repeat)
+        if state == "absent":
+            key = (-key[0], key[1])
+        waves.setdefault(key, []).append(position)
+    return [waves[key] for key in sorted(waves)]
+
+
 def _encode_stringdata(definition):
     if definition["kind"] == "Secret" and "stringData" in definition:
         for k, v in definition["stringData"].items():
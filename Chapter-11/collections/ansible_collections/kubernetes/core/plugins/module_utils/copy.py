@@ -18,7 +18,9 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import os
-from tempfile import TemporaryFile, NamedTemporaryFile
+import shutil
+import time
+from tempfile import NamedTemporaryFile
 from select import select
 from abc import ABCMeta, abstractmethod
 import tarfile
@@ -30,6 +32,7 @@ try:
     from kubernetes.client.api import core_v1_api
     from kubernetes.stream import stream
     from kubernetes.stream.ws_client import (
+        STDIN_CHANNEL,
         STDOUT_CHANNEL,
         STDERR_CHANNEL,
         ERROR_CHANNEL,
@@ -45,6 +48,94 @@ except ImportError:
     pass
 
 
+# Size of the chunks written to the stdin of a Pod
+CHUNK_SIZE = 1024 * 1024
+# Seconds the errors of tar are read for when its stdin can't be closed
+EXTRACT_TIMEOUT = 2
+# The exec protocol able to close the stdin of a command
+V5_CHANNEL_PROTOCOL = "v5.channel.k8s.io"
+
+
+class ExecStdout(object):
+    """
+    File-like reader of the binary stdout of an exec session, so an archive can
+    be extracted while it is received. At most one websocket frame is held on
+    top of the data requested.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.stderr = []
+        self.error = None
+        self._buffer = b""
+
+    def _receive(self):
+        if not self.response.is_open():
+            return False
+        if not self.response.sock.connected:
+            self.response._connected = False
+            return False
+        ret, out, err = select((self.response.sock.sock,), (), (), 1)
+        if not ret:
+            return True
+        code, frame = self.response.sock.recv_data_frame(True)
+        if code == ABNF.OPCODE_CLOSE:
+            self.response._connected = False
+            return False
+        if code in (ABNF.OPCODE_BINARY, ABNF.OPCODE_TEXT) and len(frame.data) > 1:
+            channel = frame.data[0]
+            content = frame.data[1:]
+            if channel == STDOUT_CHANNEL:
+                self._buffer += content
+            elif channel == STDERR_CHANNEL:
+                self.stderr.append(content.decode("utf-8", "replace"))
+            elif channel == ERROR_CHANNEL:
+                self.error = yaml.safe_load(content)
+        return True
+
+    def read(self, size=-1):
+        while (size < 0 or len(self._buffer) < size) and self._receive():
+            pass
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class ExecStdin(object):
+    """
+    File-like writer to the stdin of an exec session, so an archive can be sent
+    while it is created, CHUNK_SIZE bytes at a time.
+
+    Writing raises IOError once the session is closed, for example when the
+    command reading stdin exited.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self.stderr = []
+        self._buffer = bytearray()
+
+    def _send(self, data):
+        if not self.response.is_open():
+            raise IOError("the exec session is closed")
+        self.response.write_stdin(data)
+        if self.response.peek_stderr():
+            self.stderr.append(self.response.read_stderr().rstrip("\n"))
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= CHUNK_SIZE:
+            self._send(bytes(self._buffer[:CHUNK_SIZE]))
+            del self._buffer[:CHUNK_SIZE]
+        return len(data)
+
+    def flush(self):
+        if self._buffer:
+            self._send(bytes(self._buffer))
+            del self._buffer[:]
+
+
 class K8SCopy(metaclass=ABCMeta):
     def __init__(self, module, client):
         self.client = client
@@ -58,6 +149,7 @@ class K8SCopy(metaclass=ABCMeta):
         self.content = module.params.get("content")
 
         self.no_preserve = module.params.get("no_preserve")
+        self.compress = module.params.get("compress")
         self.container_arg = {}
         if module.params.get("container"):
             self.container_arg["container"] = module.params.get("container")
@@ -72,23 +164,62 @@ class K8SCopyFromPod(K8SCopy):
     Copy files/directory from Pod into local filesystem
     """
 
-    def __init__(self, module, client):
-        super(K8SCopyFromPod, self).__init__(module, client)
-        self.is_remote_path_dir = None
-        self.files_to_copy = list()
+    def archive_command(self):
+        """
+        The command writing remote_path to stdout as a tar archive, the
+        members are named after the last component of remote_path.
+        """
+        parent, base = os.path.split(self.remote_path.rstrip("/") or "/")
+        return ["tar", "czf" if self.compress else "cf", "-", "-C", parent, base or "."]
 
-    def list_remote_files(self):
+    def local_root(self, base):
         """
-        This method will check if the remote path is a dir or file
-        if it is a directory the file list will be updated accordingly
+        Where the member named base is written, inside local_path when it is
+        an existing directory.
+        """
+        if base != "." and os.path.isdir(self.local_path):
+            return os.path.join(self.local_path, base)
+        return self.local_path
+
+    def extract(self, archive):
+        """
+        Write the directories and regular files of the archive under
+        local_path, returns the number of files written.
+        """
+        copied = 0
+        base = root = None
+        with tarfile.open(
+            fileobj=archive, mode="r|gz" if self.compress else "r|"
+        ) as tar:
+            for member in tar:
+                if root is None:
+                    base = member.name.split("/")[0]
+                    root = self.local_root(base)
+                relpath = os.path.normpath(os.path.relpath(member.name, base))
+                if member.name.split("/")[0] != base or relpath.startswith(".."):
+                    continue
+                dest_file = os.path.normpath(os.path.join(root, relpath))
+                if member.isdir():
+                    os.makedirs(dest_file, exist_ok=True)
+                elif member.isfile():
+                    # create directory to copy file in
+                    os.makedirs(os.path.dirname(dest_file) or ".", exist_ok=True)
+                    with open(dest_file, "wb") as fh:
+                        shutil.copyfileobj(tar.extractfile(member), fh, CHUNK_SIZE)
+                    copied += 1
+        return copied
+
+    def copy(self):
+        """
+        Copy remote_path with a single exec session, the archive created by tar
+        in the Pod is extracted as it is received.
         """
         try:
-            find_cmd = ["find", self.remote_path, "-type", "f", "-name", "*"]
             response = stream(
                 self.api_instance.connect_get_namespaced_pod_exec,
                 self.name,
                 self.namespace,
-                command=find_cmd,
+                command=self.archive_command(),
                 stdout=True,
                 stderr=True,
                 stdin=False,
@@ -102,97 +233,34 @@ class K8SCopyFromPod(K8SCopy):
                     self.namespace, self.name, to_native(e)
                 )
             )
-        stderr = []
-        while response.is_open():
-            response.update(timeout=1)
-            if response.peek_stdout():
-                self.files_to_copy.extend(
-                    response.read_stdout().rstrip("\n").split("\n")
-                )
-            if response.peek_stderr():
-                err = response.read_stderr()
-                if "No such file or directory" in err:
-                    self.module.fail_json(
-                        msg="{0} does not exist in remote pod filesystem".format(
-                            self.remote_path
-                        )
-                    )
-                stderr.append(err)
-        error = response.read_channel(ERROR_CHANNEL)
+        archive = ExecStdout(response)
+        try:
+            copied = self.extract(archive)
+        except tarfile.ReadError:
+            copied = None
+        # consume the end of the archive and the exit status
+        while archive.read(CHUNK_SIZE):
+            pass
         response.close()
-        error = yaml.safe_load(error)
-        if error["status"] != "Success":
-            self.module.fail_json(
-                msg="Failed to execute on Pod due to: {0}".format(error)
-            )
-
-    def read(self):
-        self.stdout = None
-        self.stderr = None
-
-        if self.response.is_open():
-            if not self.response.sock.connected:
-                self.response._connected = False
-            else:
-                ret, out, err = select((self.response.sock.sock,), (), (), 0)
-                if ret:
-                    code, frame = self.response.sock.recv_data_frame(True)
-                    if code == ABNF.OPCODE_CLOSE:
-                        self.response._connected = False
-                    elif (
-                        code in (ABNF.OPCODE_BINARY, ABNF.OPCODE_TEXT)
-                        and len(frame.data) > 1
-                    ):
-                        channel = frame.data[0]
-                        content = frame.data[1:]
-                        if content:
-                            if channel == STDOUT_CHANNEL:
-                                self.stdout = content
-                            elif channel == STDERR_CHANNEL:
-                                self.stderr = content.decode("utf-8", "replace")
 
-    def copy(self):
-        is_remote_path_dir = (
-            len(self.files_to_copy) > 1 or self.files_to_copy[0] != self.remote_path
-        )
-        relpath_start = self.remote_path
-        if is_remote_path_dir and os.path.isdir(self.local_path):
-            relpath_start = os.path.dirname(self.remote_path)
-
-        for remote_file in self.files_to_copy:
-            dest_file = self.local_path
-            if is_remote_path_dir:
-                dest_file = os.path.join(
-                    self.local_path, os.path.relpath(remote_file, start=relpath_start)
+        errors = "".join(archive.stderr)
+        if "No such file or directory" in errors:
+            self.module.fail_json(
+                msg="{0} does not exist in remote pod filesystem".format(
+                    self.remote_path
                 )
-                # create directory to copy file in
-                os.makedirs(os.path.dirname(dest_file), exist_ok=True)
-
-            pod_command = ["cat", remote_file]
-            self.response = stream(
-                self.api_instance.connect_get_namespaced_pod_exec,
-                self.name,
-                self.namespace,
-                command=pod_command,
-                stderr=True,
-                stdin=True,
-                stdout=True,
-                tty=False,
-                _preload_content=False,
-                **self.container_arg
             )
-            errors = []
-            with open(dest_file, "wb") as fh:
-                while self.response._connected:
-                    self.read()
-                    if self.stdout:
-                        fh.write(self.stdout)
-                    if self.stderr:
-                        errors.append(self.stderr)
-            if errors:
-                self.module.fail_json(
-                    msg="Failed to copy file from Pod: {0}".format("".join(errors))
-                )
+        if copied is None or (archive.error and archive.error["status"] != "Success"):
+            self.module.fail_json(
+                msg="Failed to copy file from Pod: {0}".format(errors or archive.error)
+            )
+        if not copied:
+            self.module.exit_json(
+                changed=False,
+                warning="No file found from directory '{0}' into remote Pod.".format(
+                    self.remote_path
+                ),
+            )
         self.module.exit_json(
             changed=True,
             result="{0} successfully copied locally into {1}".format(
@@ -201,14 +269,6 @@ class K8SCopyFromPod(K8SCopy):
         )
 
     def run(self):
-        self.list_remote_files()
-        if self.files_to_copy == []:
-            self.module.exit_json(
-                changed=False,
-                warning="No file found from directory '{0}' into remote Pod.".format(
-                    self.remote_path
-                ),
-            )
         self.copy()
 
 
@@ -271,6 +331,29 @@ class K8SCopyToPod(K8SCopy):
             return True
         return False
 
+    def wait_for_extract(self, response, stderr):
+        """
+        Close the stdin of tar in the Pod and read its errors into stderr until
+        it exits, returns its exit status, or None when it is still running.
+
+        Only the v5 exec protocol can close stdin, with the older ones tar
+        waits for more input so its errors are read for EXTRACT_TIMEOUT seconds.
+        """
+        timeout = None
+        if getattr(response, "subprotocol", None) == V5_CHANNEL_PROTOCOL:
+            response.close_channel(STDIN_CHANNEL)
+        else:
+            timeout = EXTRACT_TIMEOUT
+        start = time.time()
+        while response.is_open():
+            if timeout is not None and time.time() - start >= timeout:
+                return None
+            response.update(timeout=1)
+            if response.peek_stderr():
+                stderr.append(response.read_stderr().rstrip("\n"))
+        error = response.read_channel(ERROR_CHANNEL)
+        return yaml.safe_load(error) if error else None
+
     def close_temp_file(self):
         if self.named_temp_file:
             self.named_temp_file.close()
@@ -301,16 +384,17 @@ class K8SCopyToPod(K8SCopy):
             else:
                 dest_file = os.path.join(dest_file, os.path.basename(src_file))
 
+        extract = "-xzmf" if self.compress else "-xmf"
         if self.no_preserve:
             tar_command = [
                 "tar",
                 "--no-same-permissions",
                 "--no-same-owner",
-                "-xmf",
+                extract,
                 "-",
             ]
         else:
-            tar_command = ["tar", "-xmf", "-"]
+            tar_command = ["tar", extract, "-"]
 
         if dest_file.startswith("/"):
             tar_command.extend(["-C", "/"])
@@ -327,39 +411,28 @@ class K8SCopyToPod(K8SCopy):
             _preload_content=False,
             **self.container_arg
         )
-        with TemporaryFile() as tar_buffer:
-            with tarfile.open(fileobj=tar_buffer, mode="w") as tar:
+        # the archive is sent while it is created, in chunks
+        stdin = ExecStdin(response)
+        error = None
+        try:
+            with tarfile.open(
+                fileobj=stdin, mode="w|gz" if self.compress else "w|"
+            ) as tar:
                 tar.add(src_file, dest_file)
-            tar_buffer.seek(0)
-            commands = []
-            # push command in chunk mode
-            size = 1024 * 1024
-            while True:
-                data = tar_buffer.read(size)
-                if not data:
-                    break
-                commands.append(data)
-
-            stderr, stdout = [], []
-            while response.is_open():
-                if response.peek_stdout():
-                    stdout.append(response.read_stdout().rstrip("\n"))
-                if response.peek_stderr():
-                    stderr.append(response.read_stderr().rstrip("\n"))
-                if commands:
-                    cmd = commands.pop(0)
-                    response.write_stdin(cmd)
-                else:
-                    break
-            response.close()
-            if stderr:
-                self.close_temp_file()
-                self.module.fail_json(
-                    command=tar_command,
-                    msg="Failed to copy local file/directory into Pod due to: {0}".format(
-                        "".join(stderr)
-                    ),
-                )
+            stdin.flush()
+        except IOError as e:
+            # tar exited early, its errors are read below
+            error = str(e)
+        status = self.wait_for_extract(response, stdin.stderr)
+        response.close()
+        if error or stdin.stderr or (status and status["status"] != "Success"):
+            self.close_temp_file()
+            self.module.fail_json(
+                command=tar_command,
+                msg="Failed to copy local file/directory into Pod due to: {0}".format(
+                    "".join(stdin.stderr) or (status and status.get("message")) or error
+                ),
+            )
         self.close_temp_file()
         if self.content:
             self.module.exit_json(
@@ -172,6 +172,18 @@ options:
         - When set to True, server-side apply will force the changes against conflicts.
         type: bool
         default: False
+  workers:
+    description:
+    - Number of objects applied concurrently when several resources are defined.
+    - The objects are applied in waves, Namespaces and CustomResourceDefinitions first, then the objects
+      they commonly depend on (ServiceAccounts, Secrets, ConfigMaps, RBAC, volumes...), then everything else.
+      A wave starts once the previous one is done. The order is reversed when I(state=absent).
+    - When an object fails and I(continue_on_error) is not set, the objects of the current wave are completed
+      but no other wave is started.
+    - The results are returned in the order of the definitions whatever the number of workers.
+    type: int
+    default: 1
+    version_added: 2.4.0
 
 requirements:
   - "python >= 3.6"
@@ -335,6 +347,13 @@ EXAMPLES = r"""
     apply: yes
     server_side_apply:
       field_manager: ansible
+
+# Apply a bundle of manifests, up to 8 objects at a time
+- name: Deploy the application manifests
+  kubernetes.core.k8s:
+    state: present
+    src: /testing/application.yml
+    workers: 8
 """
 
 RETURN = r"""
@@ -377,6 +396,14 @@ result:
        description: error while trying to create/delete the object.
        returned: error
        type: complex
+     timing:
+       description:
+       - Set on each item of C(result.results) when the objects were applied in parallel.
+       - C(wave) is the index of the wave of the object, C(started) the time in seconds from the start of the first
+         wave to the start of the object and C(elapsed) the time in seconds the object took.
+       returned: when C(workers) is greater than 1 and several resources are defined
+       type: dict
+       sample: {"wave": 1, "started": 0.412, "elapsed": 0.058}
 """
 
 import copy
@@ -433,6 +460,7 @@ def argspec():
     argument_spec["server_side_apply"] = dict(
         type="dict", default=None, options=server_apply_spec()
     )
+    argument_spec["workers"] = dict(type="int", default=1)
 
     return argument_spec
 
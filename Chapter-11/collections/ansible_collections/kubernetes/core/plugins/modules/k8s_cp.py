@@ -76,9 +76,17 @@ options:
     - This option is ignored when I(content) is set or when I(state) is set to C(from_pod).
     type: bool
     default: False
+  compress:
+    description:
+    - Compress the archive the files are transferred in with gzip.
+    - Requires gzip support in the tar binary of the container.
+    type: bool
+    default: False
+    version_added: 2.4.0
 
 notes:
-    - the tar binary is required on the container when copying from local filesystem to pod.
+    - the tar binary is required on the container.
+    - A file or a whole directory is transferred as a single tar archive, streamed through one exec session.
 """
 
 EXAMPLES = r"""
@@ -167,6 +175,7 @@ def argspec():
         "choices": ["to_pod", "from_pod"],
     }
     argument_spec["no_preserve"] = {"type": "bool", "default": False}
+    argument_spec["compress"] = {"type": "bool", "default": False}
     return argument_spec
 
 
@@ -78,10 +78,15 @@ options:
         wait_timeout:
             description:
             - The length of time to wait in seconds for pod to be deleted before giving up, zero means infinite.
+            - The pods are evicted concurrently and their deletion is followed with a single watch on the pods of the node.
+            - When set, an eviction refused because of a PodDisruptionBudget is retried until this timeout is reached,
+              otherwise the module fails on the first refusal.
             type: int
         wait_sleep:
             description:
-            - Number of seconds to sleep between checks.
+            - Number of seconds to sleep between checks, used when the pods of the node can't be watched.
+            - Also the delay between two attempts to evict a pod protected by a PodDisruptionBudget, when the
+              API server does not suggest one.
             - Ignored if C(wait_timeout) is not set.
             default: 5
             type: int
@@ -129,6 +134,7 @@ import copy
 import time
 import traceback
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from ansible_collections.kubernetes.core.plugins.module_utils.ansiblemodule import (
     AnsibleModule,
@@ -139,6 +145,7 @@ from ansible_collections.kubernetes.core.plugins.module_utils.args_common import
 from ansible.module_utils._text import to_native
 
 try:
+    from kubernetes import watch
     from kubernetes.client.api import core_v1_api
     from kubernetes.client.models import V1DeleteOptions
     from kubernetes.client.exceptions import ApiException
@@ -146,6 +153,11 @@ except ImportError:
     # ImportError are managed by the common module already.
     pass
 
+# Number of pods evicted at a time
+EVICTION_WORKERS = 16
+# Longest watch request when waiting without timeout
+WATCH_TIMEOUT = 300
+
 HAS_EVICTION_API = True
 k8s_import_exception = None
 K8S_IMP_ERR = None
@@ -286,7 +298,91 @@ class K8sDrainAnsible(object):
 
         self._changed = False
 
-    def wait_for_pod_deletion(self, pods, wait_timeout, wait_sleep):
+    def wait_for_pod_deletion(
+        self, pods, wait_timeout, wait_sleep, resource_version=None
+    ):
+        """Wait for the (namespace, name) pods to be deleted from the node.
+
+        The pods of the node are watched from resource_version, the version of
+        the list the pods come from; they are polled one by one when the watch
+        is not possible.
+        """
+        deadline = time.time() + wait_timeout if wait_timeout else None
+        pending = set(pods)
+        try:
+            self._watch_pod_deletion(pending, deadline, resource_version)
+        except ApiException as exc:
+            if exc.status not in (403, 405):
+                self._module.fail_json(msg="Exception raised: {0}".format(exc.reason))
+            pods = list(pending)
+            if not pods:
+                return None
+            if deadline is not None:
+                wait_timeout = max(1, int(deadline - time.time()))
+            return self._poll_pod_deletion(pods, wait_timeout, wait_sleep)
+        except Exception as e:
+            self._module.fail_json(msg="Exception raised: {0}".format(to_native(e)))
+        if not pending:
+            return None
+        return "timeout reached while pods were still running."
+
+    def _list_node_pods(self):
+        field_selector = "spec.nodeName={name}".format(
+            name=self._module.params.get("name")
+        )
+        return self._api_instance.list_pod_for_all_namespaces(
+            field_selector=field_selector
+        )
+
+    def _watch_pod_deletion(self, pending, deadline, resource_version):
+        """Remove the pods from pending as they are deleted, until deadline."""
+        field_selector = "spec.nodeName={name}".format(
+            name=self._module.params.get("name")
+        )
+        while pending:
+            if resource_version is None:
+                pod_list = self._list_node_pods()
+                present = set(
+                    (pod.metadata.namespace, pod.metadata.name)
+                    for pod in pod_list.items
+                )
+                pending.intersection_update(present)
+                resource_version = pod_list.metadata.resource_version
+                if not pending:
+                    return
+            timeout = WATCH_TIMEOUT
+            if deadline is not None:
+                timeout = int(deadline - time.time())
+                if timeout <= 0:
+                    return
+            watcher = watch.Watch()
+            try:
+                for event in watcher.stream(
+                    self._api_instance.list_pod_for_all_namespaces,
+                    field_selector=field_selector,
+                    resource_version=resource_version,
+                    timeout_seconds=timeout,
+                ):
+                    if event["type"] == "ERROR":
+                        # The resourceVersion is too old, list the pods again
+                        if event["raw_object"].get("code") != 410:
+                            raise ApiException(status=event["raw_object"].get("code"))
+                        resource_version = None
+                        break
+                    pod = event["object"]
+                    resource_version = pod.metadata.resource_version
+                    if event["type"] == "DELETED":
+                        pending.discard((pod.metadata.namespace, pod.metadata.name))
+                        if not pending:
+                            return
+            except ApiException as exc:
+                if exc.status != 410:
+                    raise
+                resource_version = None
+            finally:
+                watcher.stop()
+
+    def _poll_pod_deletion(self, pods, wait_timeout, wait_sleep):
         start = datetime.now()
 
         def _elapsed_time():
@@ -317,10 +413,39 @@ class K8sDrainAnsible(object):
         return "timeout reached while pods were still running."
 
     def evict_pods(self, pods):
-        for namespace, name in pods:
-            definition = {"metadata": {"name": name, "namespace": namespace}}
-            if self._delete_options:
-                definition.update({"delete_options": self._delete_options})
+        """Evict or delete the (namespace, name) pods, EVICTION_WORKERS at a time.
+
+        The module fails with the first error once every pod was handled.
+        """
+        wait_timeout = self._drain_options.get("wait_timeout")
+        deadline = None
+        if wait_timeout:
+            deadline = time.time() + wait_timeout
+
+        with ThreadPoolExecutor(
+            max_workers=min(EVICTION_WORKERS, len(pods))
+        ) as executor:
+            results = list(
+                executor.map(lambda pod: self._evict_pod(pod, deadline), pods)
+            )
+        if any(evicted for evicted, error in results):
+            self._changed = True
+        errors = [error for evicted, error in results if error]
+        if errors:
+            self._module.fail_json(msg=errors[0])
+
+    def _evict_pod(self, pod, deadline):
+        """Evict or delete one pod, returns whether it was and an error message.
+
+        An eviction refused with 429, because it would break a
+        PodDisruptionBudget, is tried again until deadline when wait_timeout
+        is set.
+        """
+        namespace, name = pod
+        definition = {"metadata": {"name": name, "namespace": namespace}}
+        if self._delete_options:
+            definition.update({"delete_options": self._delete_options})
+        while True:
             try:
                 if self._drain_options.get("disable_eviction"):
                     body = V1DeleteOptions(**definition)
@@ -332,21 +457,38 @@ class K8sDrainAnsible(object):
                     self._api_instance.create_namespaced_pod_eviction(
                         name=name, namespace=namespace, body=body
                     )
-                self._changed = True
+                return True, None
             except ApiException as exc:
-                if exc.reason != "Not Found":
-                    self._module.fail_json(
-                        msg="Failed to delete pod {0}/{1} due to: {2}".format(
-                            namespace, name, exc.reason
-                        )
-                    )
+                if exc.reason == "Not Found":
+                    return False, None
+                if (
+                    exc.status == 429
+                    and self._drain_options.get("wait_timeout") is not None
+                ):
+                    delay = self._retry_after(exc)
+                    if deadline is None or time.time() + delay < deadline:
+                        time.sleep(delay)
+                        continue
+                return (
+                    False,
+                    "Failed to delete pod {0}/{1} due to: {2}".format(
+                        namespace, name, exc.reason
+                    ),
+                )
             except Exception as exc:
-                self._module.fail_json(
-                    msg="Failed to delete pod {0}/{1} due to: {2}".format(
+                return (
+                    False,
+                    "Failed to delete pod {0}/{1} due to: {2}".format(
                         namespace, name, to_native(exc)
-                    )
+                    ),
                 )
 
+    def _retry_after(self, exc):
+        try:
+            return max(1, int(exc.headers.get("Retry-After")))
+        except (AttributeError, TypeError, ValueError):
+            return self._drain_options.get("wait_sleep") or 5
+
     def delete_or_evict_pods(self, node_unschedulable):
         # Mark node as unschedulable
         result = []
@@ -368,13 +510,10 @@ class K8sDrainAnsible(object):
                 self._changed = False
                 self.patch_node(unschedulable=False)
 
+        resource_version = None
         try:
-            field_selector = "spec.nodeName={name}".format(
-                name=self._module.params.get("name")
-            )
-            pod_list = self._api_instance.list_pod_for_all_namespaces(
-                field_selector=field_selector
-            )
+            pod_list = self._list_node_pods()
+            resource_version = pod_list.metadata.resource_version
             # Filter pods
             force = self._drain_options.get("force", False)
             ignore_daemonset = self._drain_options.get("ignore_daemonsets", False)
@@ -416,6 +555,7 @@ class K8sDrainAnsible(object):
                     pods,
                     self._drain_options.get("wait_timeout"),
                     self._drain_options.get("wait_sleep"),
+                    resource_version,
                 )
                 if warn:
                     warnings.append(warn)
@@ -60,6 +60,40 @@ options:
     required: no
     type: str
     version_added: '2.2.0'
+  all_pods:
+    description:
+    - Fetch the logs of every Pod matching I(label_selectors), or the Pod selector of the object, instead of
+      only the first one.
+    - The logs are read concurrently and returned in I(logs).
+    type: bool
+    default: False
+    version_added: '2.4.0'
+  all_containers:
+    description:
+    - Fetch the logs of every container of the Pods, I(container) is ignored.
+    - The logs are read concurrently and returned in I(logs).
+    type: bool
+    default: False
+    version_added: '2.4.0'
+  tail_lines:
+    description:
+    - Only return the last lines of each log.
+    - At most this number of lines is held in memory for a log.
+    type: int
+    version_added: '2.4.0'
+  limit_bytes:
+    description:
+    - Maximum number of bytes read from each log.
+    type: int
+    version_added: '2.4.0'
+  dest:
+    description:
+    - Path of a directory where the logs are written as they are read, instead of being returned.
+    - Each log is written to a file named after the namespace, the Pod and the container, the files are
+      listed in I(logs).
+    - The directory is created when missing. Nothing is written in check mode.
+    type: path
+    version_added: '2.4.0'
 
 requirements:
   - "python >= 3.6"
@@ -92,6 +126,27 @@ EXAMPLES = r"""
     since_seconds: "4000"
   register: log
 
+# This will get the last 100 lines of every container of every Pod matching the selector
+- name: Get the logs of all the Pods of an application
+  kubernetes.core.k8s_log:
+    namespace: testing
+    label_selectors:
+    - app=example
+    all_pods: yes
+    all_containers: yes
+    tail_lines: 100
+  register: logs
+
+# This will write the logs of every Pod managed by this Deployment to files
+- name: Save the logs of a Deployment
+  kubernetes.core.k8s_log:
+    api_version: apps/v1
+    kind: Deployment
+    namespace: testing
+    name: example
+    all_pods: yes
+    dest: /var/log/example
+
 # This will get the log from a single Pod managed by this DeploymentConfig
 - name: Get a log from a DeploymentConfig
   kubernetes.core.k8s_log:
@@ -113,21 +168,46 @@ log_lines:
   description:
   - The log of the object, split on newlines
   returned: success
+logs:
+  type: list
+  elements: dict
+  description:
+  - The logs of every Pod and container read.
+  - Each item has the C(namespace), C(name) and C(container) the log comes from, and either C(log) and
+    C(log_lines), or the C(path) and C(size) of the file it was written to when I(dest) is set.
+  returned: when I(all_pods), I(all_containers) or I(dest) is set
+  version_added: '2.4.0'
+  sample:
+  - namespace: testing
+    name: example-5f89d64c8-8znbj
+    container: web
+    log: "started\n"
+    log_lines: ["started", ""]
 """
 
 
 import copy
+import os
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from ansible_collections.kubernetes.core.plugins.module_utils.ansiblemodule import (
     AnsibleModule,
 )
 from ansible.module_utils.six import PY2
+from ansible.module_utils._text import to_text
 
 from ansible_collections.kubernetes.core.plugins.module_utils.args_common import (
     AUTH_ARG_SPEC,
     NAME_ARG_SPEC,
 )
 
+# Number of logs read at a time
+LOG_WORKERS = 8
+# Size of the chunks a log is read by
+LOG_CHUNK_SIZE = 64 * 1024
+
 
 def argspec():
     args = copy.deepcopy(AUTH_ARG_SPEC)
@@ -138,6 +218,11 @@ def argspec():
             container=dict(),
             since_seconds=dict(),
             label_selectors=dict(type="list", elements="str", default=[]),
+            all_pods=dict(type="bool", default=False),
+            all_containers=dict(type="bool", default=False),
+            tail_lines=dict(type="int"),
+            limit_bytes=dict(type="int"),
+            dest=dict(type="path"),
         )
     )
     return args
@@ -164,6 +249,7 @@ def execute_module(module, k8s_ansible_mixin):
         label_selector = ",".join(extract_selectors(module, instance))
         resource = v1_pods
 
+    pods = None
     if label_selector:
         instances = v1_pods.get(namespace=namespace, label_selector=label_selector)
         if not instances.items:
@@ -173,23 +259,105 @@ def execute_module(module, k8s_ansible_mixin):
                 )
             )
         # This matches the behavior of kubectl when logging pods via a selector
-        name = instances.items[0].metadata.name
+        pods = instances.items if module.params["all_pods"] else instances.items[:1]
         resource = v1_pods
-
-    kwargs = {}
-    if module.params.get("container"):
-        kwargs["query_params"] = dict(container=module.params["container"])
-
+    elif module.params["all_containers"] and resource.kind == "Pod":
+        pods = [resource.get(name=name, namespace=namespace)]
+
+    if pods is None:
+        sources = [(name, module.params.get("container"))]
+    elif module.params["all_containers"]:
+        sources = [
+            (pod.metadata.name, container.name)
+            for pod in pods
+            for container in pod.spec.containers
+        ]
+    else:
+        sources = [(pod.metadata.name, module.params.get("container")) for pod in pods]
+
+    query_params = {}
     if module.params.get("since_seconds"):
-        kwargs.setdefault("query_params", {}).update(
-            {"sinceSeconds": module.params["since_seconds"]}
+        query_params["sinceSeconds"] = module.params["since_seconds"]
+    if module.params.get("tail_lines") is not None:
+        query_params["tailLines"] = module.params["tail_lines"]
+    if module.params.get("limit_bytes") is not None:
+        query_params["limitBytes"] = module.params["limit_bytes"]
+
+    dest = module.params.get("dest")
+    if dest and not module.check_mode and not os.path.isdir(dest):
+        os.makedirs(dest)
+
+    def _read(source):
+        pod_name, container = source
+        kwargs = {}
+        if container or query_params:
+            kwargs["query_params"] = dict(query_params)
+            if container:
+                kwargs["query_params"]["container"] = container
+        result = dict(namespace=namespace, name=pod_name, container=container)
+        if dest:
+            result["path"] = os.path.join(
+                dest, log_file_name(pod_name, container, namespace)
+            )
+            if module.check_mode:
+                return result
+        response = resource.log.get(
+            name=pod_name, namespace=namespace, serialize=False, **kwargs
         )
-
-    log = serialize_log(
-        resource.log.get(name=name, namespace=namespace, serialize=False, **kwargs)
-    )
-
-    module.exit_json(changed=False, log=log, log_lines=log.split("\n"))
+        if dest:
+            result["size"] = write_log(response, result["path"])
+        else:
+            result["log"] = read_log(response, module.params.get("tail_lines"))
+            result["log_lines"] = result["log"].split("\n")
+        return result
+
+    if len(sources) == 1:
+        logs = [_read(sources[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(LOG_WORKERS, len(sources))) as executor:
+            logs = list(executor.map(_read, sources))
+
+    result = dict(changed=bool(dest) and not module.check_mode)
+    if not dest:
+        result.update(log=logs[0]["log"], log_lines=logs[0]["log_lines"])
+    if dest or module.params["all_pods"] or module.params["all_containers"]:
+        result["logs"] = logs
+    module.exit_json(**result)
+
+
+def log_file_name(name, container, namespace):
+    parts = [namespace, name, container]
+    return "_".join(part for part in parts if part) + ".log"
+
+
+def write_log(response, path):
+    """Stream the log in response to path, returns its size."""
+    size = 0
+    with open(path, "wb") as f:
+        for chunk in response.stream(LOG_CHUNK_SIZE):
+            f.write(chunk)
+            size += len(chunk)
+    response.release_conn()
+    return size
+
+
+def read_log(response, tail_lines=None):
+    """Read the log in response, keeping at most tail_lines lines in memory."""
+    if tail_lines is None:
+        return serialize_log(response)
+    lines = deque(maxlen=tail_lines + 1)
+    partial = b""
+    for chunk in response.stream(LOG_CHUNK_SIZE):
+        chunk = partial + chunk
+        complete, sep, partial = chunk.rpartition(b"\n")
+        if sep:
+            lines.extend(complete.split(b"\n"))
+    response.release_conn()
+    lines.append(partial)
+    # Without a final newline, the partial line is one of the tail_lines
+    if partial and len(lines) > tail_lines:
+        lines.popleft()
+    return to_text(b"\n".join(lines))
 
 
 def extract_selectors(module, instance):
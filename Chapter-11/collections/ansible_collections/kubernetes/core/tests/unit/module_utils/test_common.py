@@ -7,8 +7,18 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+import threading
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from kubernetes.dynamic.resource import ResourceInstance
+
 from ansible_collections.kubernetes.core.plugins.module_utils.common import (
+    K8sAnsibleMixin,
     _encode_stringdata,
+    apply_waves,
 )
 
 
@@ -33,3 +43,258 @@ def test_encode_stringdata_does_not_modify_data():
     }
     res = _encode_stringdata(definition)
     assert res["data"]["mydata"] == "Zm9vYmFy"
+
+
+def pod(name, namespace, ready, resource_version="1"):
+    return ResourceInstance(
+        None,
+        {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": name,
+                "namespace": namespace,
+                "resourceVersion": resource_version,
+            },
+            "status": {"containerStatuses": [{"ready": ready}]},
+        },
+    )
+
+
+def pod_list(*pods):
+    return ResourceInstance(
+        None,
+        {
+            "apiVersion": "v1",
+            "kind": "PodList",
+            "metadata": {"resourceVersion": "10"},
+            "items": [p.to_dict() for p in pods],
+        },
+    )
+
+
+def stream(*events):
+    for e in events:
+        yield e
+
+
+def event(event_type, instance):
+    return {"type": event_type, "object": instance, "raw_object": instance.to_dict()}
+
+
+@pytest.fixture
+def mixin():
+    return K8sAnsibleMixin(MagicMock())
+
+
+@pytest.fixture
+def pods():
+    resource = MagicMock()
+    resource.kind = "Pod"
+    resource.verbs = ["get", "list", "watch"]
+    return resource
+
+
+def test_wait_follows_watch_from_resource_version(mixin, pods):
+    pods.get.return_value = pod("web", "default", False, "5")
+    pods.watch.return_value = stream(
+        event("MODIFIED", pod("web", "default", False, "6")),
+        event("MODIFIED", pod("web", "default", True, "7")),
+    )
+    definition = {"kind": "Pod", "metadata": {"name": "web", "namespace": "default"}}
+
+    with patch("time.sleep") as sleep:
+        success, result, duration = mixin.wait(pods, definition, 5, 60)
+
+    assert success
+    assert result["metadata"]["resourceVersion"] == "7"
+    assert pods.get.call_count == 1
+    assert pods.watch.call_args[1]["name"] == "web"
+    assert pods.watch.call_args[1]["resource_version"] == "5"
+    assert not sleep.called
+
+
+def test_wait_polls_when_watch_fails(mixin, pods):
+    error = Exception("forbidden")
+    error.status = 403
+    pods.watch.side_effect = error
+    pods.get.side_effect = [
+        pod("web", "default", False),
+        pod("web", "default", False),
+        pod("web", "default", True),
+    ]
+    definition = {"kind": "Pod", "metadata": {"name": "web", "namespace": "default"}}
+
+    with patch("time.sleep") as sleep:
+        success, result, duration = mixin.wait(pods, definition, 5, 60)
+
+    assert success
+    assert pods.watch.call_count == 1
+    assert pods.get.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_wait_lists_again_when_resource_version_expired(mixin, pods):
+    pods.get.side_effect = [
+        pod("web", "default", False, "5"),
+        pod("web", "default", True, "9"),
+    ]
+    pods.watch.return_value = stream(
+        {"type": "ERROR", "object": None, "raw_object": {"kind": "Status", "code": 410}}
+    )
+    definition = {"kind": "Pod", "metadata": {"name": "web", "namespace": "default"}}
+
+    with patch("time.sleep") as sleep:
+        success, result, duration = mixin.wait(pods, definition, 5, 60)
+
+    assert success
+    assert pods.get.call_count == 2
+    assert not sleep.called
+
+
+def test_wait_all_watches_each_namespace_once(mixin, pods):
+    listings = {
+        "a": pod_list(
+            pod("one", "a", False), pod("two", "a", True), pod("other", "a", False)
+        ),
+        "b": pod("three", "b", False),
+    }
+    watches = {
+        "a": [
+            event("MODIFIED", pod("other", "a", True)),
+            event("MODIFIED", pod("one", "a", True)),
+        ],
+        "b": [event("MODIFIED", pod("three", "b", True))],
+    }
+    pods.get.side_effect = lambda name=None, namespace=None, **kwargs: listings[
+        namespace
+    ]
+    pods.watch.side_effect = lambda namespace=None, **kwargs: stream(
+        *watches[namespace]
+    )
+    definitions = [
+        {"metadata": {"name": "one", "namespace": "a"}},
+        {"metadata": {"name": "two", "namespace": "a"}},
+        {"metadata": {"name": "three", "namespace": "b"}},
+    ]
+
+    with patch("time.sleep") as sleep:
+        results = mixin.wait_all(pods, definitions, 5, 60)
+
+    assert [r[0] for r in results] == [True, True, True]
+    assert results[0][1]["metadata"]["name"] == "one"
+    assert results[2][1]["metadata"]["name"] == "three"
+    assert pods.get.call_count == 2
+    assert pods.watch.call_count == 2
+    # the objects of namespace a are watched together, the single one of b by name
+    assert pods.watch.call_args_list[0][1]["name"] is None
+    assert pods.watch.call_args_list[1][1]["name"] == "three"
+    assert not sleep.called
+
+
+def test_wait_all_lists_and_watches_selected_objects(mixin, pods):
+    pods.get.return_value = pod_list(pod("one", "a", False), pod("two", "a", False))
+    pods.watch.return_value = stream(
+        event("MODIFIED", pod("one", "a", True)),
+        event("MODIFIED", pod("two", "a", True)),
+    )
+    definitions = [
+        {"metadata": {"name": "one", "namespace": "a"}},
+        {"metadata": {"name": "two", "namespace": "a"}},
+    ]
+
+    with patch("time.sleep"):
+        results = mixin.wait_all(
+            pods, definitions, 5, 60, label_selectors=["app=web", "tier=front"]
+        )
+
+    assert [r[0] for r in results] == [True, True]
+    assert pods.get.call_args[1]["label_selector"] == "app=web,tier=front"
+    assert pods.watch.call_args[1]["label_selector"] == "app=web,tier=front"
+
+
+def kind_resource(kind):
+    resource = MagicMock()
+    resource.kind = kind
+    resource.group_version = "v1"
+    resource.namespaced = kind != "Namespace"
+    return resource
+
+
+def manifest(*objects):
+    return [
+        (kind_resource(kind), {"metadata": {"name": name, "namespace": "testing"}})
+        for kind, name in objects
+    ]
+
+
+MANIFEST = [
+    ("Deployment", "web"),
+    ("Namespace", "testing"),
+    ("Service", "web"),
+    ("ConfigMap", "web"),
+    ("CustomResourceDefinition", "widgets"),
+]
+
+
+def test_apply_waves_orders_by_kind():
+    assert apply_waves(manifest(*MANIFEST)) == [[1, 4], [3], [0, 2]]
+    assert apply_waves(manifest(*MANIFEST), "absent") == [[0, 2], [3], [1, 4]]
+
+
+def test_apply_waves_repeated_object_waits():
+    objects = manifest(("ConfigMap", "a"), ("ConfigMap", "b"), ("ConfigMap", "a"))
+    assert apply_waves(objects) == [[0, 1], [2]]
+
+
+@pytest.fixture
+def bulk_mixin(mixin):
+    def fail_json(**kwargs):
+        raise SystemExit(kwargs)
+
+    mixin.params = {"validate": None, "state": "present"}
+    mixin.argspec = {}
+    mixin.name = mixin.generate_name = mixin.namespace = None
+    mixin.fail_json = fail_json
+    mixin.fail = fail_json
+    return mixin
+
+
+def test_perform_actions_in_waves_keeps_input_order(bulk_mixin):
+    applied = []
+    lock = threading.Lock()
+
+    def perform_action(self, resource, definition):
+        with lock:
+            applied.append(resource.kind)
+        return {"changed": True, "result": {"kind": resource.kind}}
+
+    with patch.object(K8sAnsibleMixin, "perform_action", perform_action):
+        results = bulk_mixin.perform_actions_in_waves(manifest(*MANIFEST), 4)
+
+    assert [r["result"]["kind"] for r in results] == [k for k, n in MANIFEST]
+    assert [r["timing"]["wave"] for r in results] == [2, 0, 2, 1, 0]
+    assert sorted(applied[:2]) == ["CustomResourceDefinition", "Namespace"]
+    assert applied[2] == "ConfigMap"
+
+
+def test_perform_actions_in_waves_stops_after_failure(bulk_mixin):
+    applied = []
+
+    def perform_action(self, resource, definition):
+        applied.append(resource.kind)
+        if resource.kind == "Namespace":
+            self.warnings.append("namespace is not valid")
+            self.fail_json(msg="Failed to create object", warnings=self.warnings)
+        return {"changed": True, "result": {}}
+
+    with patch.object(K8sAnsibleMixin, "perform_action", perform_action):
+        with pytest.raises(SystemExit) as excinfo:
+            bulk_mixin.perform_actions_in_waves(manifest(*MANIFEST), 4)
+
+    assert excinfo.value.args[0] == {
+        "msg": "Failed to create object",
+        "warnings": ["namespace is not valid"],
+    }
+    assert sorted(applied) == ["CustomResourceDefinition", "Namespace"]
+    assert bulk_mixin.warnings == []
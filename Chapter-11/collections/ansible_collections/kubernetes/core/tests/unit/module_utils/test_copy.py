@@ -0,0 +1,183 @@
+# Copyright [2022] [Red Hat, Inc.]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import tarfile
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from ansible_collections.kubernetes.core.plugins.module_utils import copy
+from ansible_collections.kubernetes.core.plugins.module_utils.copy import (
+    ExecStdin,
+    K8SCopyFromPod,
+    K8SCopyToPod,
+)
+
+
+def archive(compress=False, **files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz" if compress else "w") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            if content is None:
+                info.type = tarfile.DIRTYPE
+                tar.addfile(info)
+            else:
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+def copy_from_pod(remote_path, local_path, compress=False):
+    k8s_copy = K8SCopyFromPod.__new__(K8SCopyFromPod)
+    k8s_copy.remote_path = remote_path
+    k8s_copy.local_path = local_path
+    k8s_copy.compress = compress
+    return k8s_copy
+
+
+def test_archive_command():
+    assert copy_from_pod("/etc/app/", "/tmp").archive_command() == [
+        "tar",
+        "cf",
+        "-",
+        "-C",
+        "/etc",
+        "app",
+    ]
+    assert copy_from_pod("/", "/tmp", True).archive_command() == [
+        "tar",
+        "czf",
+        "-",
+        "-C",
+        "/",
+        ".",
+    ]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_extract_directory(tmp_path, compress):
+    files = {"app": None, "app/conf": None, "app/conf/a.ini": b"a", "app/b": b"bb"}
+    k8s_copy = copy_from_pod("/etc/app", str(tmp_path), compress)
+    assert k8s_copy.extract(archive(compress, **files)) == 2
+    assert (tmp_path / "app" / "conf" / "a.ini").read_bytes() == b"a"
+    assert (tmp_path / "app" / "b").read_bytes() == b"bb"
+
+
+def test_extract_directory_to_new_path(tmp_path):
+    dest = str(tmp_path / "copy")
+    k8s_copy = copy_from_pod("/etc/app", dest)
+    assert k8s_copy.extract(archive(**{"app": None, "app/b": b"bb"})) == 1
+    assert os.listdir(dest) == ["b"]
+
+
+def test_extract_file_and_skip_outside_paths(tmp_path):
+    dest = str(tmp_path / "b.txt")
+    k8s_copy = copy_from_pod("/etc/b", dest)
+    assert k8s_copy.extract(archive(**{"b": b"bb", "../evil": b"x"})) == 1
+    assert os.listdir(str(tmp_path)) == ["b.txt"]
+
+
+def test_exec_stdin_sends_chunks(monkeypatch):
+    monkeypatch.setattr(copy, "CHUNK_SIZE", 4)
+    response = MagicMock()
+    response.is_open.return_value = True
+    response.peek_stderr.return_value = False
+    stdin = ExecStdin(response)
+    stdin.write(b"0123456")
+    stdin.write(b"789")
+    stdin.flush()
+    sent = [c[0][0] for c in response.write_stdin.call_args_list]
+    assert sent == [b"0123", b"4567", b"89"]
+
+
+def test_exec_stdin_raises_once_closed(monkeypatch):
+    monkeypatch.setattr(copy, "CHUNK_SIZE", 4)
+    response = MagicMock()
+    response.is_open.return_value = True
+    response.peek_stderr.return_value = False
+    stdin = ExecStdin(response)
+    stdin.write(b"0123")
+    response.is_open.return_value = False
+    with pytest.raises(IOError):
+        stdin.write(b"4567")
+    with pytest.raises(IOError):
+        stdin.flush()
+    assert response.write_stdin.call_count == 1
+
+
+class FakeExecResponse(object):
+    """Exec session of tar, exiting once its stdin is closed."""
+
+    def __init__(self, subprotocol, stderr=(), status="Success"):
+        self.subprotocol = subprotocol
+        self.stderr = list(stderr)
+        self.status = status
+        self.stdin_closed = False
+        self.open = True
+
+    def close_channel(self, channel):
+        self.stdin_closed = channel == 0
+
+    def is_open(self):
+        return self.open
+
+    def update(self, timeout=0):
+        if self.stdin_closed:
+            self.open = False
+
+    def peek_stderr(self):
+        return bool(self.stderr)
+
+    def read_stderr(self):
+        return self.stderr.pop(0)
+
+    def read_channel(self, channel):
+        assert channel == 3
+        return '{"status": "%s", "message": "exit code 2"}' % self.status
+
+
+@pytest.mark.parametrize(
+    "stderr, status, expected",
+    [
+        ([], "Success", []),
+        (
+            ["tar: a: Cannot open: No space left on device\n"],
+            "Failure",
+            ["tar: a: Cannot open: No space left on device"],
+        ),
+        ([], "Failure", []),
+    ],
+)
+def test_wait_for_extract_reads_exit_status(stderr, status, expected):
+    response = FakeExecResponse("v5.channel.k8s.io", stderr, status)
+    errors = []
+    result = K8SCopyToPod.__new__(K8SCopyToPod).wait_for_extract(response, errors)
+    assert response.stdin_closed
+    assert result["status"] == status
+    assert errors == expected
+
+
+def test_wait_for_extract_without_closing_stdin(monkeypatch):
+    monkeypatch.setattr(copy, "EXTRACT_TIMEOUT", 0.1)
+    response = FakeExecResponse("v4.channel.k8s.io", ["tar: a: Permission denied\n"])
+    errors = []
+    result = K8SCopyToPod.__new__(K8SCopyToPod).wait_for_extract(response, errors)
+    assert result is None
+    assert not response.stdin_closed
+    assert errors == ["tar: a: Permission denied"]
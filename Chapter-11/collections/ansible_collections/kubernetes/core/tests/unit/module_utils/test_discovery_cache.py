@@ -0,0 +1,194 @@
+# Copyright [2022] [Red Hat, Inc.]
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import copy
+import json
+
+import pytest
+
+from kubernetes.client import ApiClient
+
+from ansible_collections.kubernetes.core.plugins.module_utils.k8sdynamicclient import (
+    K8SDynamicClient,
+)
+from ansible_collections.kubernetes.core.plugins.module_utils.client.discovery import (
+    LazyDiscoverer,
+)
+
+
+def api_resource_list(*kinds):
+    return {
+        "kind": "APIResourceList",
+        "resources": [
+            {
+                "name": kind.lower() + "s",
+                "singularName": kind.lower(),
+                "namespaced": True,
+                "kind": kind,
+                "verbs": ["get", "list"],
+            }
+            for kind in kinds
+        ],
+    }
+
+
+def api_group(name):
+    version = {"groupVersion": name + "/v1", "version": "v1"}
+    return {"name": name, "versions": [version], "preferredVersion": version}
+
+
+DOCUMENTS = {
+    "/apis": {
+        "kind": "APIGroupList",
+        "groups": [api_group("apps"), api_group("example.com")],
+    },
+    "/api/v1": api_resource_list("Pod"),
+    "/apis/apps/v1": api_resource_list("Deployment"),
+    "/apis/example.com/v1": api_resource_list("Widget"),
+}
+
+
+class FakeDiscovery(object):
+    """Serve discovery documents, answering unchanged when the ETag matches."""
+
+    def __init__(self, documents):
+        self.documents = copy.deepcopy(documents)
+        self.requests = []
+
+    def etag(self, path):
+        return str(hash(json.dumps(self.documents[path], sort_keys=True)))
+
+    def __call__(self, path, etag=None, accept="application/json"):
+        if "APIGroupDiscoveryList" in accept and path + "#aggregated" in self.documents:
+            path = path + "#aggregated"
+        if etag == self.etag(path):
+            self.requests.append((path, 304))
+            return None, etag
+        self.requests.append((path, 200))
+        return copy.deepcopy(self.documents[path]), self.etag(path)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeDiscovery(DOCUMENTS)
+
+    def mock_load_server_info(self):
+        self._cache["version"] = {"kubernetes": "mock-k8s-version"}
+
+    monkeypatch.setattr(LazyDiscoverer, "_load_server_info", mock_load_server_info)
+    monkeypatch.setattr(LazyDiscoverer, "_request_discovery", fake)
+    return fake
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "discovery.json")
+
+
+def new_client(cache_file):
+    return K8SDynamicClient(
+        ApiClient(), cache_file=cache_file, discoverer=LazyDiscoverer
+    )
+
+
+def test_cached_group_versions_are_reused(server, cache_file):
+    client = new_client(cache_file)
+    assert client.resources.get(kind="Deployment").name == "deployments"
+    assert sorted(server.requests) == [
+        ("/api/v1", 200),
+        ("/apis", 200),
+        ("/apis/apps/v1", 200),
+        ("/apis/example.com/v1", 200),
+    ]
+
+    del server.requests[:]
+    client = new_client(cache_file)
+    assert client.resources.get(kind="Widget").name == "widgets"
+    assert server.requests == []
+
+
+def test_miss_revalidates_with_etags(server, cache_file):
+    new_client(cache_file).resources.get(kind="Widget")
+    server.documents["/apis/example.com/v1"] = api_resource_list("Widget", "Gadget")
+
+    del server.requests[:]
+    client = new_client(cache_file)
+    assert client.resources.get(kind="Gadget").name == "gadgets"
+    assert sorted(server.requests) == [
+        ("/api/v1", 304),
+        ("/apis", 304),
+        ("/apis/apps/v1", 304),
+        ("/apis/example.com/v1", 200),
+    ]
+
+    del server.requests[:]
+    assert new_client(cache_file).resources.get(kind="Gadget").name == "gadgets"
+    assert server.requests == []
+
+
+def test_processes_complete_the_cache_file(server, cache_file):
+    first = new_client(cache_file)
+    second = new_client(cache_file)
+    first.resources.get(api_version="apps/v1", kind="Deployment")
+    second.resources.get(api_version="example.com/v1", kind="Widget")
+
+    with open(cache_file) as f:
+        resources = json.load(f)["resources"]["apis"]
+    assert resources["apps"]["v1"]["resources"]
+    assert resources["example.com"]["v1"]["resources"]
+
+
+def test_aggregated_discovery(server, cache_file):
+    server.documents["/apis#aggregated"] = {
+        "kind": "APIGroupDiscoveryList",
+        "items": [
+            {
+                "metadata": {"name": "batch"},
+                "versions": [
+                    {
+                        "version": "v1",
+                        "resources": [
+                            {
+                                "resource": "jobs",
+                                "responseKind": {
+                                    "group": "batch",
+                                    "version": "v1",
+                                    "kind": "Job",
+                                },
+                                "scope": "Namespaced",
+                                "singularResource": "job",
+                                "verbs": ["get", "list"],
+                                "subresources": [
+                                    {
+                                        "subresource": "status",
+                                        "responseKind": {"kind": "Job"},
+                                        "verbs": ["get"],
+                                    }
+                                ],
+                            }
+                        ],
+                    }
+                ],
+            }
+        ],
+    }
+    server.documents["/api"] = {"kind": "APIVersions", "versions": ["v1"]}
+
+    client = new_client(cache_file)
+    job = client.resources.get(kind="Job")
+    assert job.group_version == "batch/v1"
+    assert job.namespaced
+    assert list(job.subresources) == ["status"]
+    assert ("/apis/batch/v1", 200) not in server.requests
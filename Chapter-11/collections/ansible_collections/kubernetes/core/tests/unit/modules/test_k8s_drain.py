@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from kubernetes.client.exceptions import ApiException
+
+from ansible_collections.kubernetes.core.plugins.modules import k8s_drain
+from ansible_collections.kubernetes.core.plugins.modules.k8s_drain import (
+    K8sDrainAnsible,
+)
+
+
+def pod(namespace, name, resource_version):
+    return MagicMock(
+        metadata=MagicMock(namespace=namespace, resource_version=resource_version),
+        **{"metadata.name": name}
+    )
+
+
+@pytest.fixture
+def drain():
+    drain = K8sDrainAnsible.__new__(K8sDrainAnsible)
+    drain._module = MagicMock()
+    drain._module.params = {"name": "node-1"}
+    drain._module.fail_json.side_effect = SystemExit
+    drain._api_instance = MagicMock()
+    drain._drain_options = {"wait_timeout": 60, "wait_sleep": 5}
+    drain._delete_options = None
+    drain._changed = False
+    return drain
+
+
+def test_evict_pods_retries_disruption_budget(drain):
+    refused = ApiException(status=429, reason="Too Many Requests")
+    refused.headers = {"Retry-After": "2"}
+    drain._api_instance.create_namespaced_pod_eviction.side_effect = [refused, None]
+
+    with patch.object(k8s_drain.time, "sleep") as sleep:
+        drain.evict_pods([("default", "web")])
+
+    sleep.assert_called_once_with(2)
+    assert drain._api_instance.create_namespaced_pod_eviction.call_count == 2
+    assert drain._changed
+
+
+def test_evict_pods_fails_once_all_pods_are_handled(drain):
+    def evict(name, namespace, body):
+        if name == "db":
+            raise ApiException(status=500, reason="Internal Server Error")
+
+    drain._api_instance.create_namespaced_pod_eviction.side_effect = evict
+    with pytest.raises(SystemExit):
+        drain.evict_pods([("default", "web"), ("default", "db"), ("default", "api")])
+
+    assert drain._api_instance.create_namespaced_pod_eviction.call_count == 3
+    drain._module.fail_json.assert_called_once_with(
+        msg="Failed to delete pod default/db due to: Internal Server Error"
+    )
+
+
+def test_wait_for_pod_deletion_watches_node_pods(drain):
+    events = [
+        {"type": "MODIFIED", "object": pod("default", "web", "11")},
+        {"type": "DELETED", "object": pod("default", "web", "12")},
+        {"type": "DELETED", "object": pod("default", "db", "13")},
+    ]
+    watcher = MagicMock()
+    watcher.stream.return_value = iter(events)
+
+    with patch.object(k8s_drain.watch, "Watch", return_value=watcher):
+        result = drain.wait_for_pod_deletion(
+            [("default", "web"), ("default", "db")], 60, 5, "10"
+        )
+
+    assert result is None
+    watcher.stream.assert_called_once()
+    kwargs = watcher.stream.call_args[1]
+    assert kwargs["field_selector"] == "spec.nodeName=node-1"
+    assert kwargs["resource_version"] == "10"
+    drain._api_instance.read_namespaced_pod.assert_not_called()
+
+
+def test_wait_for_pod_deletion_lists_again_when_expired(drain):
+    expired = {"type": "ERROR", "raw_object": {"code": 410}}
+    deleted = {"type": "DELETED", "object": pod("default", "db", "21")}
+    watcher = MagicMock()
+    watcher.stream.side_effect = [iter([expired]), iter([deleted])]
+    drain._api_instance.list_pod_for_all_namespaces.return_value = MagicMock(
+        items=[pod("default", "db", "20")], metadata=MagicMock(resource_version="20")
+    )
+
+    with patch.object(k8s_drain.watch, "Watch", return_value=watcher):
+        result = drain.wait_for_pod_deletion(
+            [("default", "web"), ("default", "db")], 60, 5, "10"
+        )
+
+    assert result is None
+    assert watcher.stream.call_args[1]["resource_version"] == "20"
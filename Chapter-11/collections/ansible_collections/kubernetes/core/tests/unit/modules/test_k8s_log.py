@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from ansible_collections.kubernetes.core.plugins.modules.k8s_log import (
+    log_file_name,
+    read_log,
+    write_log,
+)
+
+
+def response(*chunks):
+    response = MagicMock()
+    response.stream.return_value = iter(chunks)
+    response.data = b"".join(chunks)
+    return response
+
+
+@pytest.mark.parametrize(
+    "chunks,tail_lines,expected",
+    [
+        ((b"one\ntw", b"o\nthree\n"), None, "one\ntwo\nthree\n"),
+        ((b"one\ntw", b"o\nthree\n"), 2, "two\nthree\n"),
+        ((b"one\ntw", b"o\nthree"), 2, "two\nthree"),
+        ((b"one\n", b"two\n"), 5, "one\ntwo\n"),
+        ((b"one\n",), 0, ""),
+    ],
+)
+def test_read_log(chunks, tail_lines, expected):
+    assert read_log(response(*chunks), tail_lines) == expected
+
+
+def test_write_log(tmp_path):
+    path = str(tmp_path / "web.log")
+    assert write_log(response(b"one\n", b"two\n"), path) == 8
+    with open(path, "rb") as f:
+        assert f.read() == b"one\ntwo\n"
+
+
+def test_log_file_name():
+    assert log_file_name("web-1", "nginx", "testing") == "testing_web-1_nginx.log"
+    assert log_file_name("web-1", None, "testing") == "testing_web-1.log"
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import time
+
+import pytest
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader
+
+
+from ansible_collections.kubernetes.core.plugins.connection import kubectl
+
+
+def get_connection(timeout=60):
+    # A local shell stands for the kubectl exec session
+    conn = connection_loader.get(
+        "kubernetes.core.kubectl", PlayContext(), None, kubectl_command="/bin/sh"
+    )
+    conn.set_options(
+        direct={"kubectl_persistent": True, "kubectl_persistent_timeout": timeout}
+    )
+    conn._play_context.executable = "/bin/sh"
+    conn._build_exec_cmd = lambda cmd: (["/bin/sh"], ["/bin/sh"])
+    return conn
+
+
+@pytest.fixture
+def connection(monkeypatch, tmp_path):
+    monkeypatch.setattr(kubectl, "CONTROL_PATH_DIR", str(tmp_path))
+    conn = get_connection()
+    yield conn
+    conn.reset()
+
+
+def test_persistent_exec_reuses_session(connection):
+    rc, shell_pid, stderr = connection.exec_command("echo $PPID")
+    assert rc == 0
+    rc, stdout, stderr = connection.exec_command("printf out; printf err >&2; exit 3")
+    assert (rc, stdout, stderr) == (3, b"out", b"err")
+
+    # The session outlives the connection, like between two tasks
+    connection.close()
+    assert connection.exec_command("echo $PPID")[1] == shell_pid
+    assert get_connection().exec_command("echo $PPID")[1] == shell_pid
+
+
+def test_persistent_exec_sends_in_data(connection):
+    rc, stdout, stderr = connection.exec_command("cat", in_data=b"line 1\nline 2")
+    assert (rc, stdout) == (0, b"line 1\nline 2\n")
+    rc, stdout, stderr = connection.exec_command("cat")
+    assert (rc, stdout) == (0, b"")
+
+
+def test_persistent_exec_reset(connection):
+    shell_pid = connection.exec_command("echo $PPID")[1]
+    connection.reset()
+    assert os.listdir(kubectl.CONTROL_PATH_DIR) == []
+    assert connection.exec_command("echo $PPID")[1] != shell_pid
+
+
+def test_persistent_exec_session_lost(connection):
+    shell_pid = connection.exec_command("echo $PPID")[1]
+    with pytest.raises(AnsibleConnectionFailure):
+        connection.exec_command("kill -9 $PPID")
+    assert connection.exec_command("echo $PPID")[1] != shell_pid
+
+
+def test_persistent_exec_timeout(monkeypatch, tmp_path):
+    monkeypatch.setattr(kubectl, "CONTROL_PATH_DIR", str(tmp_path))
+    get_connection(timeout=1).exec_command("true")
+    assert len(os.listdir(str(tmp_path))) == 1
+    deadline = time.time() + 10
+    while os.listdir(str(tmp_path)) and time.time() < deadline:
+        time.sleep(0.1)
+    assert os.listdir(str(tmp_path)) == []
@@ -0,0 +1,220 @@
+# Copyright: (c) 2022, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from kubernetes.dynamic.exceptions import ForbiddenError
+from kubernetes.dynamic.resource import ResourceInstance
+
+from ansible_collections.kubernetes.core.plugins.inventory.k8s import InventoryModule
+
+
+def item(kind, name, namespace=None, resource_version="1"):
+    metadata = {"name": name, "resourceVersion": resource_version}
+    if namespace:
+        metadata["namespace"] = namespace
+    return {"apiVersion": "v1", "kind": kind, "metadata": metadata}
+
+
+def object_list(kind, items, resource_version="10", _continue=None):
+    metadata = {"resourceVersion": resource_version}
+    if _continue:
+        metadata["continue"] = _continue
+    return ResourceInstance(
+        None,
+        {
+            "apiVersion": "v1",
+            "kind": kind + "List",
+            "metadata": metadata,
+            "items": items,
+        },
+    )
+
+
+class FakeCluster(object):
+    """Answer list calls from objects by kind, limit objects at a time."""
+
+    def __init__(self, objects, forbidden=(), resource_version="10"):
+        self.objects = objects
+        self.resource_version = resource_version
+        self.forbidden = forbidden
+        self.calls = []
+        self.client = MagicMock()
+        self.client.resources.get.side_effect = self.resource
+
+    def resource(self, api_version, kind):
+        resource = MagicMock()
+        resource.kind = kind
+        resource.namespaced = kind != "Namespace"
+        resource.get.side_effect = lambda **kwargs: self.list(kind, **kwargs)
+        return resource
+
+    def list(self, kind, namespace=None, limit=None, _continue=None):
+        self.calls.append((kind, namespace, _continue))
+        if namespace is None and kind in self.forbidden:
+            raise ForbiddenError(MagicMock(status=403, body=None, headers=None))
+        items = [
+            i
+            for i in self.objects[kind]
+            if namespace is None or i["metadata"].get("namespace") == namespace
+        ]
+        start = int(_continue or 0)
+        end = start + limit
+        token = str(end) if end < len(items) else None
+        return object_list(
+            kind, items[start:end], self.resource_version, _continue=token
+        )
+
+
+@pytest.fixture
+def inventory(monkeypatch):
+    monkeypatch.setattr(
+        "ansible_collections.kubernetes.core.plugins.inventory.k8s.LIST_CHUNK_SIZE", 2
+    )
+    return InventoryModule()
+
+
+OBJECTS = {
+    "Namespace": [item("Namespace", "a"), item("Namespace", "b")],
+    "Pod": [item("Pod", "p%d" % i, "ab"[i % 2]) for i in range(5)],
+    "Service": [item("Service", "s1", "b")],
+}
+
+
+def test_list_objects_reads_chunks(inventory):
+    cluster = FakeCluster(OBJECTS)
+    objects = inventory.list_objects(cluster.client, "Pod")
+    assert [i["metadata"]["name"] for i in objects["items"]] == [
+        "p0",
+        "p1",
+        "p2",
+        "p3",
+        "p4",
+    ]
+    assert objects["resourceVersion"] == "10"
+    assert cluster.calls == [
+        ("Pod", None, None),
+        ("Pod", None, "2"),
+        ("Pod", None, "4"),
+    ]
+
+
+def test_list_clusters_splits_by_namespace(inventory):
+    cluster = FakeCluster(OBJECTS)
+    ((name, client, namespaces, pods, services),) = inventory.list_clusters(
+        [("cluster", cluster.client, None)]
+    )
+    assert namespaces == ["a", "b"]
+    assert [p.metadata.name for p in pods["a"]] == ["p0", "p2", "p4"]
+    assert [p.metadata.name for p in pods["b"]] == ["p1", "p3"]
+    assert [s.metadata.name for s in services["b"]] == ["s1"]
+    assert sorted(inventory._snapshot["cluster"]) == [
+        "Namespace/",
+        "Pod/",
+        "Service/",
+    ]
+
+
+def test_list_clusters_lists_namespaces_when_forbidden(inventory):
+    cluster = FakeCluster(OBJECTS, forbidden=("Pod",))
+    ((name, client, namespaces, pods, services),) = inventory.list_clusters(
+        [("cluster", cluster.client, None)]
+    )
+    assert [p.metadata.name for p in pods["b"]] == ["p1", "p3"]
+    assert ("Pod", "a", None) in cluster.calls
+    assert ("Pod", "b", None) in cluster.calls
+
+
+def test_list_objects_applies_changes(inventory):
+    cluster = FakeCluster(OBJECTS, resource_version="12")
+    cached = {
+        "resourceVersion": "10",
+        "items": [item("Pod", "p0", "a"), item("Pod", "p1", "b")],
+    }
+
+    def watch(resource, namespace, resource_version, timeout, allow_watch_bookmarks):
+        assert resource_version == "10"
+        assert allow_watch_bookmarks
+        yield {"type": "DELETED", "raw_object": item("Pod", "p0", "a", "11")}
+        yield {"type": "ADDED", "raw_object": item("Pod", "p5", "b", "12")}
+        raise AssertionError("read past the current resourceVersion")
+
+    cluster.client.watch.side_effect = watch
+    objects = inventory.list_objects(cluster.client, "Pod", cached=cached)
+    assert [i["metadata"]["name"] for i in objects["items"]] == ["p1", "p5"]
+    assert objects["resourceVersion"] == "12"
+    # only the current resourceVersion is listed
+    assert cluster.calls == [("Pod", None, None)]
+
+
+def test_list_objects_reads_changes_until_bookmark(inventory):
+    cluster = FakeCluster(OBJECTS, resource_version="20")
+    cached = {"resourceVersion": "10", "items": [item("Pod", "p0", "a")]}
+
+    def watch(resource, namespace, resource_version, timeout, allow_watch_bookmarks):
+        # no Pod changed, the resourceVersion moved with other kinds
+        yield {
+            "type": "BOOKMARK",
+            "raw_object": {"metadata": {"resourceVersion": "25"}},
+        }
+        raise AssertionError("read past the bookmark")
+
+    cluster.client.watch.side_effect = watch
+    objects = inventory.list_objects(cluster.client, "Pod", cached=cached)
+    assert objects == {"resourceVersion": "25", "items": [item("Pod", "p0", "a")]}
+    assert len(cluster.calls) == 1
+
+
+def test_list_objects_unchanged(inventory):
+    cluster = FakeCluster(OBJECTS)
+    cached = {"resourceVersion": "10", "items": [item("Pod", "p0", "a")]}
+
+    assert inventory.list_objects(cluster.client, "Pod", cached=cached) is cached
+    assert not cluster.client.watch.called
+
+
+def test_list_objects_reads_changes_until_watch_ends(inventory):
+    cluster = FakeCluster(OBJECTS, resource_version="20")
+    cached = {"resourceVersion": "10", "items": []}
+
+    def watch(resource, namespace, resource_version, timeout, allow_watch_bookmarks):
+        # the watch timed out, the resourceVersion moved with other kinds
+        yield {"type": "ADDED", "raw_object": item("Service", "s0", "a", "11")}
+
+    cluster.client.watch.side_effect = watch
+    objects = inventory.list_objects(cluster.client, "Service", cached=cached)
+    assert [i["metadata"]["name"] for i in objects["items"]] == ["s0"]
+    assert objects["resourceVersion"] == "20"
+    assert len(cluster.calls) == 1
+
+
+def test_list_objects_lists_again_when_expired(inventory):
+    cluster = FakeCluster(OBJECTS)
+    cached = {"resourceVersion": "1", "items": []}
+
+    def watch(resource, namespace, resource_version, timeout, allow_watch_bookmarks):
+        yield {"type": "ERROR", "raw_object": {"code": 410}}
+
+    cluster.client.watch.side_effect = watch
+    objects = inventory.list_objects(cluster.client, "Service", cached=cached)
+    assert [i["metadata"]["name"] for i in objects["items"]] == ["s1"]
+
+
+def test_list_objects_without_bookmarks_support(inventory):
+    cluster = FakeCluster(OBJECTS, resource_version="11")
+    cached = {"resourceVersion": "10", "items": []}
+
+    def watch(resource, namespace, resource_version, timeout):
+        yield {"type": "ADDED", "raw_object": item("Pod", "p5", "b", "11")}
+
+    cluster.client.watch.side_effect = watch
+    objects = inventory.list_objects(cluster.client, "Pod", cached=cached)
+    assert [i["metadata"]["name"] for i in objects["items"]] == ["p5"]
+    assert cluster.client.watch.call_count == 2